@@ -0,0 +1,60 @@
+"""
+Tab completion latency as the number of known keywords grows
+
+Run with: python -m benchmarks.bench_completer
+"""
+
+import re
+import timeit
+
+from robotframeworkinteractive.robotframeworkinteractive import RobotFrameworkInteractive
+
+SIZES = [1000, 5000, 10000, 50000]
+PREFIX = 'Keyword 0001'
+REPEAT = 200
+
+
+def synthetic_commands(count):
+    return [f'Keyword {i:05d} Of Library {i % 50}' for i in range(count)]
+
+
+def add_synthetic_keywords(rfi, count):
+    # Added the way imported libraries are, so completion goes through the registry like it does for real keywords
+    commands = synthetic_commands(count)
+    rfi.registry.add('SyntheticLibrary', [{'name': name, 'args': []} for name in commands])
+    rfi.completion_options(PREFIX)
+    return commands
+
+
+def tab_press(completer, text):
+    state = 0
+    while completer(text, state) is not None:
+        state += 1
+
+
+def linear_completer(commands):
+    # The completer as it was before the completion index, kept as the baseline to compare against
+    def completer(text, state):
+        sects = re.split(r'\s{2,}', text)
+        options = [i for i in commands if i.startswith(text)]
+        if state < len(options):
+            sects[-1] = options[state]
+            return '    '.join(sects)
+        return None
+
+    return completer
+
+
+def main():
+    print(f'{"keywords":>10} {"indexed (us)":>14} {"linear (us)":>14}')
+    for size in SIZES:
+        rfi = RobotFrameworkInteractive()
+        commands = add_synthetic_keywords(rfi, size)
+        indexed = timeit.timeit(lambda: tab_press(rfi.completer, PREFIX), number=REPEAT) / REPEAT
+        linear = timeit.timeit(lambda: tab_press(linear_completer(commands), PREFIX), number=REPEAT // 10)
+        linear /= REPEAT // 10
+        print(f'{size:>10} {indexed * 1e6:>14.1f} {linear * 1e6:>14.1f}')
+
+
+if __name__ == '__main__':
+    main()
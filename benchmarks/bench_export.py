@@ -0,0 +1,87 @@
+"""
+Time and memory spent picking the commands to export from a long history, compared to scanning for export markers
+
+Run with: python -m benchmarks.bench_export
+"""
+
+import timeit
+import tracemalloc
+
+from robotframeworkinteractive.history import CommandHistory
+
+SIZES = [10000, 100000]
+NEW_COMMANDS = 10
+REPEAT = 50
+
+
+def legacy_history(count):
+    history = [f'Log    Command {i}' for i in range(count)]
+    history.append('export()')
+    history.extend(f'Log    New {i}' for i in range(NEW_COMMANDS))
+    return history
+
+
+def history(count):
+    commands = CommandHistory(f'Log    Command {i}' for i in range(count))
+    commands.mark_exported()
+    commands.extend(f'Log    New {i}' for i in range(NEW_COMMANDS))
+    return commands
+
+
+# export() and exportall() as they were before export checkpoints, kept as the baseline to compare against
+def list_last_index(lst, value):
+    if value in lst:
+        return len(lst) - lst[::-1].index(value) - 1
+    return -1
+
+
+def list_filter_out_values(lst, values):
+    result = lst
+    for value in values:
+        result = list(filter(value.__ne__, result))
+    return result
+
+
+def legacy_export(commands):
+    idx = max(list_last_index(commands, 'export()'), list_last_index(commands, 'exportall()'))
+    return commands[idx + 1:]
+
+
+def legacy_exportall(commands):
+    return list_filter_out_values(commands, ['export()', 'exportall()'])
+
+
+def export(commands):
+    return commands.since_export()
+
+
+def exportall(commands):
+    return commands
+
+
+def measure(function, commands):
+    seconds = timeit.timeit(lambda: function(commands), number=REPEAT) / REPEAT
+    tracemalloc.start()
+    function(commands)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    print(f'{"history":>8} {"command":>12} {"markers (us)":>14} {"offsets (us)":>14} '
+          f'{"markers peak (KiB)":>20} {"offsets peak (KiB)":>20}')
+    for size in SIZES:
+        legacy_commands = legacy_history(size)
+        commands = history(size)
+        assert legacy_export(legacy_commands) == export(commands)
+        for name, legacy_function, function in (('export()', legacy_export, export),
+                                                ('exportall()', legacy_exportall, exportall)):
+            legacy_time, legacy_peak = measure(legacy_function, legacy_commands)
+            new_time, new_peak = measure(function, commands)
+            print(f'{size:>8} {name:>12} {legacy_time * 1e6:>14.1f} {new_time * 1e6:>14.1f} '
+                  f'{legacy_peak / 1024:>20.1f} {new_peak / 1024:>20.1f}')
+
+
+if __name__ == '__main__':
+    main()
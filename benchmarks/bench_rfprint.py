@@ -0,0 +1,52 @@
+"""
+Lines per second printed by rfprint compared to the old Log To Console per line implementation
+
+Run with: python -m benchmarks.bench_rfprint
+"""
+
+import os
+import re
+import time
+from unittest.mock import patch
+
+from robotframeworkinteractive.bootstrap import execution_context
+from robotframeworkinteractive.robotframeworkinteractive import RobotFrameworkInteractive
+
+SIZES = [1000, 10000]
+
+
+def synthetic_output(count):
+    return '\n'.join(f'<div id="row-{i}" class="item">${{value}} [{i}] &amp; more text</div>' for i in range(count))
+
+
+def legacy_rfprint(rfi, obj):
+    # rfprint as it was before the console writer, kept as the baseline to compare against
+    for line in str(obj).splitlines():
+        line = re.sub(r'([$@&%\[\]])', r'\\\1', line)
+        line = line.replace(" ", "${SPACE}")
+        rfi.run_rf(f'Log To Console    {line}', log=False)
+
+
+def lines_per_second(print_function, text, count):
+    start = time.perf_counter()
+    print_function(text)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    rfi = RobotFrameworkInteractive()
+    results = []
+    with execution_context(), open(os.devnull, 'w') as devnull, patch('sys.__stdout__', new=devnull):
+        for size in SIZES:
+            text = synthetic_output(size)
+            legacy = lines_per_second(lambda obj: legacy_rfprint(rfi, obj), text, size)
+            direct = lines_per_second(rfi.rfprint, text, size)
+            results.append((size, legacy, direct))
+
+    print(f'{"lines":>8} {"Log To Console (lines/s)":>26} {"console writer (lines/s)":>26}')
+    for size, legacy, direct in results:
+        print(f'{size:>8} {legacy:>26,.0f} {direct:>26,.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Time from launching the prompt to exiting it, with and without the fast start mode
+
+Run with: python -m benchmarks.bench_startup
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+import robot
+
+from robotframeworkinteractive import robotframeworkinteractive
+from robotframeworkinteractive.bootstrap import execution_context
+
+RUNS = 10
+MODES = {
+    'robot.run(Main.robot)': [],
+    '--fast': ['--fast'],
+}
+
+
+def startup_time(args):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-m', 'robotframeworkinteractive', '--no-cache', *args], input=b'exit()\n',
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def run_interactive():
+    pass
+
+
+def suite_bootstrap_time():
+    main_robot = os.path.join(os.path.dirname(robotframeworkinteractive.__file__), 'Main.robot')
+    start = time.perf_counter()
+    with open(os.devnull, 'w') as devnull:
+        robot.run(main_robot, stdout=devnull, stderr=devnull, log=None, output=None, report=None)
+    return time.perf_counter() - start
+
+
+def fast_bootstrap_time():
+    start = time.perf_counter()
+    with execution_context():
+        pass
+    return time.perf_counter() - start
+
+
+def print_row(mode, times):
+    print(f'{mode:<24} {min(times) * 1000:>10.1f} {statistics.median(times) * 1000:>12.1f}')
+
+
+def main():
+    print('Process start to exit()')
+    print(f'{"mode":<24} {"min (ms)":>10} {"median (ms)":>12}')
+    for mode, args in MODES.items():
+        print_row(mode, [startup_time(args) for _ in range(RUNS)])
+
+    # Interpreter start up and imports are the same for both modes, so also time only the bootstrap in process
+    print()
+    print('Execution context set up only')
+    print(f'{"mode":<24} {"min (ms)":>10} {"median (ms)":>12}')
+    with patch.object(robotframeworkinteractive, 'run_interactive', run_interactive):
+        print_row('robot.run(Main.robot)', [suite_bootstrap_time() for _ in range(RUNS)])
+    print_row('--fast', [fast_bootstrap_time() for _ in range(RUNS)])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+"""
+Benchmarks of the hot paths of the prompt, written as JSON and optionally compared to a saved baseline
+
+Run with: python -m benchmarks.suite --output baseline.json
+Compare with: python -m benchmarks.suite --compare baseline.json
+
+Every result is the time one operation takes, so lower is always better.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+from robot.libraries.BuiltIn import BuiltIn
+from robot.version import VERSION as ROBOT_VERSION
+
+from benchmarks.bench_completer import PREFIX, add_synthetic_keywords, tab_press
+from benchmarks.bench_rfprint import synthetic_output
+from robotframeworkinteractive.bootstrap import execution_context
+from robotframeworkinteractive.exports import ExportFiles
+from robotframeworkinteractive.robotframeworkinteractive import RobotFrameworkInteractive
+
+RUNS = 5
+THRESHOLD = 0.2
+COMPLETER_SIZES = [1000, 10000, 50000]
+RFPRINT_LINES = 10000
+VARIABLES = 10000
+SYNTHETIC_KEYWORDS = 2000
+EXPORT_SIZE = 100000
+
+
+def timed(function, runs, number=1):
+    # The time of one call, measured over runs rounds of number calls each
+    results = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        results.append((time.perf_counter() - start) / number)
+    return results
+
+
+def cold_start(runs):
+    def start(*args):
+        subprocess.run([sys.executable, '-m', 'robotframeworkinteractive', '--no-cache', '--no-journal', *args],
+                       input=b'exit()\n', stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+
+    yield 'cold_start.robot_run', timed(start, runs)
+    yield 'cold_start.fast', timed(lambda: start('--fast'), runs)
+
+
+def completer(runs):
+    for size in COMPLETER_SIZES:
+        rfi = RobotFrameworkInteractive()
+        add_synthetic_keywords(rfi, size)
+        yield f'completer.{size // 1000}k', timed(lambda: tab_press(rfi.completer, PREFIX), runs, number=100)
+
+    rfi = RobotFrameworkInteractive()
+    with execution_context(), tempfile.TemporaryDirectory() as directory:
+        variables = os.path.join(directory, 'variables.py')
+        with open(variables, 'w') as file:
+            file.writelines(f'VARIABLE_{i:05d} = {i}\n' for i in range(VARIABLES))
+        BuiltIn().import_variables(variables)
+        text = 'Log    ${VARIABLE_0001'
+        yield f'completer.variables_{VARIABLES // 1000}k', timed(lambda: tab_press(rfi.completer, text), runs,
+                                                                 number=100)
+
+
+def rfprint(runs):
+    text = synthetic_output(RFPRINT_LINES)
+    rfi = RobotFrameworkInteractive()
+    with open(os.devnull, 'w') as devnull, patch('sys.__stdout__', new=devnull):
+        yield f'rfprint.{RFPRINT_LINES // 1000}k_lines', timed(lambda: rfi.rfprint(text), runs)
+
+
+def run_rf(runs):
+    rfi = RobotFrameworkInteractive()
+    with execution_context(), open(os.devnull, 'w') as devnull, patch('sys.__stdout__', new=devnull):
+        yield 'run_rf.no_operation', timed(lambda: rfi.run_rf('No Operation', log=False), runs, number=1000)
+
+
+def synthetic_library(directory, count):
+    path = os.path.join(directory, 'SyntheticLibrary.py')
+    with open(path, 'w') as file:
+        for i in range(count):
+            file.write(f'def synthetic_keyword_{i}(locator, value=None):\n    pass\n\n\n')
+    return path
+
+
+def add_commands(runs):
+    rfi = RobotFrameworkInteractive()
+    with tempfile.TemporaryDirectory() as directory:
+        library = synthetic_library(directory, SYNTHETIC_KEYWORDS)
+        yield 'add_commands.builtin', timed(lambda: rfi.add_commands('BuiltIn'), runs)
+        yield f'add_commands.synthetic_{SYNTHETIC_KEYWORDS // 1000}k', timed(lambda: rfi.add_commands(library), runs)
+
+
+def export(runs):
+    rfi = RobotFrameworkInteractive()
+    rfi.rfprint = lambda obj: None
+    rfi.SUCCESS_SETTINGS = ['Library    Collections']
+    with tempfile.TemporaryDirectory() as directory:
+        rfi.export_files = ExportFiles(directory)
+        rfi.SUCCESS_CMD_HISTORY.extend(f'Log    Command {i}' for i in range(EXPORT_SIZE))
+        rfi.SUCCESS_CMD_HISTORY.mark_exported()
+        rfi.SUCCESS_CMD_HISTORY.extend(f'Log    New {i}' for i in range(10))
+        name = f'{EXPORT_SIZE // 1000}k'
+        yield f'export.since_last_{name}', timed(lambda: rfi.export(), runs)
+        yield f'exportall.{name}', timed(lambda: rfi.export(allCmds=True), runs)
+
+
+BENCHMARKS = [cold_start, completer, rfprint, run_rf, add_commands, export]
+
+
+def run(runs, selected=None):
+    results = {}
+    for benchmark in BENCHMARKS:
+        if selected and benchmark.__name__ not in selected:
+            continue
+        for name, times in benchmark(runs):
+            results[name] = {'min': min(times), 'median': statistics.median(times), 'runs': len(times)}
+            print(f'{name:<32} {results[name]["median"] * 1000:>12.3f} ms', file=sys.stderr)
+    return {'python': platform.python_version(), 'robotframework': ROBOT_VERSION, 'results': results}
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    regressions = []
+    print(f'{"benchmark":<32} {"baseline (ms)":>14} {"current (ms)":>14} {"change":>8}')
+    for name, result in results['results'].items():
+        if name not in baseline['results']:
+            continue
+        before = baseline['results'][name]['median']
+        after = result['median']
+        change = after / before - 1 if before else 0.0
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print(f'{name:<32} {before * 1000:>14.3f} {after * 1000:>14.3f} {change:>+8.1%}{flag}')
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite', description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', metavar='FILE', help='Write the results to FILE instead of standard output')
+    parser.add_argument('--compare', metavar='BASELINE', help='Compare the results to a file written with --output')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='Relative slowdown of the median that counts as a regression (default: %(default)s)')
+    parser.add_argument('--runs', type=int, default=RUNS, help='Rounds per benchmark (default: %(default)s)')
+    parser.add_argument('--only', action='append', metavar='NAME',
+                        choices=[benchmark.__name__ for benchmark in BENCHMARKS],
+                        help='Only run the NAME benchmarks, e.g. completer. Can be repeated')
+    options = parser.parse_args(argv)
+
+    results = run(options.runs, options.only)
+    if options.output:
+        with open(options.output, 'w') as file:
+            json.dump(results, file, indent=2)
+    elif not options.compare:
+        print(json.dumps(results, indent=2))
+
+    if options.compare:
+        with open(options.compare) as file:
+            regressions = compare(results, json.load(file), options.threshold)
+        if regressions:
+            print(f'{len(regressions)} benchmarks regressed by more than {options.threshold:.0%}')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,9 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import sys
+
 from robotframeworkinteractive.robotframeworkinteractive import main
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
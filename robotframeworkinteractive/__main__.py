@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import sys
 
 from .robotframeworkinteractive import main
-main()
+sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+benchmarking
+
+Runs a keyword repeatedly and reports how long it takes and how much that varies
+"""
+
+import statistics
+import time
+
+from .timings import percentile
+
+WARMUP = 3
+
+
+def parse_bench_options(options):
+    values = [value.strip() for value in options.split(',')]
+    if not values[0].isdigit() or int(values[0]) < 1 or len(values) > 2 \
+            or (len(values) == 2 and not values[1].isdigit()):
+        raise ValueError(f'Expected bench(runs) or bench(runs, warmup runs), got bench({options})')
+    return int(values[0]), int(values[1]) if len(values) == 2 else WARMUP
+
+
+def format_duration(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.3f} {unit}'
+    return f'{seconds / 1e-9:.0f} ns'
+
+
+def measure(function, runs, warmup=WARMUP):
+    for _ in range(warmup):
+        function()
+
+    elapsed = []
+    clock = time.perf_counter
+    for _ in range(runs):
+        start = clock()
+        function()
+        elapsed.append(clock() - start)
+    return BenchResult(elapsed, warmup)
+
+
+class BenchResult:
+    def __init__(self, elapsed, warmup=0):
+        self.elapsed = elapsed
+        self.warmup = warmup
+        self._sorted = sorted(elapsed)
+
+    @property
+    def min(self):
+        return self._sorted[0]
+
+    @property
+    def mean(self):
+        return statistics.mean(self.elapsed)
+
+    @property
+    def median(self):
+        return statistics.median(self._sorted)
+
+    @property
+    def p95(self):
+        return percentile(self._sorted, 95)
+
+    @property
+    def stddev(self):
+        return statistics.stdev(self.elapsed) if len(self.elapsed) > 1 else 0.0
+
+    @property
+    def ops(self):
+        total = sum(self.elapsed)
+        return len(self.elapsed) / total if total else float('inf')
+
+    def __str__(self):
+        lines = [f'{len(self.elapsed)} runs after {self.warmup} warmup runs']
+        lines.extend(f'    {name:<8}{format_duration(value)}' for name, value in
+                     (('min', self.min), ('mean', self.mean), ('median', self.median), ('p95', self.p95),
+                      ('stddev', self.stddev)))
+        lines.append(f'    {"ops/s":<8}{self.ops:,.1f}')
+        return '\n'.join(lines)
@@ -0,0 +1,94 @@
+"""
+blocks
+
+FOR, IF, WHILE and TRY blocks typed over several lines, parsed by Robot Framework and run as one command
+"""
+
+import io
+import re
+
+from robot.api import get_model
+from robot.running import TestSuite
+from robot.running.bodyrunner import BodyRunner
+from robot.running.context import EXECUTION_CONTEXTS
+
+BLOCK_MARKERS = ('FOR', 'IF', 'WHILE', 'TRY')
+# Lines that continue the block they are in, they are indented like the line that started it
+BRANCH_MARKERS = ('ELSE', 'ELSE IF', 'EXCEPT', 'FINALLY', 'END')
+INDENT = '    '
+
+
+def tokens(line):
+    return re.split(r'\s{2,}|\t', line.strip())
+
+
+def is_block(cmd):
+    # Inline IF can also assign, ${value}=    IF    $ok    Get Value    ELSE    Get Default
+    for token in tokens(cmd):
+        if not token.startswith(('$', '@', '&')):
+            return token in BLOCK_MARKERS
+    return False
+
+
+def depth_change(line):
+    marker, *args = tokens(line)
+    if marker in ('FOR', 'WHILE', 'TRY'):
+        return 1
+    # An IF with more than its condition on the same line is inline and ends on that line
+    if marker == 'IF' and len(args) <= 1:
+        return 1
+    if marker == 'END':
+        return -1
+    return 0
+
+
+def format_block(lines):
+    formatted = []
+    depth = 0
+    for line in lines:
+        line = line.strip()
+        change = depth_change(line)
+        marker = tokens(line)[0]
+        indent = depth - 1 if change < 0 or marker in BRANCH_MARKERS else depth
+        formatted.append(INDENT * max(indent, 0) + line)
+        depth += change
+    return '\n'.join(formatted)
+
+
+class BlockBuffer:
+    def __init__(self):
+        self.lines = []
+        self.depth = 0
+
+    def __bool__(self):
+        return bool(self.lines)
+
+    def add(self, line):
+        # Gives back the line when it isn't part of a block, the whole block once its last END is added and None while
+        # the block is still open
+        change = depth_change(line)
+        if not self.lines and change <= 0:
+            return line
+
+        self.lines.append(line)
+        self.depth += change
+        if self.depth > 0:
+            return None
+        return self.flush()
+
+    def flush(self):
+        block = format_block(self.lines)
+        self.lines = []
+        self.depth = 0
+        return block
+
+
+def parse_block(cmd):
+    # Parsed as the body of a task, so the block gets exactly the running model Robot Framework would build for it
+    source = '*** Tasks ***\nBlock\n' + ''.join(f'{INDENT}{line}\n' for line in cmd.splitlines())
+    return TestSuite.from_model(get_model(io.StringIO(source))).tests[0].body
+
+
+def run_block(cmd):
+    # Run in the current context and scope, so variables set by the block stay set like they do for any command
+    BodyRunner(EXECUTION_CONTEXTS.current).run(parse_block(cmd))
@@ -0,0 +1,73 @@
+"""
+bootstrap
+
+Minimal Robot Framework execution context for running the interactive prompt without a suite run
+"""
+
+import os
+from contextlib import contextmanager
+
+from robot.conf import RobotSettings
+from robot.output import LOGGER, Output, pyloggingconf
+from robot.result import TestSuite
+from robot.running.context import EXECUTION_CONTEXTS
+from robot.running.model import ResourceFile
+from robot.running.namespace import Namespace
+from robot.running.outputcapture import OutputCapturer
+from robot.variables import VariableScopes
+
+CONTEXT_NAME = 'Robot Framework Interactive'
+
+
+@contextmanager
+def execution_context(name=CONTEXT_NAME, listener=None):
+    with open(os.devnull, 'w') as devnull:
+        settings = RobotSettings(output=None, log=None, report=None, stdout=devnull, stderr=devnull, rpa=True,
+                                 listener=listener or [])
+        LOGGER.register_console_logger(**settings.console_output_config)
+        output = Output(settings)
+        variables = VariableScopes(settings)
+
+        # Keywords only need a suite and a task to hang their variables on, nothing is ever added to either of them
+        suite = TestSuite(name=name, rpa=True)
+        task = suite.tests.create(name=name)
+
+        namespace = Namespace(variables, suite, ResourceFile())
+        namespace.start_suite()
+        EXECUTION_CONTEXTS.start_suite(suite, namespace, output)
+        context = EXECUTION_CONTEXTS.current
+        context.set_suite_variables(suite)
+        namespace.handle_imports()
+        variables.resolve_delayed()
+        context.start_test(task)
+
+        try:
+            # Under robot.run the prompt itself runs inside a library keyword, which captures standard output
+            with pyloggingconf.robot_handler_enabled(settings.log_level), OutputCapturer():
+                yield context
+        finally:
+            context.end_test(task)
+            EXECUTION_CONTEXTS.end_suite()
+            LOGGER.unregister_xml_logger()
+
+
+def session_namespace(context):
+    # A namespace of its own gives a session separate imports and variables while it shares the suite, task and
+    # output of the context it runs in
+    variables = VariableScopes(RobotSettings(output=None, log=None, report=None, rpa=True))
+    namespace = Namespace(variables, context.suite, ResourceFile())
+    original = context.namespace
+    context.namespace = namespace
+    try:
+        namespace.start_suite()
+        context.set_suite_variables(context.suite)
+        namespace.handle_imports()
+        variables.resolve_delayed()
+        namespace.start_test()
+        if context.test is not None:
+            variables.set_test('${TEST_NAME}', context.test.name)
+            variables.set_test('${TEST_DOCUMENTATION}', context.test.doc)
+            variables.set_test('@{TEST_TAGS}', list(context.test.tags))
+    finally:
+        context.namespace = original
+    return namespace
@@ -0,0 +1,83 @@
+"""
+client
+
+Sends commands to a Robot Framework Interactive server and prints what they output
+
+This module does not import Robot Framework so that it starts as fast as possible.
+"""
+
+import argparse
+import json
+import socket
+import sys
+
+STATUS_MARKER = '\x00'
+SHUTDOWN_COMMAND = 'shutdown()'
+
+
+class ReplClient:
+    def __init__(self, path):
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.connect(path)
+        self._reader = self._socket.makefile('r', encoding='utf-8', newline='\n')
+        self._writer = self._socket.makefile('w', encoding='utf-8', newline='\n')
+
+    def send(self, cmd, out=None):
+        out = out or sys.stdout
+        self._writer.write(cmd.replace('\n', ' ') + '\n')
+        self._writer.flush()
+        for line in self._reader:
+            if line.startswith(STATUS_MARKER):
+                return json.loads(line[len(STATUS_MARKER):])
+            out.write(line)
+            out.flush()
+        raise ConnectionError('The server closed the connection')
+
+    def close(self):
+        self._reader.close()
+        self._writer.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def commands_from_stdin():
+    while True:
+        try:
+            line = input('RF> ') if sys.stdin.isatty() else sys.stdin.readline()
+        except EOFError:
+            return
+        if line == '':
+            return
+        line = line.strip()
+        if line == 'exit()':
+            return
+        if line:
+            yield line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='robotframeworkinteractive-client',
+                                     description='Run commands in a Robot Framework Interactive server')
+    parser.add_argument('socket', help='Socket the server was started with (--serve)')
+    parser.add_argument('commands', nargs='*', help='Commands to run. Read from stdin when none are given')
+    parser.add_argument('--shutdown', action='store_true', help='Stop the server after the commands have run')
+    options = parser.parse_args(argv)
+
+    commands = options.commands or commands_from_stdin()
+    failed = 0
+    with ReplClient(options.socket) as client:
+        for cmd in commands:
+            if client.send(cmd)['status'] != 'PASS':
+                failed += 1
+        if options.shutdown:
+            client.send(SHUTDOWN_COMMAND)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+completion
+
+Prefix indexes used for tab completion in Robot Framework Interactive
+"""
+
+import bisect
+import re
+
+from robot.running.context import EXECUTION_CONTEXTS
+from robot.utils import is_dict_like, is_list_like, normalize
+
+# Sorts after every other character so that [prefix, prefix + _MAX_CHAR) brackets all keys starting with prefix
+_MAX_CHAR = chr(0x10FFFF)
+_VARIABLE = re.compile(r'^[$@&]\{([^{}]+)\}$')
+
+
+class CompletionIndex:
+    def __init__(self, names=()):
+        self._keys = []
+        self._entries = []
+        self.extend(names)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, name):
+        key = name.casefold()
+        pos = bisect.bisect_right(self._keys, key)
+        self._keys.insert(pos, key)
+        self._entries.insert(pos, (len(self._entries), name))
+
+    def extend(self, names):
+        names = list(names)
+        if len(names) < 8:
+            for name in names:
+                self.add(name)
+            return
+
+        start = len(self._entries)
+        pairs = [(key, entry) for key, entry in zip(self._keys, self._entries)]
+        pairs.extend((name.casefold(), (start + i, name)) for i, name in enumerate(names))
+        pairs.sort()
+        self._keys = [key for key, _ in pairs]
+        self._entries = [entry for _, entry in pairs]
+
+    def matches(self, prefix):
+        key = prefix.casefold()
+        lo = bisect.bisect_left(self._keys, key)
+        hi = bisect.bisect_left(self._keys, key + _MAX_CHAR, lo)
+        # Matches are returned in the order they were added, not alphabetically
+        return [name for _, name in sorted(self._entries[lo:hi])]
+
+
+def decorate(name, value):
+    if is_dict_like(value):
+        return f'&{{{name}}}'
+    if is_list_like(value):
+        return f'@{{{name}}}'
+    return f'${{{name}}}'
+
+
+class VariableIndex:
+    # Names of the variables in the current scope. Only the names are indexed, the values are never copied
+    def __init__(self):
+        self._keys = None
+        self._names = None
+        self._decorated = None
+        self._store = None
+        self._size = None
+
+    def invalidate(self):
+        self._keys = None
+
+    def _insert(self, name):
+        key = name.casefold()
+        pos = bisect.bisect_left(self._keys, key)
+        self._keys.insert(pos, key)
+        self._names.insert(pos, name)
+
+    def _remove(self, name):
+        pos = bisect.bisect_left(self._keys, name.casefold())
+        while self._names[pos] != name:
+            pos += 1
+        del self._keys[pos]
+        del self._names[pos]
+
+    def update(self, variable):
+        # A single assignment only moves its own name instead of rebuilding and sorting the whole index. The new value
+        # can change the decoration, e.g. ${fruit} becoming @{fruit}
+        context = EXECUTION_CONTEXTS.current
+        store = context.variables.current.store if context is not None else None
+        match = _VARIABLE.match(variable)
+        if not match:
+            self.invalidate()
+        if self._keys is None or store is not self._store:
+            return
+        name = match.group(1)
+        key = normalize(name, ignore='_')
+        if key in self._decorated:
+            self._remove(self._decorated.pop(key))
+        if name in store.data:
+            self._decorated[key] = decorate(name, store.data[name])
+            self._insert(self._decorated[key])
+        self._size = len(store)
+
+    def matches(self, prefix):
+        context = EXECUTION_CONTEXTS.current
+        if context is None:
+            return []
+
+        # Entering another scope replaces the store and a keyword like Set Global Variable adds to it, both are noticed
+        # here. Assignments by run_rf are applied one at a time with update
+        store = context.variables.current.store
+        if self._keys is None or store is not self._store or len(store) != self._size:
+            self._decorated = {normalize(name, ignore='_'): decorate(name, value) for name, value in store.data.items()}
+            self._names = sorted(self._decorated.values(), key=str.casefold)
+            self._keys = [name.casefold() for name in self._names]
+            self._store = store
+            self._size = len(store)
+
+        key = prefix.casefold()
+        lo = bisect.bisect_left(self._keys, key)
+        hi = bisect.bisect_left(self._keys, key + _MAX_CHAR, lo)
+        return self._names[lo:hi]
@@ -0,0 +1,44 @@
+"""
+console
+
+Buffered writer for printing results straight to the console
+"""
+
+import sys
+
+from robot.utils import console_encode
+
+CHUNK_SIZE = 64 * 1024
+
+
+class ConsoleWriter:
+    def __init__(self, stream=None, chunk_size=CHUNK_SIZE):
+        self._stream = stream
+        self.chunk_size = chunk_size
+
+    @property
+    def stream(self):
+        # Standard output is captured while keywords run, the console is always the original stream like it is for
+        # Log To Console
+        return self._stream or sys.__stdout__
+
+    def write(self, obj):
+        stream = self.stream
+        chunk = []
+        chunk_length = 0
+        for line in str(obj).splitlines():
+            chunk.append(line)
+            chunk_length += len(line) + 1
+            if chunk_length >= self.chunk_size:
+                self._write_chunk(stream, chunk)
+                chunk = []
+                chunk_length = 0
+
+        if chunk:
+            self._write_chunk(stream, chunk)
+        stream.flush()
+
+    @staticmethod
+    def _write_chunk(stream, lines):
+        lines.append('')
+        stream.write(console_encode('\n'.join(lines), stream=stream))
@@ -0,0 +1,64 @@
+"""
+exports
+
+Numbers the files that exported tests are written to
+"""
+
+import os
+import re
+
+NUMBER = '{number}'
+DEFAULT_TEMPLATE = f'export_{NUMBER}.robot'
+
+
+class ExportFiles:
+    def __init__(self, directory=None, template=DEFAULT_TEMPLATE):
+        if NUMBER not in template:
+            raise ValueError(f'Export file name template {template} does not contain {NUMBER}')
+        self.directory = directory or ''
+        self.template = template
+        # The first export leaves the number out together with the separator in front of it, e.g. export.robot. A
+        # template like {number}.robot has no name left without the number, so its exports start at 1
+        unnumbered = re.sub(r'[-_. ]?' + re.escape(NUMBER), '', template, count=1)
+        base = os.path.basename(unnumbered)
+        self._unnumbered = unnumbered if base and not base.startswith('.') else None
+        self._next_number = None
+
+    def path(self, number):
+        if number == 0 and self._unnumbered is not None:
+            return os.path.join(self.directory, self._unnumbered)
+        return os.path.join(self.directory, self.template.replace(NUMBER, str(number)))
+
+    def first_free_number(self):
+        # Exports are numbered one after another, so the last one is found with a few lookups by doubling and then
+        # bisecting instead of listing every file in the directory. With gaps in the numbers, e.g. after deleting an
+        # export, this may return a free number in a gap instead of the one after the last export. That file is still
+        # new, creating it never overwrites an export
+        if not os.path.exists(self.path(1)):
+            return 0 if self._unnumbered is not None and not os.path.exists(self.path(0)) else 1
+
+        taken, free = 1, 2
+        while os.path.exists(self.path(free)):
+            taken, free = free, free * 2
+        while free - taken > 1:
+            middle = (taken + free) // 2
+            if os.path.exists(self.path(middle)):
+                taken = middle
+            else:
+                free = middle
+        return free
+
+    def create(self):
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        if self._next_number is None:
+            self._next_number = self.first_free_number()
+
+        while True:
+            number = self._next_number
+            self._next_number += 1
+            try:
+                return open(self.path(number), 'x', encoding='utf-8')
+            except FileExistsError:
+                # Another session took the number since it was cached, creating the file is what claims a number
+                continue
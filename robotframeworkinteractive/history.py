@@ -0,0 +1,19 @@
+"""
+history
+
+Successful commands of a session, in the order they were run
+"""
+
+
+class CommandHistory(list):
+    # Exports are remembered as the offset they happened at instead of as entries, so exporting what is new only
+    # touches the commands run since the last export
+    def __init__(self, commands=()):
+        super().__init__(commands)
+        self.export_offset = 0
+
+    def since_export(self):
+        return self[self.export_offset:]
+
+    def mark_exported(self):
+        self.export_offset = len(self)
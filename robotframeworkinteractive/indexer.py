@@ -0,0 +1,124 @@
+"""
+indexer
+
+Builds keyword completion data for imported libraries and resources on background threads
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from robot.errors import DataError
+from robot.running.builder import ResourceFileBuilder
+from robot.utils import find_file
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+def find_import(name, directory, file_type):
+    # Libraries are only imported by path when they look like one, the same way Robot Framework decides it
+    if file_type == 'Library' and not (name.lower().endswith('.py') or '/' in name or os.sep in name):
+        return name
+    return find_file(name, directory, file_type)
+
+
+def resource_imports(path):
+    libraries = []
+    resources = []
+    for imported in ResourceFileBuilder().build(path).imports:
+        # Imports that still contain variables can only be resolved by the running namespace
+        if '${' in imported.name:
+            continue
+        try:
+            if imported.type == 'Library':
+                libraries.append(find_import(imported.name, imported.directory, 'Library'))
+            elif imported.type == 'Resource':
+                resources.append(find_import(imported.name, imported.directory, 'Resource'))
+        except DataError:
+            continue
+    return libraries, resources
+
+
+class IndexStatus:
+    def __init__(self, name):
+        self.name = name
+        self.state = PENDING
+        self.keyword_count = 0
+        self.error = None
+
+    def __str__(self):
+        if self.state == DONE:
+            return f'{self.name}    {self.state}    {self.keyword_count} keywords'
+        if self.state == FAILED:
+            return f'{self.name}    {self.state}    {self.error}'
+        return f'{self.name}    {self.state}'
+
+
+class KeywordIndexer:
+    def __init__(self, index_function, max_workers=4):
+        self.index_function = index_function
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='rfi-indexer')
+        self._lock = threading.Lock()
+        self._statuses = {}
+        self._futures = {}
+
+    def submit(self, lib_or_res, is_resource=False):
+        with self._lock:
+            status = self._statuses.get(lib_or_res)
+            if status is not None and status.state in (PENDING, RUNNING):
+                return self._futures[lib_or_res]
+
+            status = IndexStatus(lib_or_res)
+            self._statuses[lib_or_res] = status
+            future = self._executor.submit(self._index, status, is_resource)
+            self._futures[lib_or_res] = future
+            return future
+
+    def _submit_dependency(self, lib_or_res, is_resource=False):
+        # Dependencies that were already indexed are not redone, which also stops resources that import each other
+        # from bouncing back and forth
+        with self._lock:
+            if lib_or_res in self._statuses:
+                return
+        self.submit(lib_or_res, is_resource)
+
+    def _index(self, status, is_resource):
+        lib_or_res = status.name
+        status.state = RUNNING
+        try:
+            if is_resource:
+                lib_or_res = find_import(lib_or_res, os.getcwd(), 'Resource')
+                # The libraries a resource depends on are indexed in parallel with the resource itself
+                libraries, resources = resource_imports(lib_or_res)
+                for library in libraries:
+                    self._submit_dependency(library)
+                for resource in resources:
+                    self._submit_dependency(resource, is_resource=True)
+            status.keyword_count = self.index_function(lib_or_res)
+            status.state = DONE
+        except Exception as e:
+            status.error = e
+            status.state = FAILED
+
+    def statuses(self):
+        with self._lock:
+            return list(self._statuses.values())
+
+    def is_idle(self):
+        return all(status.state in (DONE, FAILED) for status in self.statuses())
+
+    def wait(self, timeout=None):
+        # Resources submit their dependencies while they run, so keep going until nothing new shows up
+        while True:
+            with self._lock:
+                futures = list(self._futures.values())
+            for future in futures:
+                future.result(timeout)
+            if self.is_idle():
+                return
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,105 @@
+"""
+interrupts
+
+Aborts the running command on Ctrl-C or when it takes longer than its timeout, without ending the session
+"""
+
+import _thread
+import os
+import signal
+import threading
+import time
+import traceback
+
+import robot
+
+ROBOT_DIR = os.path.dirname(os.path.abspath(robot.__file__))
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPORTED_FRAMES = 5
+
+
+class CommandAborted(KeyboardInterrupt):
+    # Robot Framework lets KeyboardInterrupt through keywords untouched, so this reaches the prompt from any depth
+    def __init__(self, reason, elapsed, frames):
+        super().__init__(reason)
+        self.reason = reason
+        self.elapsed = elapsed
+        self.frames = frames
+
+    def __str__(self):
+        return f'Command aborted: {self.reason} after {self.elapsed:.2f}s'
+
+    def report(self):
+        lines = [str(self)]
+        if self.frames:
+            lines.append('Time was spent in:')
+            lines.extend(f'    {frame.filename}:{frame.lineno} in {frame.name}' for frame in self.frames)
+        return '\n'.join(lines)
+
+
+def interesting_frames(stack, limit=REPORTED_FRAMES):
+    # Robot Framework's and this package's own frames are the same for every keyword, so show library code if
+    # there is any
+    frames = [frame for frame in stack
+              if not frame.filename.startswith('<')
+              and not os.path.abspath(frame.filename).startswith((ROBOT_DIR, PACKAGE_DIR))]
+    return (frames or list(stack))[-limit:]
+
+
+def interrupt_main_thread():
+    if hasattr(signal, 'pthread_kill'):
+        # A real signal also wakes up the main thread when it is blocked in a system call
+        signal.pthread_kill(threading.main_thread().ident, signal.SIGINT)
+    else:
+        _thread.interrupt_main()
+
+
+class CommandGuard:
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+        self._active = False
+        self._reason = None
+        self._start = None
+        self._timer = None
+        self._previous_handler = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        # Signal handlers can only be set in the main thread, commands anywhere else run unguarded
+        if threading.current_thread() is not threading.main_thread():
+            return self
+
+        self._start = time.monotonic()
+        self._active = True
+        self._previous_handler = signal.signal(signal.SIGINT, self._handle_sigint)
+        if self.timeout:
+            self._timer = threading.Timer(self.timeout, self._expire)
+            self._timer.daemon = True
+            self._timer.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            with self._lock:
+                self._active = False
+            if self._timer:
+                self._timer.cancel()
+        finally:
+            if self._previous_handler is not None:
+                signal.signal(signal.SIGINT, self._previous_handler)
+                self._previous_handler = None
+
+    def _expire(self):
+        with self._lock:
+            if not self._active:
+                return
+            self._reason = f'timeout of {self.timeout:g}s exceeded'
+            interrupt_main_thread()
+
+    def _handle_sigint(self, signum, frame):
+        # A timeout that fires just as the command finishes is ignored rather than hitting whatever runs next
+        if not self._active:
+            return
+        self._active = False
+        reason = self._reason or 'interrupted by Ctrl-C'
+        raise CommandAborted(reason, time.monotonic() - self._start, interesting_frames(traceback.extract_stack(frame)))
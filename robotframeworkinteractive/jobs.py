@@ -0,0 +1,121 @@
+"""
+jobs
+
+Runs commands on background threads so that the prompt stays usable while they run
+"""
+
+import ctypes
+import itertools
+import threading
+import time
+
+from robot.running.librarykeywordrunner import EmbeddedArgumentsRunner, LibraryKeywordRunner, RunKeywordRunner
+
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def library_call(context, keyword, args):
+    # The execution context, its variable scopes and its output are not thread-safe, so a job never runs through them.
+    # The keyword is looked up and its arguments are resolved here on the prompt's thread, and the job thread only
+    # calls the library method. User keywords and BuiltIn keywords work on the context itself and are refused
+    runner = context.namespace.get_runner(keyword)
+    if not isinstance(runner, LibraryKeywordRunner) or isinstance(runner, RunKeywordRunner) \
+            or runner.libname == 'BuiltIn':
+        raise ValueError(f"'{keyword}' is not a library keyword, only library keywords can be run as background jobs")
+    if isinstance(runner, EmbeddedArgumentsRunner):
+        if args:
+            raise ValueError('Positional arguments are not allowed when using embedded arguments')
+        args = runner._embedded_args
+    handler = runner._handler
+    positional, named = handler.resolve_arguments(args, context.variables)
+    method = handler.current_handler()
+    named = dict(named)
+    return lambda: method(*positional, **named)
+
+
+class Job:
+    def __init__(self, job_id, command, function, assign=None):
+        self.id = job_id
+        self.command = command
+        self.assign = assign
+        self.state = RUNNING
+        self.result = None
+        self.error = None
+        self.applied = False
+        self.started = time.monotonic()
+        self.finished = None
+        self._function = function
+        self._cancel_requested = False
+        self._done = threading.Event()
+        self.thread = threading.Thread(target=self._run, name=f'rfi-job-{job_id}', daemon=True)
+
+    def _run(self):
+        try:
+            self.result = self._function()
+            self.state = DONE
+        except BaseException as e:
+            self.error = e
+            self.state = CANCELLED if self._cancel_requested else FAILED
+        finally:
+            self.finished = time.monotonic()
+            self._done.set()
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.monotonic()) - self.started
+
+    def is_finished(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def cancel(self):
+        if self.is_finished():
+            return False
+        self._cancel_requested = True
+        # Threads can't be stopped from the outside, so raise an exception in it the same way Robot Framework does for
+        # keyword timeouts on Windows. It is raised once the thread runs Python code again, which may leave the
+        # library's own state half-updated but never the execution context, as jobs don't use it
+        ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(self.thread.ident), ctypes.py_object(JobCancelled))
+        return True
+
+    def __str__(self):
+        status = f'[{self.id}]    {self.state}    {self.elapsed:.1f}s    {self.command}'
+        if self.state in (FAILED, CANCELLED) and self.error is not None and str(self.error):
+            status += f'    {self.error}'
+        return status
+
+
+class JobManager:
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, command, function, assign=None):
+        with self._lock:
+            job = Job(next(self._ids), command, function, assign)
+            self._jobs[job.id] = job
+        job.thread.start()
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            if job_id not in self._jobs:
+                raise ValueError(f'No job with id {job_id}')
+            return self._jobs[job_id]
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def finished_unapplied(self):
+        return [job for job in self.jobs() if job.is_finished() and not job.applied]
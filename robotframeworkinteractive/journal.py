@@ -0,0 +1,135 @@
+"""
+journal
+
+Append-only record of the successful commands and settings of a session, so that it can be resumed after a crash
+"""
+
+import glob
+import json
+import os
+import time
+
+from .history import CommandHistory
+
+COMMAND = 'command'
+SETTING = 'setting'
+EXPORT = 'export'
+SYNC_EVERY = 32
+SYNC_INTERVAL = 1.0
+
+
+JOURNAL_PATTERN = 'session*.jsonl'
+JOURNALS_KEPT = 20
+
+
+def state_directory():
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser(os.path.join('~', 'AppData', 'Local'))
+    else:
+        base = os.environ.get('XDG_STATE_HOME') or os.path.expanduser(os.path.join('~', '.local', 'state'))
+    return os.path.join(base, 'robotframeworkinteractive')
+
+
+def default_journal_path():
+    # Every process gets a journal of its own, so that concurrent prompts never truncate or interleave each other's
+    return os.path.join(state_directory(), f'session-{time.strftime("%Y%m%d-%H%M%S")}-{os.getpid()}.jsonl')
+
+
+def journals(directory=None):
+    paths = glob.glob(os.path.join(directory or state_directory(), JOURNAL_PATTERN))
+    return sorted(paths, key=os.path.getmtime)
+
+
+def latest_journal(directory=None):
+    paths = journals(directory)
+    return paths[-1] if paths else None
+
+
+def prune_journals(directory=None, keep=JOURNALS_KEPT):
+    for path in journals(directory)[:-keep or None]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def read_journal(path):
+    settings = []
+    history = CommandHistory()
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # The last record of a session that was killed may have been cut off half way
+                continue
+            if record['type'] == COMMAND:
+                history.append(record['value'])
+            elif record['type'] == SETTING:
+                settings.append(record['value'])
+            elif record['type'] == EXPORT:
+                history.mark_exported()
+    return settings, history
+
+
+def _ends_without_newline(path):
+    if not os.path.exists(path) or not os.path.getsize(path):
+        return False
+    with open(path, 'rb') as file:
+        file.seek(-1, os.SEEK_END)
+        return file.read(1) != b'\n'
+
+
+class SessionJournal:
+    def __init__(self, path, append=False, sync_every=SYNC_EVERY, sync_interval=SYNC_INTERVAL):
+        self.path = path
+        self.append = append
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _open(self):
+        # Opened on the first record, so that starting a session that never runs anything keeps the previous journal
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        cut_off = self.append and _ends_without_newline(self.path)
+        # Commands may hold passwords, so only the user can read the journal
+        self._file = open(self.path, 'a' if self.append else 'w', encoding='utf-8', newline='\n',
+                          opener=lambda path, flags: os.open(path, flags, 0o600))
+        if cut_off:
+            self._file.write('\n')
+
+    def write(self, record_type, value=None):
+        if self._file is None:
+            self._open()
+        self._file.write(json.dumps({'type': record_type, 'value': value}) + '\n')
+        # Flushing hands every record to the OS right away, which is enough to survive the process being killed. Only
+        # the fsync that also survives the machine going down is batched
+        self._file.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+
+    def command(self, cmd):
+        self.write(COMMAND, cmd)
+
+    def setting(self, cmd):
+        self.write(SETTING, cmd)
+
+    def export(self):
+        self.write(EXPORT)
+
+    def sync(self):
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
@@ -0,0 +1,117 @@
+"""
+keywordcache
+
+On-disk cache of the keyword names and arguments that libdoc reports for libraries and resources
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+
+from robot.libdoc import LibraryDocumentation
+from robot.libraries import STDLIBS
+from robot.utils import Importer
+from robot.version import VERSION as ROBOT_VERSION
+
+CACHE_FORMAT = 1
+ENTRY_NAME = re.compile(r'^[0-9a-f]{40}\.json$')
+TEMP_NAME = re.compile(r'^tmp\w+\.tmp$')
+
+
+def default_cache_dir():
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser(os.path.join('~', 'AppData', 'Local'))
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser(os.path.join('~', '.cache'))
+    return os.path.join(base, 'robotframeworkinteractive', 'keywords')
+
+
+def library_keywords(lib_or_res):
+    libdoc = LibraryDocumentation(lib_or_res, '', '', None)
+    return [{'name': keyword.name, 'args': [str(arg) for arg in keyword.args]} for keyword in libdoc.keywords]
+
+
+def _file_key(path):
+    stat = os.stat(path)
+    return f'path:{os.path.normcase(os.path.abspath(path))}:{stat.st_mtime_ns}:{stat.st_size}'
+
+
+def _library_key(name):
+    import_name = f'robot.libraries.{name}' if name in STDLIBS else name
+    lib, source = Importer('library').import_class_or_module(import_name, return_source=True)
+    version = getattr(lib, 'ROBOT_LIBRARY_VERSION', None)
+    if version is None:
+        module = sys.modules.get(getattr(lib, '__module__', None)) or lib
+        version = getattr(module, '__version__', None)
+    if version is None and import_name.startswith('robot.'):
+        version = ROBOT_VERSION
+    # The source file still changes when a library without any version information is upgraded
+    source_key = _file_key(source) if source and os.path.isfile(source) else source
+    return f'library:{name}:{version}:{source_key}'
+
+
+def cache_key(lib_or_res):
+    if os.path.isfile(lib_or_res):
+        return _file_key(lib_or_res)
+    return _library_key(lib_or_res)
+
+
+class KeywordCache:
+    def __init__(self, directory=None, rebuild=False):
+        self.directory = directory or default_cache_dir()
+        self.rebuild = rebuild
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, key):
+        if self.rebuild:
+            return None
+        try:
+            with open(self._entry_path(key), encoding='utf-8') as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if entry.get('format') != CACHE_FORMAT or entry.get('key') != key:
+            return None
+        return entry['keywords']
+
+    def put(self, key, keywords):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump({'format': CACHE_FORMAT, 'key': key, 'keywords': keywords}, file)
+            os.replace(tmp_path, self._entry_path(key))
+        except OSError:
+            # A cache that can't be written to only costs the next import some time
+            pass
+
+    def keywords(self, lib_or_res):
+        try:
+            key = cache_key(lib_or_res)
+        except Exception:
+            return library_keywords(lib_or_res)
+
+        keywords = self.get(key)
+        if keywords is None:
+            keywords = library_keywords(lib_or_res)
+            self.put(key, keywords)
+        return keywords
+
+    def clear(self):
+        # The directory can be any directory given with --cache-dir, so only the files the cache wrote are removed
+        names = os.listdir(self.directory) if os.path.isdir(self.directory) else []
+        for name in names:
+            if ENTRY_NAME.match(name) or TEMP_NAME.match(name):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+        try:
+            os.rmdir(self.directory)
+        except OSError:
+            pass
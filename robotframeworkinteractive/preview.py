@@ -0,0 +1,120 @@
+"""
+preview
+
+Size bounded rendering of keyword results, so that a huge result is never turned into one huge string
+"""
+
+import reprlib
+from collections import deque
+from collections.abc import Mapping
+
+MAX_ITEMS = 20
+MAX_CHARS = 2000
+LAST_RESULT = '${_}'
+_TEXT = (str, bytes, bytearray)
+_SEQUENCES = (list, tuple, set, frozenset, deque, range)
+_SCALARS = (int, float, complex, bool, type(None))
+
+
+def fits(value, max_items=MAX_ITEMS, max_chars=MAX_CHARS):
+    # Rough length of str(value) that stops as soon as it is over the limit, without building any string
+    budget = max_chars
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, _TEXT):
+            budget -= len(value) + 3
+        elif isinstance(value, _SCALARS):
+            budget -= 24
+        elif isinstance(value, Mapping):
+            if len(value) > max_items:
+                return False
+            budget -= 2
+            for key, item in value.items():
+                stack.extend((key, item))
+        elif isinstance(value, _SEQUENCES):
+            if len(value) > max_items:
+                return False
+            budget -= 2
+            stack.extend(value)
+        else:
+            budget -= 80
+        if budget < 0:
+            return False
+    return True
+
+
+def can_page(value):
+    return isinstance(value, _TEXT + _SEQUENCES) or isinstance(value, Mapping)
+
+
+def page_size(value, max_items=MAX_ITEMS, max_chars=MAX_CHARS):
+    return max_chars if isinstance(value, _TEXT) else max_items
+
+
+def page_count(value, max_items=MAX_ITEMS, max_chars=MAX_CHARS):
+    return max(1, -(-len(value) // page_size(value, max_items, max_chars)))
+
+
+def _page_items(items, start, stop):
+    # Sets, dicts and deques can't be sliced, only the items up to the end of the page are walked through
+    if isinstance(items, (list, tuple, range)):
+        return items[start:stop]
+    page = []
+    for index, item in enumerate(items):
+        if index >= stop:
+            break
+        if index >= start:
+            page.append(item)
+    return page
+
+
+def _item_repr(max_items, max_chars):
+    item_repr = reprlib.Repr()
+    item_repr.maxlevel = 2
+    item_repr.maxstring = item_repr.maxother = max(max_chars // max_items, 20)
+    for limit in ('maxlist', 'maxtuple', 'maxset', 'maxfrozenset', 'maxdeque', 'maxdict'):
+        setattr(item_repr, limit, max_items)
+    return item_repr
+
+
+def render_page(value, page=1, max_items=MAX_ITEMS, max_chars=MAX_CHARS):
+    size = page_size(value, max_items, max_chars)
+    start = (page - 1) * size
+    stop = start + size
+    if isinstance(value, str):
+        return value[start:stop]
+    if isinstance(value, (bytes, bytearray)):
+        return repr(bytes(value[start:stop]))
+
+    # One item per line, every item is itself cut short so that a page stays small whatever the items hold
+    item_repr = _item_repr(max_items, max_chars)
+    if isinstance(value, Mapping):
+        items = _page_items(value.items(), start, stop)
+        return '\n'.join(f'{item_repr.repr(key)}: {item_repr.repr(item)}' for key, item in items)
+    return '\n'.join(item_repr.repr(item) for item in _page_items(value, start, stop))
+
+
+def describe(value, page=1, max_items=MAX_ITEMS, max_chars=MAX_CHARS):
+    unit = 'characters' if isinstance(value, str) else 'bytes' if isinstance(value, _TEXT) else 'items'
+    pages = page_count(value, max_items, max_chars)
+    description = f'<{type(value).__name__} of {len(value)} {unit}, page {page} of {pages}'
+    if page < pages:
+        description += f', page({page + 1}) shows the next one'
+    return f'{description}, the whole value is in {LAST_RESULT}>'
+
+
+def preview(value, max_items=MAX_ITEMS, max_chars=MAX_CHARS):
+    known = can_page(value) or isinstance(value, _SCALARS)
+    if known and fits(value, max_items, max_chars):
+        return str(value)
+    if can_page(value):
+        return f'{render_page(value, 1, max_items, max_chars)}\n{describe(value, 1, max_items, max_chars)}'
+
+    # The length of other objects' text can't be estimated and nothing is known about showing a part of them, so
+    # their text is cut short
+    text = str(value)
+    if len(text) <= max_chars:
+        return text
+    return f'{text[:max_chars]}\n<{type(value).__name__} shown as {len(text)} characters, only the first ' \
+           f'{max_chars} are shown, the whole value is in {LAST_RESULT}>'
@@ -0,0 +1,55 @@
+"""
+profiling
+
+Runs a command under cProfile and reports where the time went
+"""
+
+import inspect
+import io
+import os
+import pstats
+import re
+import sys
+
+TOP = 20
+
+
+def parse_profile_options(options):
+    top, everything, path = TOP, False, None
+    for option in (option.strip() for option in options.split(',')):
+        if option.isdigit():
+            top = int(option)
+        elif option.lower() == 'all':
+            everything = True
+        elif option:
+            path = option
+    return top, everything, path
+
+
+def library_path(instance):
+    # A library's own code is its whole top level package, except for the standard libraries that share theirs with
+    # the rest of Robot Framework
+    module = instance if inspect.ismodule(instance) else inspect.getmodule(type(instance))
+    if module is None:
+        return None
+
+    package_name = module.__name__.split('.')[0]
+    top = module if package_name == 'robot' else sys.modules.get(package_name, module)
+    path = getattr(top, '__file__', None)
+    if not path:
+        return None
+    if os.path.basename(path).startswith('__init__.'):
+        return os.path.dirname(os.path.abspath(path))
+    return os.path.abspath(path)
+
+
+def profile_report(profiler, top=TOP, path=None):
+    out = io.StringIO()
+    stats = pstats.Stats(profiler, stream=out).sort_stats(pstats.SortKey.CUMULATIVE)
+    # Keywords that only call other libraries never run code of their own library, so everything is shown for those
+    if path and any(filename.startswith(path) for filename, _, _ in stats.stats):
+        stats.print_stats(re.escape(path), top)
+    else:
+        stats.print_stats(top)
+    return out.getvalue().strip('\n')
+
@@ -0,0 +1,96 @@
+"""
+registry
+
+Keywords of the imported libraries and resources, stored once per library for completion
+"""
+
+import os
+import threading
+
+from .completion import CompletionIndex
+
+
+def library_name(lib_or_res):
+    # Libraries and resources imported by path are named after the file, the same way Robot Framework names them
+    if lib_or_res.lower().endswith(('.py', '.robot', '.resource', '.txt', '.tsv', '.rst')) \
+            or '/' in lib_or_res or os.sep in lib_or_res:
+        return os.path.splitext(os.path.basename(lib_or_res))[0]
+    return lib_or_res
+
+
+class KeywordRegistry:
+    def __init__(self):
+        self._libraries = {}
+        # How many libraries provide every completion, a name only leaves the index when the last of them is removed
+        self._owners = {}
+        self._index = CompletionIndex()
+        self._stale = False
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._owners)
+
+    def __contains__(self, lib_or_res):
+        return lib_or_res in self._libraries
+
+    @staticmethod
+    def _completions(name, keywords):
+        yield from keywords
+        for keyword in keywords:
+            yield f'{name}.{keyword}'
+
+    def add(self, lib_or_res, keywords):
+        # Importing a library again replaces its keywords, so they are never in the registry twice
+        with self._lock:
+            self.remove(lib_or_res)
+            name = library_name(lib_or_res)
+            keywords = list(dict.fromkeys(keyword['name'] for keyword in keywords))
+            self._libraries[lib_or_res] = (name, keywords)
+
+            added = []
+            for completion in self._completions(name, keywords):
+                count = self._owners.get(completion, 0)
+                if not count:
+                    added.append(completion)
+                self._owners[completion] = count + 1
+            if not self._stale:
+                self._index.extend(added)
+            return len(keywords)
+
+    def remove(self, lib_or_res):
+        with self._lock:
+            if lib_or_res not in self._libraries:
+                return False
+
+            name, keywords = self._libraries.pop(lib_or_res)
+            for completion in self._completions(name, keywords):
+                count = self._owners[completion] - 1
+                if count:
+                    self._owners[completion] = count
+                else:
+                    del self._owners[completion]
+                    # The index can't drop names, it is rebuilt on the next lookup
+                    self._stale = True
+            return True
+
+    def find(self, name):
+        with self._lock:
+            for lib_or_res, (library, _) in self._libraries.items():
+                if name in (lib_or_res, library):
+                    return lib_or_res
+            return None
+
+    def libraries(self):
+        with self._lock:
+            return [name for name, _ in self._libraries.values()]
+
+    def keywords(self, lib_or_res):
+        with self._lock:
+            return list(self._libraries[lib_or_res][1])
+
+    def matches(self, prefix):
+        with self._lock:
+            if self._stale:
+                self._index = CompletionIndex(self._owners)
+                self._stale = False
+            return self._index.matches(prefix)
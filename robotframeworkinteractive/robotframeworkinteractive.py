@@ -1,11 +1,40 @@
+import io
 import os
 import re
 import sys
-import glob
+import json
+import time
+import argparse
+import cProfile
+from contextlib import contextmanager
 
 import robot
-from robot.libdoc import LibraryDocumentation
+from robot.errors import DataError
 from robot.libraries.BuiltIn import BuiltIn
+from robot.running.context import EXECUTION_CONTEXTS
+from robot.utils import timestr_to_secs
+
+from .benchmarking import measure, parse_bench_options
+from .blocks import BlockBuffer, is_block, run_block
+from .bootstrap import execution_context
+from .completion import CompletionIndex, VariableIndex
+from .console import ConsoleWriter
+from .exports import ExportFiles, DEFAULT_TEMPLATE
+from .history import CommandHistory
+from .indexer import KeywordIndexer
+from .jobs import JobManager, DONE, library_call
+from .journal import SessionJournal, default_journal_path, latest_journal, prune_journals, read_journal
+from .keywordcache import KeywordCache, library_keywords
+from .registry import KeywordRegistry
+from .preview import LAST_RESULT, can_page, describe, page_count, preview, render_page
+from .profiling import library_path, parse_profile_options, profile_report
+from .interrupts import CommandGuard, CommandAborted
+from .server import ReplServer, console_redirected
+from .sessionlog import SessionLog, default_log_path, prune_logs
+from .sessions import SessionManager
+from .snapshots import read_snapshot, snapshot_path, write_snapshot
+from .timings import CommandTimings
+from .tracing import TraceListener
 
 
 if sys.version_info.major == 3 and sys.version_info.minor > 9:
@@ -17,168 +46,539 @@ if os.name == 'nt':
     import pyreadline
     readline = pyreadline.Readline()
 
-    def get_input(rfi):
-        return readline.readline('RF> ')
+    def get_input(rfi, prompt=None):
+        return readline.readline(prompt or rfi.prompt)
 elif os.name == 'posix':
     import readline
 
-    def get_input(rfi):
-        rfi.rfprint('RF> ')
-        return input('RF> ')
+    def get_input(rfi, prompt=None):
+        rfi.rfprint(prompt or rfi.prompt)
+        return input(prompt or rfi.prompt)
 
 
 WELCOME_MSG = """
 Welcome to Robot Framework Interactive
 Type any Robot Framework Command to run interactively
+FOR, IF, WHILE and TRY blocks run once their END has been typed
+Pasted lines run together as one batch
 
 Special Commands:
     exit() - Will exit Robot Framework Interactive
     export() - Will export all successful commands since the last export into a robot framework test
     exportall() - Will export all successful commands in this session into a robot framework test
+    batch() - Will collect the following commands until end() and run them together as one batch
+    indexing() - Will show which imported libraries and resources are available for completion
+    <command>  & - Will run a library keyword as a background job
+    jobs() - Will list the background jobs
+    wait(id) - Will wait for a background job to finish, or for all of them without an id
+    result(id) - Will show the result of a background job
+    cancel(id) - Will cancel a running background job
+    timeout(time)  <command> - Will run the command with the given timeout instead of the default one
+    timeout(time) - Will set the default timeout for commands, NONE to disable it
+    timings() - Will show the slowest of the latest commands and how long keywords and libraries took
+    timings(file) - Will write the timings of the latest commands to a JSON file
+    profile(top, all, file)  <command> - Will profile the command and show the top functions by cumulative time
+    bench(runs, warmup)  <keyword> - Will run the keyword repeatedly and show how long it takes
+    page(number) - Will show a page of the last result, which is kept in ${_}, or the next page without a number
+    sessions() - Will list the sessions and how much memory each of them uses
+    newsession(name) - Will start a new session with its own history, imports and variables and switch to it
+    session(name) - Will switch to another session
+    closesession(name) - Will close a session
+    snapshot(name) - Will save the settings and variables of the session so that they can be restored later
+    restore(name) - Will import the settings and set the variables saved in a snapshot
 """
 
+BLOCK_PROMPT = '... '
+BACKGROUND_JOB = re.compile(r'^(.*?)\s+&$')
+PAGE_COMMAND = re.compile(r'^page\((\d*)\)$')
+JOB_COMMAND = re.compile(r'^(wait|result|cancel)\((\d*)\)$')
+TIMEOUT_COMMAND = re.compile(r'^timeout\(([^)]*)\)(?:\s{2,}(.*))?$')
+TIMINGS_COMMAND = re.compile(r'^timings\(([^)]*)\)$')
+PROFILE_COMMAND = re.compile(r'^profile\(([^)]*)\)(?:\s{2,}(.*))?$')
+BENCH_COMMAND = re.compile(r'^bench\(([^)]*)\)(?:\s{2,}(.*))?$')
+SESSION_COMMAND = re.compile(r'^(session|newsession|closesession)\(([^)]*)\)$')
+SNAPSHOT_COMMAND = re.compile(r'^(snapshot|restore)\(([^)]*)\)$')
 
-class RobotFrameworkInteractive:
-    COMMANDS = ['Library', 'Resource', 'exit()', 'export()', 'exportall()']
-
-    SUCCESS_CMD_HISTORY = []
-    SUCCESS_SETTINGS = []
+SPECIAL_COMMANDS = ['Library', 'Resource', 'FOR', 'IF', 'WHILE', 'TRY', 'END', 'exit()', 'batch()', 'end()', 'export()',
+                    'exportall()', 'indexing()', 'jobs()', 'wait()', 'result()', 'cancel()', 'timeout()', 'timings()',
+                    'profile()', 'bench()', 'page()', 'sessions()', 'session()', 'newsession()', 'closesession()',
+                    'snapshot()', 'restore()']
 
-    @staticmethod
-    def list_filter_out_values(lst, values):
-        result = lst
-        for value in values:
-            result = list(filter((value).__ne__, result))
 
-        return result
-
-    @staticmethod
-    def list_last_index(lst, value):
-        if value in lst:
-            return len(lst) - lst[::-1].index(value) - 1
-        else:
-            return -1
+class RobotFrameworkInteractive:
+    def __init__(self, keyword_cache=None, console=None, timeout=None, journal=None, export_files=None,
+                 session_log=None):
+        # Every instance is a session of its own, nothing it records is shared with the others
+        self.COMMANDS = list(SPECIAL_COMMANDS)
+        self.SUCCESS_CMD_HISTORY = CommandHistory()
+        self.SUCCESS_SETTINGS = []
+        self.sessions = None
+        self.prompt = 'RF> '
+        self.keyword_cache = keyword_cache
+        self.journal = journal
+        self.session_log = session_log
+        self._altered = None
+        self.export_files = export_files or ExportFiles()
+        self.timeout = timeout
+        self._guarded = False
+        self._timing = False
+        self._outcome = None
+        self.timings = CommandTimings()
+        self.console = console or ConsoleWriter()
+        self.indexer = KeywordIndexer(lambda lib_or_res: self.add_commands(lib_or_res))
+        self.registry = KeywordRegistry()
+        self.jobs = JobManager()
+        # COMMANDS only holds the special commands, which never change, keywords are completed from the registry
+        self.command_index = CompletionIndex(self.COMMANDS)
+        self.variable_index = VariableIndex()
+        self._completion_text = None
+        self._completion_options = []
+        self.last_result = None
+        self.last_page = 1
 
     def convert_cmds_to_test(self, cmds):
-        settings_str = ''
-        test_steps_str = ''
+        test = io.StringIO()
+        self.write_test(test, cmds)
+        return test.getvalue()
 
+    def write_test(self, file, cmds):
+        # Written a line at a time so that exporting a long session never builds the whole file in memory
+        file.write('*** Settings ***\n')
         for setting in self.SUCCESS_SETTINGS:
-            settings_str += f'{setting}\n'
+            file.write(f'{setting}\n')
 
+        file.write('\n\n\n*** Test Cases ***\nExport\n')
+        file.write('\t[Documentation]  Test Case exported from Robot Framework Interactive\n\t')
         for test_step in cmds:
-            test_steps_str += f'{test_step}\n\t'
-
-        return f"""*** Settings ***
-{settings_str}
-
-
-*** Test Cases ***
-Export
-\t[Documentation]  Test Case exported from Robot Framework Interactive
-\t{test_steps_str}
-"""
+            # The lines of a block all belong to the test
+            test_step = test_step.replace('\n', '\n\t')
+            file.write(f'{test_step}\n\t')
+        file.write('\n')
 
     def export(self, allCmds=False):
         try:
-            filename = 'export'
-            file_extension = '.robot'
-            file = None
-            matching_files = glob.glob(f'{filename}*{file_extension}')
-            if len(matching_files) == 0:
-                file = open(filename + file_extension, 'w')
-            else:
-                if f'{filename}{file_extension}' in matching_files:
-                    matching_files.remove(filename + file_extension)
-
-                if len(matching_files) == 0:
-                    file = open(f'{filename}_1{file_extension}', 'w')
-                else:
-                    file_numbers = [int(re.match(r'export_(\d+)\.robot', i).group(1)) for i in matching_files]
-                    file = open(f'{filename}_{max(file_numbers) + 1}{file_extension}', 'w')
-
             if allCmds:
-                cmds = self.list_filter_out_values(self.SUCCESS_CMD_HISTORY, ['export()', 'exportall()'])
+                cmds = self.SUCCESS_CMD_HISTORY
             else:
-                export_idx = self.list_last_index(self.SUCCESS_CMD_HISTORY, 'export()')
-                exportall_idx = self.list_last_index(self.SUCCESS_CMD_HISTORY, 'exportall()')
-                idx = max(export_idx, exportall_idx)
-                cmds = self.SUCCESS_CMD_HISTORY[idx+1:]
+                cmds = self.SUCCESS_CMD_HISTORY.since_export()
 
-            file.write(self.convert_cmds_to_test(cmds))
+            with self.export_files.create() as file:
+                self.write_test(file, cmds)
             self.rfprint(f'Successful commands written to {file.name}')
-            file.close()
         except Exception as e:
             self.rfprint(e)
 
+        self.SUCCESS_CMD_HISTORY.mark_exported()
+        if self.journal:
+            self.journal.export()
+
+    def record(self, cmd, is_setting=False):
+        if is_setting:
+            self.SUCCESS_SETTINGS.append(cmd)
+        else:
+            self.SUCCESS_CMD_HISTORY.append(cmd)
+        if self.journal:
+            if is_setting:
+                self.journal.setting(cmd)
+            else:
+                self.journal.command(cmd)
+
+    def resume(self, path):
+        try:
+            settings, history = read_journal(path)
+        except OSError as e:
+            self.rfprint(f'Could not resume the session: {e}')
+            return
+
+        # Settings are imported again so that their keywords can be used, the commands are only restored to the history
+        for setting in settings:
+            self.run_rf(setting, log=False)
+        exported = len(self.SUCCESS_CMD_HISTORY) + history.export_offset
+        self.SUCCESS_SETTINGS.extend(settings)
+        self.SUCCESS_CMD_HISTORY.extend(history)
+        if history.export_offset:
+            self.SUCCESS_CMD_HISTORY.export_offset = exported
+        self.rfprint(f'Resumed {len(history)} commands and {len(settings)} settings from {path}')
+
+    def snapshot(self, name):
+        context = EXECUTION_CONTEXTS.current
+        if context is None:
+            self.rfprint('Snapshots need a running execution context')
+            return
+
+        path = snapshot_path(name)
+        try:
+            saved, skipped = write_snapshot(path, self.SUCCESS_SETTINGS, context.variables.current.store)
+        except OSError as e:
+            self.rfprint(f'Could not write the snapshot: {e}')
+            return
+        self.rfprint(f'{len(self.SUCCESS_SETTINGS)} settings and {saved} variables written to {path}')
+        self.report_skipped('Not saved', skipped)
+
+    def restore(self, name):
+        context = EXECUTION_CONTEXTS.current
+        if context is None:
+            self.rfprint('Snapshots need a running execution context')
+            return
+
+        path = snapshot_path(name)
+        try:
+            settings, variables, skipped = read_snapshot(path)
+        except (OSError, ValueError) as e:
+            self.rfprint(f'Could not restore the snapshot: {e}')
+            return
+
+        for setting in settings:
+            if setting not in self.SUCCESS_SETTINGS:
+                self.run_rf(setting)
+        # Set straight in the current scope, the same one set_local_variable uses, without logging every variable
+        scope = context.variables
+        for variable, value in variables.items():
+            scope.set_local_variable(f'${{{variable}}}', value)
+        self.variable_index.invalidate()
+        self.rfprint(f'Restored {len(settings)} settings and {len(variables)} variables from {path}')
+        self.report_skipped('Not restored', skipped)
+
+    def report_skipped(self, action, skipped):
+        for variable, reason in skipped.items():
+            self.rfprint(f'{action} ${{{variable}}}: {reason}')
+
     def add_commands(self, lib_or_res):
-        libdoc = LibraryDocumentation(lib_or_res, '', '', None)
-        raw_keywords = libdoc.keywords
-        for raw_keyword in raw_keywords:
-            self.COMMANDS.append(raw_keyword.name)
+        if self.keyword_cache is None:
+            keywords = library_keywords(lib_or_res)
+        else:
+            keywords = self.keyword_cache.keywords(lib_or_res)
+        return self.registry.add(lib_or_res, keywords)
 
-    @staticmethod
-    def alter_commands(cmd):
+    def reindex_library(self, name):
+        # Reloading can add or remove keywords. A dynamic library does that without its name, version or source
+        # changing, so the keyword cache would still have the old ones and they are taken from the library itself
+        context = EXECUTION_CONTEXTS.current
+        library = context.namespace._kw_store.get_library(context.variables.replace_scalar(name))
+        keywords = [{'name': handler.name, 'args': [str(arg) for arg in handler.arguments]}
+                    for handler in library.handlers]
+        return self.registry.add(self.registry.find(name) or name, keywords)
+
+    def command_matches(self, text):
+        return self.command_index.matches(text) + self.registry.matches(text)
+
+    def indexing_status(self):
+        statuses = self.indexer.statuses()
+        if not statuses:
+            self.rfprint('Nothing has been imported yet')
+        for status in statuses:
+            self.rfprint(status)
+
+    def alter_commands(self, cmd):
         if cmd.lower().startswith('open browser') and 'options=add_experimental_option' not in cmd:
-            return f'{cmd}  options=add_experimental_option("excludeSwitches", ["enable-logging"])'
+            altered = f'{cmd}  options=add_experimental_option("excludeSwitches", ["enable-logging"])'
+            # Remembered so that the session log has the command the way it was typed as well
+            self._altered = (altered, cmd)
+            return altered
+
+        return cmd
 
+    def typed_command(self, cmd):
+        if self._altered and self._altered[0] == cmd:
+            return self._altered[1]
         return cmd
 
-    def run_rf(self, cmd, log=True, throw=False):
-        try:
-            original_cmd = cmd
-            is_setting = False
-            result = None
-            keyword, *args = re.split(r'\s{2,}', cmd)
-            if keyword.lower() == 'library':
-                is_setting = True
-                self.add_commands(args[0])
-                result = BuiltIn().import_library(args[0])
-            elif keyword.lower() == 'resource':
-                is_setting = True
-                self.add_commands(args[0])
-                result = BuiltIn().import_resource(args[0])
-            elif keyword.lower() == 'variables':
-                is_setting = True
-                result = BuiltIn().import_variables(args[0])
-            elif keyword.startswith(('$', '@', '&', '%')):
-                variable = keyword.replace('=', '').strip()
-                if args[0] in ['Create List', 'Create Dictionary', 'Set Variable']:
-                    result = BuiltIn().set_local_variable(variable, *args[1:])
+    @contextmanager
+    def command_guard(self, timeout=None, throw=False):
+        # Only the outermost command is guarded, commands run by it count towards its timeout
+        if self._guarded:
+            yield
+            return
+
+        self._guarded = True
+        try:
+            with CommandGuard(self.timeout if timeout is None else timeout):
+                yield
+        except CommandAborted as e:
+            self.rfprint(e.report())
+            if throw:
+                raise RuntimeError(str(e)) from e
+        finally:
+            self._guarded = False
+
+    @contextmanager
+    def timed(self, cmd):
+        # Like the guard, only the outermost command is timed so that a keyword run to assign a variable is counted once.
+        # Commands run by it fill in the same outcome, so the session log gets the value that was assigned
+        if self._timing:
+            yield self._outcome
+            return
+
+        self._timing = True
+        outcome = self._outcome = {}
+        status = 'FAIL'
+        error = None
+        start = time.monotonic()
+        try:
+            yield outcome
+            status = 'PASS'
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.monotonic() - start
+            self._timing = False
+            keyword, library = self.command_keyword(cmd)
+            if keyword:
+                self.timings.record(cmd, keyword, library, elapsed, status)
+            if self.session_log:
+                self.session_log.command(self.typed_command(cmd), cmd, status, elapsed, error, outcome.get('result'),
+                                         self.sessions.name if self.sessions else None)
+
+    @staticmethod
+    def command_keyword(cmd):
+        keyword, *args = re.split(r'\s{2,}', cmd)
+        if keyword.lower() in ('library', 'resource', 'variables'):
+            return keyword.title(), args[0] if args else None
+        if keyword.startswith(('$', '@', '&', '%')):
+            keyword = args[0] if args else ''
+        if keyword == '' or keyword.startswith('#'):
+            return None, None
+
+        context = EXECUTION_CONTEXTS.current
+        if context is None:
+            return keyword, None
+        try:
+            runner = context.namespace.get_runner(keyword)
+        except Exception:
+            return keyword, None
+        return getattr(runner, 'longname', keyword), getattr(runner, 'libname', None)
+
+    def run_rf(self, cmd, log=True, throw=False, timeout=None):
+        with self.command_guard(timeout, throw):
+            try:
+                with self.timed(cmd) as outcome:
+                    result = self._run_rf(cmd, log)
+                    outcome.setdefault('result', result)
+                    return result
+            except Exception as e:
+                if throw:
+                    raise e
                 else:
-                    value = self.run_rf('    '.join(args), log=False, throw=True)
-                    result = BuiltIn().set_local_variable(variable, value)
-            elif keyword.startswith('#'):
-                pass
-            elif keyword == '':
-                pass
+                    self.rfprint(e)
+
+    def _run_rf(self, cmd, log):
+        original_cmd = cmd
+        is_setting = False
+        result = None
+        keyword, *args = re.split(r'\s{2,}', cmd)
+        if is_block(cmd):
+            run_block(cmd)
+            self.variable_index.invalidate()
+        elif keyword.lower() == 'library':
+            is_setting = True
+            result = BuiltIn().import_library(args[0])
+            self.indexer.submit(args[0])
+        elif keyword.lower() == 'resource':
+            is_setting = True
+            result = BuiltIn().import_resource(args[0])
+            self.indexer.submit(args[0], is_resource=True)
+        elif keyword.lower() == 'variables':
+            is_setting = True
+            result = BuiltIn().import_variables(args[0])
+            self.variable_index.invalidate()
+        elif keyword.startswith(('$', '@', '&', '%')):
+            variable = keyword.replace('=', '').strip()
+            if args[0] in ['Create List', 'Create Dictionary', 'Set Variable']:
+                result = BuiltIn().set_local_variable(variable, *args[1:])
             else:
-                result = BuiltIn().run_keyword(keyword, *args)
-                if not keyword.startswith('Log To Console'):
-                    self.rfprint(result)
+                value = self.run_rf('    '.join(args), log=False, throw=True)
+                result = BuiltIn().set_local_variable(variable, value)
+            self.variable_index.update(variable)
+        elif keyword.startswith('#'):
+            pass
+        elif keyword == '':
+            pass
+        else:
+            result = BuiltIn().run_keyword(keyword, *args)
+            if keyword.lower() == 'reload library' and args:
+                self.reindex_library(args[0])
+            if not keyword.startswith('Log To Console'):
+                self.show_result(result)
 
-            if log:
-                if is_setting:
-                    self.SUCCESS_SETTINGS.append(original_cmd)
-                else:
-                    self.SUCCESS_CMD_HISTORY.append(original_cmd)
+        if log:
+            self.record(original_cmd, is_setting)
+
+        return result
+
+    def show_result(self, result):
+        # Kept whole in ${_} like the last result in a Python shell, only a bounded preview of it is printed
+        if result is not None:
+            self.last_result = result
+            self.last_page = 1
+            context = EXECUTION_CONTEXTS.current
+            if context is not None:
+                context.variables.set_local_variable(LAST_RESULT, result)
+        self.rfprint(preview(result))
+
+    def page(self, number=None):
+        result = self.last_result
+        if result is None:
+            self.rfprint('There is no result to page through')
+            return
+        if not can_page(result):
+            self.rfprint(f'Only text, lists and dictionaries can be paged, the last result is {type(result).__name__}')
+            return
+
+        number = number or self.last_page + 1
+        pages = page_count(result)
+        if not 1 <= number <= pages:
+            self.rfprint(f'The last result has {pages} pages')
+            return
+        self.last_page = number
+        self.rfprint(f'{render_page(result, number)}\n{describe(result, number)}')
+
+    def show_timings(self, path=None):
+        if not path:
+            self.rfprint(self.timings.report())
+            return
+
+        try:
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(self.timings.to_json())
+            self.rfprint(f'Timings of {len(self.timings)} commands written to {path}')
+        except OSError as e:
+            self.rfprint(e)
+
+    def library_path(self, cmd):
+        _, library = self.command_keyword(cmd)
+        if library is None:
+            return None
+        try:
+            return library_path(EXECUTION_CONTEXTS.current.namespace.get_library_instance(library))
+        except Exception:
+            return None
+
+    def profile(self, cmd, top, everything=False, path=None, throw=False):
+        profiler = cProfile.Profile()
+        try:
+            with profiler:
+                self.run_rf(cmd, throw=throw)
+        finally:
+            self.rfprint(profile_report(profiler, top, None if everything else self.library_path(cmd)))
+            if path:
+                try:
+                    profiler.dump_stats(path)
+                    self.rfprint(f'Profile written to {path}')
+                except OSError as e:
+                    self.rfprint(e)
 
+    def bench(self, cmd, runs, warmup, throw=False):
+        keyword, *args = re.split(r'\s{2,}', cmd)
+        if keyword.lower() in ('library', 'resource', 'variables', '') or keyword.startswith(('$', '@', '&', '%', '#')):
+            self.rfprint('Only keywords can be benchmarked')
+            return None
+
+        # The keyword is run straight through BuiltIn without printing its result, that only happens once at the end
+        run_keyword = BuiltIn().run_keyword
+        with self.command_guard(throw=throw):
+            try:
+                result = measure(lambda: run_keyword(keyword, *args), runs, warmup)
+            except Exception as e:
+                if throw:
+                    raise e
+                self.rfprint(e)
+                return None
+            self.rfprint(f'{cmd}\n{result}')
             return result
-        except Exception as e:
-            if throw:
-                raise e
+
+    def submit_job(self, cmd):
+        keyword, *args = re.split(r'\s{2,}', cmd)
+        assign = None
+        if keyword.startswith(('$', '@', '&')):
+            assign = keyword.replace('=', '').strip()
+            keyword, *args = args if args else ['']
+
+        if keyword.lower() in ('library', 'resource', 'variables', ''):
+            self.rfprint('Only keywords can be run as background jobs')
+            return None
+
+        try:
+            function = library_call(EXECUTION_CONTEXTS.current, keyword, args)
+        except (DataError, ValueError) as e:
+            self.rfprint(e)
+            return None
+        job = self.jobs.submit(cmd, function, assign)
+        self.rfprint(f'[{job.id}]    {cmd}')
+        return job
+
+    def apply_finished_jobs(self):
+        # Variables are only assigned from the prompt's own thread, never from the job while other keywords may run
+        for job in self.jobs.finished_unapplied():
+            job.applied = True
+            if job.state == DONE:
+                try:
+                    if job.assign:
+                        BuiltIn().set_local_variable(job.assign, job.result)
+                        self.variable_index.update(job.assign)
+                    self.record(job.command)
+                except Exception as e:
+                    job.error = e
+            self.rfprint(job)
+
+    def list_jobs(self):
+        jobs = self.jobs.jobs()
+        if not jobs:
+            self.rfprint('No background jobs')
+        for job in jobs:
+            self.rfprint(job)
+
+    def wait_job(self, job_id=None):
+        try:
+            jobs = self.jobs.jobs() if job_id is None else [self.jobs.get(job_id)]
+            # Waiting is a command of its own, so Ctrl-C or the timeout stops the wait and leaves the jobs running
+            with self.command_guard():
+                for job in jobs:
+                    job.wait()
+            self.apply_finished_jobs()
+        except ValueError as e:
+            self.rfprint(e)
+
+    def job_result(self, job_id):
+        try:
+            job = self.jobs.get(job_id)
+            self.apply_finished_jobs()
+            if not job.is_finished():
+                self.rfprint(f'Job {job_id} is still running')
+            elif job.state == DONE:
+                self.show_result(job.result)
             else:
-                self.rfprint(e)
+                self.rfprint(f'Job {job_id} {job.state}: {job.error}')
+        except ValueError as e:
+            self.rfprint(e)
 
-    def completer(self, text, state):
+    def cancel_job(self, job_id):
+        try:
+            if self.jobs.get(job_id).cancel():
+                self.rfprint(f'Cancelling job {job_id}')
+            else:
+                self.rfprint(f'Job {job_id} has already finished')
+        except ValueError as e:
+            self.rfprint(e)
+
+    def completion_options(self, text):
         sects = re.split(r'\s{2,}', text)
         if len(sects) > 1:
             if (sects[0].startswith('$') or sects[0].startswith('&') or sects[0].startswith('@')) and (len(sects) <= 2):
-                options = [i for i in self.COMMANDS if i.startswith(sects[-1])]
+                return self.command_matches(sects[-1])
             else:
-                options = [i for i in BuiltIn().get_variables() if i.startswith(sects[-1])]
+                return self.variable_index.matches(sects[-1])
         else:
-            options = [i for i in self.COMMANDS if i.startswith(text)]
+            return self.command_matches(text)
+
+    def completer(self, text, state):
+        # Readline calls back once per state for the same text, so the options are only looked up on the first call
+        if state == 0 or text != self._completion_text:
+            self._completion_text = text
+            self._completion_options = self.completion_options(text)
+
+        options = self._completion_options
+        sects = re.split(r'\s{2,}', text)
         if state < len(options):
             sects[-1] = options[state]
             return '    '.join(sects)
@@ -186,34 +586,376 @@ Export
             return None
 
     def rfprint(self, obj):
-        lines = str(obj).splitlines()
-        for line in lines:
-            line = re.sub(r'([$@&%\[\]])', r'\\\1', line)
-            line = line.replace(" ", "${SPACE}")
-            self.run_rf(f'Log To Console    {line}', log=False)
+        self.console.write(obj)
+
+
+def create_keyword_cache(options):
+    if options.no_cache:
+        return None
+
+    keyword_cache = KeywordCache(options.cache_dir, rebuild=options.rebuild_cache)
+    if options.clear_cache:
+        keyword_cache.clear()
+    return keyword_cache
+
+
+def journal_path(options):
+    if options.journal:
+        return options.journal
+    # --resume continues the journal written last, any other start gets a new one
+    return (options.resume and latest_journal()) or default_journal_path()
+
+
+def create_journal(options, path=None):
+    if options.no_journal:
+        return None
+    if not options.journal:
+        prune_journals()
+    return SessionJournal(path or journal_path(options), append=options.resume)
+
+
+def create_session_log(options):
+    if options.no_session_log:
+        return None
+    if not options.session_log:
+        prune_logs()
+    return SessionLog(options.session_log or default_log_path(), max_bytes=int(options.session_log_size * 1024 ** 2),
+                      backups=options.session_log_backups)
+
+
+def parse_timeout(value):
+    if value is None or value.strip().upper() in ('', 'NONE'):
+        return None
+    return timestr_to_secs(value)
+
+
+def timeout_option(value):
+    # Invalid values are reported as usage errors, under robot.run the prompt's own errors go nowhere
+    try:
+        return parse_timeout(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def export_name_option(value):
+    try:
+        ExportFiles(template=value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return value
+
+
+def run_special_command(rfi, cmd, throw=False):
+    match = TIMEOUT_COMMAND.match(cmd)
+    if match:
+        value, command = match.groups()
+        try:
+            timeout = parse_timeout(value)
+        except ValueError as e:
+            if throw:
+                raise
+            rfi.rfprint(e)
+            return True
+        if command:
+            rfi.run_rf(rfi.alter_commands(command), throw=throw, timeout=timeout or 0)
+        elif value:
+            rfi.timeout = timeout
+        else:
+            rfi.rfprint(f'Timeout: {rfi.timeout:g}s' if rfi.timeout else 'Timeout: NONE')
+        return True
+
+    if cmd == 'indexing()':
+        rfi.indexing_status()
+        return True
+
+    match = PROFILE_COMMAND.match(cmd)
+    if match:
+        options, command = match.groups()
+        if command:
+            rfi.profile(rfi.alter_commands(command), *parse_profile_options(options), throw=throw)
+        else:
+            rfi.rfprint('profile() needs a command to run, e.g. profile()    Sleep    1s')
+        return True
+
+    match = BENCH_COMMAND.match(cmd)
+    if match:
+        options, command = match.groups()
+        try:
+            runs, warmup = parse_bench_options(options)
+        except ValueError as e:
+            if throw:
+                raise
+            rfi.rfprint(e)
+            return True
+        if command:
+            rfi.bench(rfi.alter_commands(command), runs, warmup, throw=throw)
+        else:
+            rfi.rfprint('bench() needs a keyword to run, e.g. bench(100)    Get Length    abc')
+        return True
+
+    match = TIMINGS_COMMAND.match(cmd)
+    if match:
+        rfi.show_timings(match.group(1).strip())
+        return True
+
+    match = SNAPSHOT_COMMAND.match(cmd)
+    if match:
+        name, snapshot = match.groups()
+        if not snapshot.strip():
+            rfi.rfprint(f'{name}() needs the name of a snapshot, e.g. {name}(logged_in)')
+        elif name == 'snapshot':
+            rfi.snapshot(snapshot.strip())
+        else:
+            rfi.restore(snapshot.strip())
+        return True
+
+    if cmd == 'sessions()':
+        rfi.rfprint(rfi.sessions.report() if rfi.sessions else 'Sessions are only available in a running prompt')
+        return True
+
+    match = SESSION_COMMAND.match(cmd)
+    if match:
+        name, session = match.groups()
+        try:
+            if rfi.sessions is None:
+                raise ValueError('Sessions are only available in a running prompt')
+            if name == 'newsession':
+                rfi.sessions.create(session.strip())
+            elif name == 'session':
+                rfi.sessions.switch(session.strip())
+            else:
+                rfi.sessions.close(session.strip())
+        except ValueError as e:
+            if throw:
+                raise
+            rfi.rfprint(e)
+        return True
+
+    match = PAGE_COMMAND.match(cmd)
+    if match:
+        rfi.page(int(match.group(1)) if match.group(1) else None)
+        return True
+
+    if cmd == 'jobs()':
+        rfi.list_jobs()
+        return True
+
+    match = JOB_COMMAND.match(cmd)
+    if match:
+        name, job_id = match.groups()
+        job_id = int(job_id) if job_id else None
+        if name == 'wait':
+            rfi.wait_job(job_id)
+        elif job_id is None:
+            rfi.rfprint(f'{name}() needs the id of a job')
+        elif name == 'result':
+            rfi.job_result(job_id)
+        else:
+            rfi.cancel_job(job_id)
+        return True
+
+    match = BACKGROUND_JOB.match(cmd)
+    if match:
+        rfi.submit_job(rfi.alter_commands(match.group(1)))
+        return True
+
+    if cmd == 'export()':
+        rfi.export()
+        return True
+
+    if cmd == 'exportall()':
+        rfi.export(allCmds=True)
+        return True
+
+    return False
+
+
+def run_command(rfi, cmd):
+    rfi.apply_finished_jobs()
+    if not run_special_command(rfi, cmd, throw=True):
+        rfi.run_rf(rfi.alter_commands(cmd), throw=True)
+
+
+class BatchFailure(AssertionError):
+    pass
+
+
+def current_session(rfi):
+    return rfi.sessions.current if rfi.sessions else rfi
+
+
+def batch_commands(lines):
+    blocks = BlockBuffer()
+    first_line = None
+    for line_number, line in enumerate(lines, start=1):
+        cmd = line.strip()
+        if cmd == '':
+            continue
+        if not blocks:
+            first_line = line_number
+        cmd = blocks.add(cmd)
+        if cmd is not None:
+            yield first_line, cmd
+
+    # A block that never got its END still runs, Robot Framework reports what is missing
+    if blocks:
+        yield first_line, blocks.flush()
+
+
+def run_batch(rfi, lines, stop_on_failure=False, results_file=None):
+    results = []
+    start = time.perf_counter()
+    for line_number, cmd in batch_commands(lines):
+        rfi = current_session(rfi)
+        if cmd == 'exit()':
+            break
+
+        status = 'PASS'
+        message = ''
+        cmd_start = time.perf_counter()
+        try:
+            run_command(rfi, cmd)
+        except Exception as e:
+            status = 'FAIL'
+            message = str(e)
+            rfi.rfprint(f'Line {line_number}: {message}')
+
+        result = {'line': line_number, 'command': cmd, 'status': status, 'message': message,
+                  'elapsed': time.perf_counter() - cmd_start}
+        results.append(result)
+        if results_file:
+            results_file.write(json.dumps(result) + '\n')
+
+        if status == 'FAIL' and stop_on_failure:
+            break
+
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for result in results if result['status'] == 'FAIL')
+    rate = len(results) / elapsed if elapsed else 0
+    rfi.rfprint(f'{len(results)} commands, {len(results) - failed} passed, {failed} failed in {elapsed:.3f}s '
+                f'({rate:.1f} commands/s)')
+    return results
+
+
+def run_pasted(rfi, lines):
+    # Everything the commands print, Log To Console included, is shown at once when the last of them is done
+    target = rfi.sessions or rfi
+    console = target.console
+    output = io.StringIO()
+    target.console = ConsoleWriter(output)
+    try:
+        with console_redirected(output):
+            return run_batch(rfi, lines)
+    finally:
+        target.console = console
+        console.write(output.getvalue())
+
+
+def read_batch(rfi):
+    lines = []
+    while True:
+        line = get_input(rfi, BLOCK_PROMPT)
+        if line.strip() == 'end()':
+            return lines
+        lines.extend(line.splitlines())
+
+
+def run_batch_file(rfi, options):
+    lines = sys.stdin if options.batch == '-' else open(options.batch, encoding='utf-8')
+    results_file = open(options.batch_results, 'w', encoding='utf-8') if options.batch_results else None
+    try:
+        results = run_batch(rfi, lines, options.stop_on_failure, results_file)
+    finally:
+        current_session(rfi).indexer.shutdown()
+        if lines is not sys.stdin:
+            lines.close()
+        if results_file:
+            results_file.close()
+
+    failed = sum(1 for result in results if result['status'] == 'FAIL')
+    if failed:
+        raise BatchFailure(f'{failed} batch commands failed')
 
 
 def run_interactive():
-    rfi = RobotFrameworkInteractive()
+    keyword_cache = create_keyword_cache(OPTIONS)
+    timeout = OPTIONS.timeout
+    export_files = ExportFiles(OPTIONS.export_dir, OPTIONS.export_name)
+
+    session_log = create_session_log(OPTIONS)
+
+    def new_session():
+        # Only the session the prompt started with is recorded in the journal, the session log has all of them
+        session = RobotFrameworkInteractive(keyword_cache=keyword_cache, timeout=timeout, export_files=export_files,
+                                            session_log=session_log)
+        session.add_commands("BuiltIn")
+        return session
+
+    journal_file = journal_path(OPTIONS)
+    rfi = RobotFrameworkInteractive(keyword_cache=keyword_cache, timeout=timeout,
+                                    journal=create_journal(OPTIONS, journal_file),
+                                    export_files=export_files, session_log=session_log)
     rfi.add_commands("BuiltIn")
-    readline.set_completer(rfi.completer)
+    sessions = SessionManager(rfi, new_session)
+    if OPTIONS.resume:
+        rfi.resume(journal_file)
+    try:
+        run_session(rfi)
+    finally:
+        sessions.close_all()
+        if rfi.journal:
+            rfi.journal.close()
+        if session_log:
+            session_log.close()
+
+
+def run_session(rfi):
+    if OPTIONS.batch:
+        run_batch_file(rfi, OPTIONS)
+        return
+
+    blocks = BlockBuffer()
+    if OPTIONS.serve:
+        def serve_command(cmd):
+            cmd = blocks.add(cmd)
+            if cmd is not None:
+                run_command(current_session(rfi), cmd)
+
+        try:
+            ReplServer(rfi.sessions or rfi, OPTIONS.serve, serve_command).serve_forever()
+        finally:
+            current_session(rfi).indexer.shutdown()
+        return
+
+    readline.set_completer(lambda text, state: current_session(rfi).completer(text, state))
     readline.set_completer_delims('')
     readline.parse_and_bind("tab: complete")
+    if os.name == 'posix':
+        # Pasted text then arrives as one input with all of its lines instead of one line at a time
+        readline.parse_and_bind("set enable-bracketed-paste on")
 
     while True:
-        cmd = get_input(rfi).strip()
+        rfi = current_session(rfi)
+        cmd = get_input(rfi, BLOCK_PROMPT if blocks else None).strip()
 
-        if cmd == 'exit()':
-            return
+        # Inside a block every line belongs to it, special commands are only run outside of one
+        if not blocks:
+            if cmd == 'exit()':
+                rfi.indexer.shutdown()
+                return
 
-        if cmd == 'export()':
-            rfi.export()
-            rfi.SUCCESS_CMD_HISTORY.append(cmd)
+            if cmd == 'batch()' or '\n' in cmd:
+                run_pasted(rfi, read_batch(rfi) if cmd == 'batch()' else cmd.splitlines())
+                continue
+
+            rfi.apply_finished_jobs()
+            if run_special_command(rfi, cmd):
+                continue
+        elif cmd == '':
             continue
 
-        if cmd == 'exportall()':
-            rfi.export(allCmds=True)
-            rfi.SUCCESS_CMD_HISTORY.append(cmd)
+        cmd = blocks.add(cmd)
+        if cmd is None:
             continue
 
         try:
@@ -223,12 +965,86 @@ def run_interactive():
             rfi.rfprint(str(e))
 
 
-def main():
-    print(WELCOME_MSG)
-    dir_path = os.path.dirname(os.path.realpath(__file__))
-    with open(os.devnull, 'w') as devnull:
-        try:
-            robot.run(os.path.join(dir_path, "Main.robot"), stdout=devnull, stderr=devnull, log=None, output=None,
-                      report=None)
-        except Exception as e:
-            print(e)
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='robotframeworkinteractive',
+                                     description='Run Robot Framework interactively from the command line')
+    parser.add_argument('--fast', action='store_true',
+                        help='Start in a minimal execution context instead of running the Main.robot suite')
+    parser.add_argument('--batch', metavar='FILE', default=None,
+                        help='Run the commands in FILE, one per line, without prompting and exit. Use - for stdin')
+    parser.add_argument('--stop-on-failure', action='store_true', help='Stop the batch at the first failing command')
+    parser.add_argument('--batch-results', metavar='FILE', default=None,
+                        help='Write the result of every batch command to FILE as JSON lines')
+    parser.add_argument('--serve', metavar='SOCKET', default=None,
+                        help='Keep the session running behind the Unix domain socket SOCKET for '
+                             'robotframeworkinteractive-client instead of prompting')
+    parser.add_argument('--timeout', type=timeout_option, default=None,
+                        help='Default timeout for every command, e.g. 30s or 2 minutes (default: no timeout)')
+    parser.add_argument('--trace', metavar='FILE', default=None,
+                        help='Record every keyword, including the ones other keywords run, in FILE. Files ending '
+                             'with .json are Chrome trace event files, anything else is written as JSON lines')
+    parser.add_argument('--export-dir', metavar='DIR', default=None,
+                        help='Directory export() and exportall() write to (default: current directory)')
+    parser.add_argument('--export-name', metavar='TEMPLATE', type=export_name_option, default=DEFAULT_TEMPLATE,
+                        help='File name of exports, {number} is replaced with the number of the export and left out '
+                             'of the first one (default: %(default)s)')
+    parser.add_argument('--journal', metavar='FILE', default=None,
+                        help='Record the successful commands of the session in FILE as they run '
+                             '(default: a new session-<time>-<pid>.jsonl in the user state directory)')
+    parser.add_argument('--no-journal', action='store_true', help='Do not record the session on disk')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue the session recorded in the journal, e.g. after a crash '
+                             '(default: the journal written last)')
+    parser.add_argument('--session-log', metavar='FILE', default=None,
+                        help='Log every command with its result, errors and duration to FILE as JSON lines '
+                             '(default: a new commands-<time>-<pid>.jsonl in the user state directory)')
+    parser.add_argument('--no-session-log', action='store_true', help='Do not log the commands of the session')
+    parser.add_argument('--session-log-size', metavar='MB', type=float, default=10,
+                        help='Size in megabytes at which the session log is rotated (default: %(default)s)')
+    parser.add_argument('--session-log-backups', metavar='COUNT', type=int, default=5,
+                        help='Number of rotated session logs to keep (default: %(default)s)')
+    parser.add_argument('--cache-dir', default=None,
+                        help='Directory for the keyword cache used by completion (default: user cache directory)')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the keyword cache')
+    parser.add_argument('--clear-cache', action='store_true', help='Remove all keyword cache entries on startup')
+    parser.add_argument('--rebuild-cache', action='store_true',
+                        help='Ignore existing keyword cache entries and regenerate them on import')
+    return parser.parse_args(argv)
+
+
+OPTIONS = parse_args([])
+
+
+def main(argv=None):
+    global OPTIONS
+    OPTIONS = parse_args(argv)
+    if not OPTIONS.batch:
+        print(WELCOME_MSG)
+    try:
+        listeners = [TraceListener(OPTIONS.trace)] if OPTIONS.trace else []
+    except OSError as e:
+        print(e)
+        return 1
+    run_options = {'listener': listeners} if listeners else {}
+
+    try:
+        if OPTIONS.fast:
+            try:
+                with execution_context(**run_options):
+                    run_interactive()
+            except Exception as e:
+                print(e)
+                return 1
+            return 0
+
+        dir_path = os.path.dirname(os.path.realpath(__file__))
+        with open(os.devnull, 'w') as devnull:
+            try:
+                return robot.run(os.path.join(dir_path, "Main.robot"), stdout=devnull, stderr=devnull, log=None,
+                                 output=None, report=None, **run_options)
+            except Exception as e:
+                print(e)
+                return 1
+    finally:
+        for listener in listeners:
+            listener.close()
@@ -0,0 +1,121 @@
+"""
+server
+
+Keeps one Robot Framework Interactive session running behind a Unix domain socket
+
+Every line a client sends is run as a command. Everything the command prints is streamed back, followed by a status
+line that starts with STATUS_MARKER and holds the result as JSON.
+"""
+
+import json
+import os
+import socket
+import sys
+from contextlib import contextmanager
+
+from .console import ConsoleWriter
+
+STATUS_MARKER = '\x00'
+CLOSE_COMMAND = 'exit()'
+SHUTDOWN_COMMAND = 'shutdown()'
+
+
+def remove_stale_socket(path):
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(path)
+    else:
+        raise RuntimeError(f'A server is already listening on {path}')
+    finally:
+        probe.close()
+
+
+@contextmanager
+def console_redirected(stream):
+    # Log To Console always writes to the original standard output, so that is what has to point at the client
+    original = sys.__stdout__
+    sys.__stdout__ = stream
+    try:
+        yield
+    finally:
+        sys.__stdout__ = original
+
+
+class ReplServer:
+    def __init__(self, rfi, path, run_command):
+        self.rfi = rfi
+        self.path = path
+        self.run_command = run_command
+        self.running = False
+
+    def serve_forever(self):
+        if not hasattr(socket, 'AF_UNIX'):
+            raise RuntimeError('Server mode needs Unix domain socket support')
+
+        remove_stale_socket(self.path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Anyone who can connect can run any keyword, so the socket is only accessible to the current user
+        old_umask = os.umask(0o077)
+        try:
+            listener.bind(self.path)
+        finally:
+            os.umask(old_umask)
+
+        listener.listen()
+        self.running = True
+        self.rfi.rfprint(f'Listening on {self.path}')
+        try:
+            while self.running:
+                conn, _ = listener.accept()
+                with conn:
+                    self.handle(conn)
+        finally:
+            listener.close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def handle(self, conn):
+        reader = conn.makefile('r', encoding='utf-8', newline='\n')
+        writer = conn.makefile('w', encoding='utf-8', newline='\n')
+        original_console = self.rfi.console
+        self.rfi.console = ConsoleWriter(writer)
+        try:
+            for line in reader:
+                cmd = line.strip()
+                if cmd == CLOSE_COMMAND:
+                    self.send_status(writer, 'PASS')
+                    return
+                if cmd == SHUTDOWN_COMMAND:
+                    self.running = False
+                    self.send_status(writer, 'PASS')
+                    return
+
+                with console_redirected(writer):
+                    status, message = self.execute(cmd)
+                self.send_status(writer, status, message)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.rfi.console = original_console
+            reader.close()
+            try:
+                writer.close()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    def execute(self, cmd):
+        try:
+            self.run_command(cmd)
+        except Exception as e:
+            self.rfi.rfprint(str(e))
+            return 'FAIL', str(e)
+        return 'PASS', ''
+
+    @staticmethod
+    def send_status(writer, status, message=''):
+        writer.write(STATUS_MARKER + json.dumps({'status': status, 'message': message}) + '\n')
+        writer.flush()
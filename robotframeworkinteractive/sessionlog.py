@@ -0,0 +1,164 @@
+"""
+sessionlog
+
+Structured log of every command of a session, written in the background and rotated by size
+"""
+
+import glob
+import json
+import os
+import reprlib
+import threading
+import time
+from datetime import datetime
+
+from .journal import state_directory
+
+MAX_BYTES = 10 * 1024 * 1024
+BACKUPS = 5
+FLUSH_INTERVAL = 1.0
+BUFFER_SIZE = 1000
+RESULT_LENGTH = 200
+
+
+LOG_PATTERN = 'commands*.jsonl'
+LOGS_KEPT = 20
+
+
+def default_log_path():
+    # Rotating renames files, which only one process can do safely, so every process logs to a file of its own
+    return os.path.join(state_directory(), f'commands-{time.strftime("%Y%m%d-%H%M%S")}-{os.getpid()}.jsonl')
+
+
+def prune_logs(directory=None, keep=LOGS_KEPT):
+    paths = sorted(glob.glob(os.path.join(directory or state_directory(), LOG_PATTERN)), key=os.path.getmtime)
+    for path in paths[:-keep or None]:
+        for old in [path, *glob.glob(glob.escape(path) + '.*')]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+def _user_only(path, flags):
+    # Commands may hold passwords, so only the user can read the log
+    return os.open(path, flags, 0o600)
+
+
+def short_repr(value, length=RESULT_LENGTH):
+    # reprlib never builds the repr of a whole large list or string, only of the part that is kept
+    limited = reprlib.Repr()
+    limited.maxstring = limited.maxother = length
+    text = limited.repr(value)
+    return text if len(text) <= length else text[:length - 3] + '...'
+
+
+class SessionLog:
+    def __init__(self, path, max_bytes=MAX_BYTES, backups=BACKUPS, flush_interval=FLUSH_INTERVAL,
+                 buffer_size=BUFFER_SIZE):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self._records = []
+        self._lock = threading.Lock()
+        # Only one flush writes at a time, while records keep being added to the buffer
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = None
+        self._file = None
+        self._size = 0
+
+    def command(self, command, altered, status, elapsed, error=None, result=None, session=None):
+        record = {'time': datetime.now().isoformat(timespec='milliseconds'), 'command': command, 'altered': altered,
+                  'status': status, 'error': None if error is None else str(error) or type(error).__name__,
+                  'elapsed': round(elapsed, 6), 'result': None if result is None else short_repr(result)}
+        if session is not None:
+            record['session'] = session
+        self.write(record)
+
+    def write(self, record):
+        # Running a command only adds to the buffer, the file is written by a thread of its own
+        with self._lock:
+            if self._closed:
+                return
+            self._records.append(record)
+            if self._thread is None:
+                # Started with the first record, so a session that runs nothing never touches the log
+                self._thread = threading.Thread(target=self._run, name='rfi-session-log', daemon=True)
+                self._thread.start()
+            if len(self._records) >= self.buffer_size:
+                self._wake.set()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except OSError:
+                # A full disk or a removed directory must not take the session down, the records are dropped
+                pass
+
+    def flush(self):
+        with self._write_lock:
+            with self._lock:
+                records, self._records = self._records, []
+            if not records:
+                return
+            if self._file is None:
+                self._open()
+
+            chunk = []
+            for record in records:
+                line = json.dumps(record, default=str) + '\n'
+                size = len(line.encode('utf-8'))
+                if self._size and self._size + size > self.max_bytes:
+                    self._file.write(''.join(chunk))
+                    chunk = []
+                    self._rotate()
+                chunk.append(line)
+                self._size += size
+            self._file.write(''.join(chunk))
+            self._file.flush()
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8', newline='\n', opener=_user_only)
+        self._size = self._file.tell()
+
+    def _rotate(self):
+        # The same naming as logging's RotatingFileHandler: commands.jsonl.1 is the newest old file
+        self._file.close()
+        if self.backups:
+            for number in range(self.backups - 1, 0, -1):
+                source = f'{self.path}.{number}'
+                if os.path.exists(source):
+                    os.replace(source, f'{self.path}.{number + 1}')
+            os.replace(self.path, f'{self.path}.1')
+        self._file = open(self.path, 'w', encoding='utf-8', newline='\n', opener=_user_only)
+        self._size = 0
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        self._wake.set()
+        if thread is not None:
+            thread.join()
+        try:
+            self.flush()
+        except OSError:
+            pass
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
@@ -0,0 +1,152 @@
+"""
+sessions
+
+Independent interactive sessions that share one process, each with its own history, imports and variables
+"""
+
+import sys
+import types
+from collections import deque
+
+from robot.running.context import EXECUTION_CONTEXTS
+
+from .bootstrap import session_namespace
+
+MAIN_SESSION = 'main'
+# Shared by every session, so they are never counted towards one
+_SHARED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+
+def deep_size(obj):
+    # Follows containers and instance attributes, objects that can be reached more than once are counted once
+    seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SHARED_TYPES):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            stack.extend(obj)
+        attributes = getattr(obj, '__dict__', None)
+        if isinstance(attributes, dict):
+            stack.append(attributes)
+    return size
+
+
+def format_size(size):
+    for unit, scale in (('MB', 1024 ** 2), ('KB', 1024)):
+        if size >= scale:
+            return f'{size / scale:.1f} {unit}'
+    return f'{size} B'
+
+
+class Session:
+    def __init__(self, name, rfi, namespace=None):
+        self.name = name
+        self.rfi = rfi
+        self.namespace = namespace
+
+    def variables(self):
+        if self.namespace is None:
+            return {}
+        return self.namespace.variables.current.store.data
+
+    def memory(self):
+        rfi = self.rfi
+        return deep_size((rfi.SUCCESS_CMD_HISTORY, rfi.SUCCESS_SETTINGS, rfi.registry, rfi.timings, self.variables()))
+
+    def __str__(self):
+        rfi = self.rfi
+        return (f'{self.name}    {len(rfi.SUCCESS_CMD_HISTORY)} commands    {len(rfi.SUCCESS_SETTINGS)} settings    '
+                f'{len(self.variables())} variables    {format_size(self.memory())}')
+
+
+class SessionManager:
+    def __init__(self, rfi, factory, name=MAIN_SESSION):
+        # The first session is the one the prompt started with, it keeps the namespace of the running context
+        self._factory = factory
+        self._sessions = {}
+        context = EXECUTION_CONTEXTS.current
+        self._add(name, rfi, context.namespace if context else None)
+        self.name = name
+
+    def _add(self, name, rfi, namespace):
+        rfi.sessions = self
+        if self._sessions:
+            rfi.prompt = f'RF [{name}]> '
+        self._sessions[name] = Session(name, rfi, namespace)
+        return rfi
+
+    def _get(self, name):
+        if name not in self._sessions:
+            raise ValueError(f'No session named {name}')
+        return self._sessions[name]
+
+    @property
+    def current(self):
+        return self._sessions[self.name].rfi
+
+    # The server swaps the console of whatever it runs commands in, which has to be every session
+    @property
+    def console(self):
+        return self.current.console
+
+    @console.setter
+    def console(self, console):
+        for session in self._sessions.values():
+            session.rfi.console = console
+
+    def rfprint(self, obj):
+        self.current.rfprint(obj)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __contains__(self, name):
+        return name in self._sessions
+
+    def create(self, name):
+        if not name:
+            raise ValueError('A new session needs a name')
+        if name in self._sessions:
+            raise ValueError(f'Session {name} already exists')
+
+        context = EXECUTION_CONTEXTS.current
+        rfi = self._factory()
+        rfi.console = self.current.console
+        self._add(name, rfi, session_namespace(context) if context else None)
+        return self.switch(name)
+
+    def switch(self, name):
+        session = self._get(name)
+        context = EXECUTION_CONTEXTS.current
+        if context is not None and session.namespace is not None:
+            context.namespace = session.namespace
+        self.name = name
+        return session.rfi
+
+    def close(self, name):
+        session = self._get(name)
+        if name == self.name:
+            raise ValueError(f'Switch to another session before closing {name}')
+        del self._sessions[name]
+        session.rfi.indexer.shutdown()
+
+    def close_all(self):
+        # The current session is shut down by whatever ran it, the others are closed and the context gets back the
+        # namespace it started with
+        for name in [name for name in self._sessions if name != self.name]:
+            self._sessions[name].rfi.indexer.shutdown()
+        main = next(iter(self._sessions.values()))
+        self.switch(main.name)
+        self._sessions = {main.name: main}
+
+    def report(self):
+        return '\n'.join(f'{"*" if session.name == self.name else " "} {session}'
+                         for session in self._sessions.values())
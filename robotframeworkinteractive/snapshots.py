@@ -0,0 +1,81 @@
+"""
+snapshots
+
+Binary snapshots of the settings and variables of a session, so that a new session is ready without running them again
+"""
+
+import os
+import pickle
+
+from robot.utils import normalize
+
+from .journal import state_directory
+
+FORMAT = 1
+EXTENSION = '.snapshot'
+# Robot Framework sets these itself in every suite and test, a restored session keeps its own
+BUILT_IN_VARIABLES = frozenset(normalize(name, ignore='_') for name in (
+    'CURDIR', 'TEMPDIR', 'EXECDIR', '/', ':', '\\n', 'SPACE', 'True', 'False', 'None', 'null', 'EMPTY', 'OPTIONS',
+    'TEST_NAME', 'TEST_TAGS', 'TEST_DOCUMENTATION', 'TEST_STATUS', 'TEST_MESSAGE', 'PREV_TEST_NAME',
+    'PREV_TEST_STATUS', 'PREV_TEST_MESSAGE', 'SUITE_NAME', 'SUITE_SOURCE', 'SUITE_DOCUMENTATION', 'SUITE_METADATA',
+    'SUITE_STATUS', 'SUITE_MESSAGE', 'KEYWORD_STATUS', 'KEYWORD_MESSAGE', 'LOG_LEVEL', 'OUTPUT_DIR', 'OUTPUT_FILE',
+    'LOG_FILE', 'REPORT_FILE', 'DEBUG_FILE'))
+
+
+def snapshot_path(name):
+    # A plain name goes next to the session journal, anything that looks like a path is used as it is
+    if os.sep in name or '/' in name or name.endswith(EXTENSION):
+        return name
+    return os.path.join(state_directory(), 'snapshots', name + EXTENSION)
+
+
+def user_variables(store):
+    for name in store:
+        if normalize(name, ignore='_') not in BUILT_IN_VARIABLES:
+            yield name
+
+
+def write_snapshot(path, settings, store):
+    # Every value is pickled on its own, one that can't be is reported and left out instead of failing the snapshot
+    variables = {}
+    skipped = {}
+    for name in user_variables(store):
+        try:
+            variables[name] = pickle.dumps(store[name], protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            skipped[name] = f'{type(e).__name__}: {e}'
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Written next to the old snapshot and then moved over it, so a failed write never leaves half a snapshot behind
+    temporary = path + '.tmp'
+    if os.path.exists(temporary):
+        # Left over by a failed write, a new file gets the permissions below
+        os.remove(temporary)
+    # Variables hold tokens and passwords, so only the user can read the snapshot
+    with open(temporary, 'wb', opener=lambda name, flags: os.open(name, flags, 0o600)) as file:
+        pickle.dump({'format': FORMAT, 'settings': list(settings), 'variables': variables}, file,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, path)
+    return len(variables), skipped
+
+
+def read_snapshot(path):
+    with open(path, 'rb') as file:
+        try:
+            snapshot = pickle.load(file)
+        except Exception as e:
+            raise ValueError(f'{path} is not a snapshot: {e}')
+    if not isinstance(snapshot, dict) or snapshot.get('format') != FORMAT:
+        raise ValueError(f'{path} is not a snapshot')
+
+    # A value whose class can't be imported any more only loses that one variable
+    variables = {}
+    skipped = {}
+    for name, value in snapshot['variables'].items():
+        try:
+            variables[name] = pickle.loads(value)
+        except Exception as e:
+            skipped[name] = f'{type(e).__name__}: {e}'
+    return snapshot['settings'], variables, skipped
@@ -0,0 +1,94 @@
+"""
+timings
+
+Keeps how long the latest commands took, to find out which keywords are slow
+"""
+
+import collections
+import heapq
+import json
+import math
+
+CAPACITY = 1000
+SLOWEST = 10
+
+
+def percentile(sorted_values, percent):
+    index = max(0, math.ceil(percent / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+class CommandTiming:
+    def __init__(self, command, keyword, library, elapsed, status):
+        self.command = command
+        self.keyword = keyword
+        self.library = library
+        self.elapsed = elapsed
+        self.status = status
+
+    def to_dict(self):
+        return {'command': self.command, 'keyword': self.keyword, 'library': self.library, 'elapsed': self.elapsed,
+                'status': self.status}
+
+
+class CommandTimings:
+    # Only the latest commands are kept so that a session that runs for days doesn't keep growing
+    def __init__(self, capacity=CAPACITY):
+        self._timings = collections.deque(maxlen=capacity)
+
+    def __len__(self):
+        return len(self._timings)
+
+    def __iter__(self):
+        return iter(list(self._timings))
+
+    def record(self, command, keyword, library, elapsed, status):
+        timing = CommandTiming(command, keyword, library, elapsed, status)
+        self._timings.append(timing)
+        return timing
+
+    def clear(self):
+        self._timings.clear()
+
+    def slowest(self, count=SLOWEST):
+        return heapq.nlargest(count, self, key=lambda timing: timing.elapsed)
+
+    def keyword_stats(self):
+        elapsed = collections.defaultdict(list)
+        for timing in self:
+            elapsed[timing.keyword].append(timing.elapsed)
+
+        stats = []
+        for keyword, values in elapsed.items():
+            values.sort()
+            stats.append({'keyword': keyword, 'count': len(values), 'p50': percentile(values, 50),
+                          'p95': percentile(values, 95), 'max': values[-1], 'total': sum(values)})
+        return sorted(stats, key=lambda stat: stat['total'], reverse=True)
+
+    def library_totals(self):
+        totals = collections.defaultdict(lambda: {'count': 0, 'total': 0.0})
+        for timing in self:
+            total = totals[timing.library or '']
+            total['count'] += 1
+            total['total'] += timing.elapsed
+        return sorted(({'library': library, **total} for library, total in totals.items()),
+                      key=lambda total: total['total'], reverse=True)
+
+    def report(self, count=SLOWEST):
+        if not self._timings:
+            return 'No commands have been timed yet'
+
+        lines = [f'Slowest of the last {len(self)} commands:']
+        lines.extend(f'    {timing.elapsed:.3f}s    {timing.status}    {timing.command}'
+                     for timing in self.slowest(count))
+        lines.append('Keywords (count    p50    p95    max):')
+        lines.extend(f'    {stat["keyword"]}    {stat["count"]}    {stat["p50"]:.3f}s    {stat["p95"]:.3f}s    '
+                     f'{stat["max"]:.3f}s' for stat in self.keyword_stats())
+        lines.append('Libraries (count    total):')
+        lines.extend(f'    {total["library"] or "<none>"}    {total["count"]}    {total["total"]:.3f}s'
+                     for total in self.library_totals())
+        return '\n'.join(lines)
+
+    def to_json(self):
+        return json.dumps({'commands': [timing.to_dict() for timing in self], 'keywords': self.keyword_stats(),
+                           'libraries': self.library_totals()}, indent=2)
@@ -0,0 +1,85 @@
+"""
+tracing
+
+Listener that records every keyword, including the ones other keywords run, as a Chrome trace or as JSON lines
+"""
+
+import json
+import os
+import threading
+import time
+
+BUFFER_SIZE = 1000
+
+
+class TraceListener:
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self, path, buffer_size=BUFFER_SIZE):
+        self.path = path
+        # Files ending with .json are Chrome trace event files that chrome://tracing and Perfetto open as a flame chart
+        self.chrome = path.lower().endswith('.json')
+        self.buffer_size = buffer_size
+        self._events = []
+        self._written = 0
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._file = open(path, 'w', encoding='utf-8')
+        if self.chrome:
+            self._file.write('[\n')
+
+    def _stack(self):
+        # Background jobs run keywords on their own threads, each of them nests its keywords separately
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def start_keyword(self, name, attrs):
+        self._stack().append(time.perf_counter_ns())
+
+    def end_keyword(self, name, attrs):
+        end = time.perf_counter_ns()
+        stack = self._stack()
+        if not stack:
+            return
+        start = stack.pop()
+        if self.chrome:
+            event = {'name': name, 'cat': attrs['libname'] or attrs['type'], 'ph': 'X',
+                     'ts': (start - self._origin) / 1000, 'dur': (end - start) / 1000, 'pid': self._pid,
+                     'tid': threading.get_ident(),
+                     'args': {'args': attrs['args'], 'depth': len(stack), 'status': attrs['status']}}
+        else:
+            event = {'name': name, 'library': attrs['libname'], 'type': attrs['type'], 'args': attrs['args'],
+                     'depth': len(stack), 'status': attrs['status'], 'start': (start - self._origin) / 1e9,
+                     'elapsed': (end - start) / 1e9, 'thread': threading.get_ident()}
+
+        with self._lock:
+            self._events.append(event)
+            if len(self._events) >= self.buffer_size:
+                self.flush()
+
+    def flush(self):
+        with self._lock:
+            if not self._events or self._file is None:
+                return
+            separator = ',\n' if self.chrome else '\n'
+            if self._written and self.chrome:
+                self._file.write(separator)
+            self._file.write(separator.join(json.dumps(event) for event in self._events))
+            if not self.chrome:
+                self._file.write('\n')
+            self._file.flush()
+            self._written += len(self._events)
+            self._events = []
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._file is None:
+                return
+            if self.chrome:
+                self._file.write('\n]\n')
+            self._file.close()
+            self._file = None
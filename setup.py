@@ -6,7 +6,8 @@ with open('README.md') as readme:
 setup(
     name='robotframeworkinteractive',
     entry_points={
-        "console_scripts": ['robotframeworkinteractive = robotframeworkinteractive.robotframeworkinteractive:main']
+        "console_scripts": ['robotframeworkinteractive = robotframeworkinteractive.robotframeworkinteractive:main',
+                            'robotframeworkinteractive-client = robotframeworkinteractive.client:main']
     },
     version='1.0.5',
     python_requires='>=3.8',
@@ -19,7 +20,7 @@ setup(
     license='MIT',
     packages=['robotframeworkinteractive'],
     package_data={'': ['Main.robot']},
-    install_requires=['robotframework>=3.2',
+    install_requires=['robotframework>=5.0',
                       'pyreadline'
                       ],
     classifiers=[
@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import MagicMock
+
+from robotframeworkinteractive.benchmarking import WARMUP, BenchResult, format_duration, measure, parse_bench_options
+
+
+class ParseBenchOptionsTests(unittest.TestCase):
+    def test_runs(self):
+        self.assertEqual((100, WARMUP), parse_bench_options('100'))
+
+    def test_runs_and_warmup(self):
+        self.assertEqual((100, 0), parse_bench_options(' 100, 0 '))
+
+    def test_invalid(self):
+        for options in ('', '0', 'x', '10, x', '1, 2, 3'):
+            with self.assertRaises(ValueError):
+                parse_bench_options(options)
+
+
+class MeasureTests(unittest.TestCase):
+    def test_warmup_not_measured(self):
+        function = MagicMock()
+        result = measure(function, 5, warmup=2)
+        self.assertEqual(7, function.call_count)
+        self.assertEqual(5, len(result.elapsed))
+        self.assertEqual(2, result.warmup)
+
+
+class BenchResultTests(unittest.TestCase):
+    def setUp(self):
+        self.result = BenchResult([0.004, 0.001, 0.002, 0.003], warmup=3)
+
+    def test_statistics(self):
+        self.assertEqual(0.001, self.result.min)
+        self.assertAlmostEqual(0.0025, self.result.mean)
+        self.assertAlmostEqual(0.0025, self.result.median)
+        self.assertEqual(0.004, self.result.p95)
+        self.assertAlmostEqual(0.00129099, self.result.stddev)
+        self.assertAlmostEqual(400, self.result.ops)
+
+    def test_single_run(self):
+        self.assertEqual(0.0, BenchResult([0.5]).stddev)
+
+    def test_str(self):
+        self.assertEqual('4 runs after 3 warmup runs\n'
+                         '    min     1.000 ms\n'
+                         '    mean    2.500 ms\n'
+                         '    median  2.500 ms\n'
+                         '    p95     4.000 ms\n'
+                         '    stddev  1.291 ms\n'
+                         '    ops/s   400.0', str(self.result))
+
+    def test_format_duration(self):
+        self.assertEqual('1.500 s', format_duration(1.5))
+        self.assertEqual('20.000 us', format_duration(0.00002))
+        self.assertEqual('50 ns', format_duration(0.00000005))
+
+
+if __name__ == '__main__':
+    unittest.main()
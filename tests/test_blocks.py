@@ -0,0 +1,83 @@
+import unittest
+
+from robot.errors import ExecutionFailures
+from robot.libraries.BuiltIn import BuiltIn
+
+from robotframeworkinteractive.blocks import BlockBuffer, depth_change, format_block, is_block, parse_block, \
+    run_block
+from robotframeworkinteractive.bootstrap import execution_context
+
+
+class BlockDetectionTests(unittest.TestCase):
+    def test_is_block(self):
+        self.assertTrue(is_block('FOR  ${i}  IN RANGE  10'))
+        self.assertTrue(is_block('WHILE  True'))
+        self.assertTrue(is_block('IF  $x  Log  x'))
+        self.assertTrue(is_block('${x}=  IF  $x  Set Variable  a'))
+        self.assertFalse(is_block('Log  FOR'))
+        self.assertFalse(is_block('${x}=  Set Variable  IF'))
+        self.assertFalse(is_block('For Each Element  a'))
+
+    def test_depth_change(self):
+        self.assertEqual(1, depth_change('FOR  ${i}  IN  a  b'))
+        self.assertEqual(1, depth_change('IF  $x'))
+        self.assertEqual(0, depth_change('IF  $x  Log  x'))
+        self.assertEqual(0, depth_change('ELSE'))
+        self.assertEqual(-1, depth_change('END'))
+        self.assertEqual(0, depth_change('Log  END'))
+        self.assertEqual(0, depth_change(''))
+
+    def test_format_block(self):
+        lines = ['FOR  ${i}  IN  a', 'IF  $i', 'Log  ${i}', 'ELSE', 'Fail', 'END', 'END']
+        self.assertEqual('FOR  ${i}  IN  a\n    IF  $i\n        Log  ${i}\n    ELSE\n        Fail\n    END\nEND',
+                         format_block(lines))
+
+
+class BlockBufferTests(unittest.TestCase):
+    def setUp(self):
+        self.blocks = BlockBuffer()
+
+    def test_single_line(self):
+        self.assertEqual('Log  x', self.blocks.add('Log  x'))
+        self.assertEqual('END', self.blocks.add('END'))
+        self.assertFalse(self.blocks)
+
+    def test_nested_block(self):
+        self.assertIsNone(self.blocks.add('FOR  ${i}  IN  a'))
+        self.assertIsNone(self.blocks.add('WHILE  False'))
+        self.assertIsNone(self.blocks.add('END'))
+        self.assertTrue(self.blocks)
+        self.assertEqual('FOR  ${i}  IN  a\n    WHILE  False\n    END\nEND', self.blocks.add('END'))
+        self.assertFalse(self.blocks)
+
+    def test_flush(self):
+        self.blocks.add('FOR  ${i}  IN  a')
+        self.blocks.add('Log  ${i}')
+        self.assertEqual('FOR  ${i}  IN  a\n    Log  ${i}', self.blocks.flush())
+        self.assertFalse(self.blocks)
+
+
+class RunBlockTests(unittest.TestCase):
+    def test_parse_block(self):
+        body = parse_block('FOR  ${i}  IN  a  b\n    Log  ${i}\nEND')
+        self.assertEqual(1, len(body))
+        self.assertEqual('FOR', body[0].type)
+
+    def test_run_block_sets_variables(self):
+        with execution_context():
+            BuiltIn().set_local_variable('${total}', 0)
+            run_block('FOR  ${i}  IN RANGE  5\n    ${total}=  Evaluate  ${total} + ${i}\nEND')
+            self.assertEqual(10, BuiltIn().get_variable_value('${total}'))
+            run_block('${size}=  IF  ${total} > 5  Set Variable  big  ELSE  Set Variable  small')
+            self.assertEqual('big', BuiltIn().get_variable_value('${size}'))
+
+    def test_run_block_failures(self):
+        with execution_context():
+            with self.assertRaisesRegex(ExecutionFailures, 'boom'):
+                run_block('IF  True\n    Fail  boom\nEND')
+            with self.assertRaisesRegex(ExecutionFailures, 'FOR loop must have closing END'):
+                run_block('FOR  ${i}  IN  a\n    Log  ${i}')
+
+
+if __name__ == '__main__':
+    unittest.main()
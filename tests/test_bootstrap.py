@@ -0,0 +1,35 @@
+import unittest
+
+from robot.libraries.BuiltIn import BuiltIn
+from robot.running.context import EXECUTION_CONTEXTS
+
+from robotframeworkinteractive.bootstrap import execution_context, CONTEXT_NAME
+
+
+class ExecutionContextTests(unittest.TestCase):
+    def test_execution_context_runs_keywords(self):
+        with execution_context():
+            BuiltIn().set_local_variable('${VALUE}', 'test')
+            result = BuiltIn().run_keyword('Catenate', '${VALUE}', 'run')
+            self.assertEqual('test run', result)
+
+    def test_execution_context_builtin_variables(self):
+        with execution_context():
+            self.assertEqual(CONTEXT_NAME, BuiltIn().get_variable_value('${SUITE_NAME}'))
+            self.assertEqual(CONTEXT_NAME, BuiltIn().get_variable_value('${TEST_NAME}'))
+
+    def test_execution_context_imports(self):
+        with execution_context():
+            BuiltIn().import_library('Collections')
+            result = BuiltIn().run_keyword('Create List', 'a', 'b')
+            BuiltIn().run_keyword('Append To List', result, 'c')
+            self.assertEqual(['a', 'b', 'c'], result)
+
+    def test_execution_context_ended(self):
+        with execution_context():
+            self.assertIsNotNone(EXECUTION_CONTEXTS.current)
+        self.assertIsNone(EXECUTION_CONTEXTS.current)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+from robot.libraries.BuiltIn import BuiltIn
+
+from robotframeworkinteractive.bootstrap import execution_context
+from robotframeworkinteractive.completion import CompletionIndex, VariableIndex, decorate
+
+
+class CompletionIndexTests(unittest.TestCase):
+    def test_matches_prefix(self):
+        index = CompletionIndex(['Log', 'Log To Console', 'Should Be Equal'])
+        self.assertEqual(['Log', 'Log To Console'], index.matches('Lo'))
+
+    def test_matches_case_insensitive(self):
+        index = CompletionIndex(['Log To Console', 'Should Be Equal'])
+        self.assertEqual(['Log To Console'], index.matches('log to c'))
+
+    def test_matches_insertion_order(self):
+        index = CompletionIndex(['Log To Console', 'Log', 'Log Many'])
+        self.assertEqual(['Log To Console', 'Log', 'Log Many'], index.matches('Log'))
+
+    def test_matches_no_match(self):
+        index = CompletionIndex(['Log To Console', 'Log'])
+        self.assertEqual([], index.matches('C'))
+
+    def test_matches_empty_prefix(self):
+        index = CompletionIndex(['b', 'a'])
+        self.assertEqual(['b', 'a'], index.matches(''))
+
+    def test_add_after_extend(self):
+        index = CompletionIndex(['Keyword %d' % i for i in range(20)])
+        index.add('Keyword')
+        self.assertEqual(21, len(index))
+        self.assertEqual('Keyword', index.matches('keyword')[-1])
+        self.assertEqual(['Keyword 1', 'Keyword 10', 'Keyword 11'], index.matches('Keyword 1')[:3])
+
+
+class VariableIndexTests(unittest.TestCase):
+    def test_decorate(self):
+        self.assertEqual('${name}', decorate('name', 'value'))
+        self.assertEqual('@{name}', decorate('name', ['value']))
+        self.assertEqual('&{name}', decorate('name', {'key': 'value'}))
+
+    def test_no_execution_context(self):
+        self.assertEqual([], VariableIndex().matches('${'))
+
+    def test_rebuilt_only_when_scope_changes(self):
+        index = VariableIndex()
+        with execution_context():
+            index.matches('${')
+            keys = index._keys
+            index.matches('${TEST')
+            index.matches('${SUITE')
+            self.assertIs(keys, index._keys)
+            BuiltIn().set_test_variable('${TEST_FRUIT}', 'apple')
+            self.assertEqual(['${TEST_FRUIT}'], index.matches('${TEST_F'))
+            self.assertIsNot(keys, index._keys)
+
+    def test_update_without_rebuild(self):
+        index = VariableIndex()
+        with execution_context():
+            index.matches('${')
+            keys = index._keys
+            for name, value in (('${fruit_b}', 'banana'), ('${fruit_a}', 'apple'), ('@{fruit_b}', ['banana'])):
+                BuiltIn().set_local_variable(name, value)
+                index.update(name)
+            self.assertEqual(['${fruit_a}'], index.matches('${fruit'))
+            self.assertEqual(['@{fruit_b}'], index.matches('@{fruit'))
+            self.assertIs(keys, index._keys)
+            self.assertEqual(sorted(index._keys), index._keys)
+
+    def test_update_item_assignment_rebuilds(self):
+        index = VariableIndex()
+        with execution_context():
+            index.matches('${')
+            index.update('${options}[key]')
+            self.assertIsNone(index._keys)
+
+if __name__ == '__main__':
+    unittest.main()
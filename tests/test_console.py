@@ -0,0 +1,39 @@
+import io
+import unittest
+from unittest.mock import patch
+
+from robotframeworkinteractive.console import ConsoleWriter
+
+
+class ConsoleWriterTests(unittest.TestCase):
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.console = ConsoleWriter(self.stream)
+
+    def test_write_single_line(self):
+        self.console.write('Test')
+        self.assertEqual('Test\n', self.stream.getvalue())
+
+    def test_write_empty(self):
+        self.console.write('')
+        self.assertEqual('', self.stream.getvalue())
+
+    def test_write_blank_lines_kept(self):
+        self.console.write('a\n\nb\r\nc\n')
+        self.assertEqual('a\n\nb\nc\n', self.stream.getvalue())
+
+    def test_write_in_chunks(self):
+        self.console.chunk_size = 10
+        with patch.object(self.stream, 'write', wraps=self.stream.write) as patched_write:
+            self.console.write('\n'.join(['12345'] * 10))
+            self.assertEqual(5, patched_write.call_count)
+        self.assertEqual('12345\n' * 10, self.stream.getvalue())
+
+    def test_write_default_stream(self):
+        with patch('sys.__stdout__', new=self.stream):
+            ConsoleWriter().write('Test')
+        self.assertEqual('Test\n', self.stream.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
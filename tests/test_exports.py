@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from robotframeworkinteractive.exports import ExportFiles
+
+
+class ExportFilesTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.export_files = ExportFiles(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def touch(self, *names):
+        for name in names:
+            open(os.path.join(self.directory, name), 'w').close()
+
+    def create_name(self):
+        with self.export_files.create() as file:
+            return os.path.basename(file.name)
+
+    def test_path(self):
+        self.assertEqual(os.path.join(self.directory, 'export.robot'), self.export_files.path(0))
+        self.assertEqual(os.path.join(self.directory, 'export_3.robot'), self.export_files.path(3))
+
+    def test_path_template(self):
+        export_files = ExportFiles(template='session-{number}.resource')
+        self.assertEqual('session.resource', export_files.path(0))
+        self.assertEqual('session-2.resource', export_files.path(2))
+
+    def test_template_only_number(self):
+        for subdirectory, template, names in (('robot', '{number}.robot', ['1.robot', '2.robot']),
+                                              ('plain', '{number}', ['1', '2'])):
+            self.export_files = ExportFiles(os.path.join(self.directory, subdirectory), template)
+            self.assertEqual(names, [self.create_name(), self.create_name()])
+
+    def test_template_without_number(self):
+        with self.assertRaises(ValueError):
+            ExportFiles(template='export.robot')
+
+    def test_first_free_number(self):
+        self.touch('export.robot', *(f'export_{i}.robot' for i in range(1, 38)))
+        self.assertEqual(38, self.export_files.first_free_number())
+
+    def test_first_free_number_with_gap_is_free(self):
+        self.touch('export.robot', *(f'export_{i}.robot' for i in range(1, 11) if i != 3))
+        number = self.export_files.first_free_number()
+        self.assertFalse(os.path.exists(self.export_files.path(number)))
+
+    def test_first_free_number_does_not_list_directory(self):
+        self.touch('export.robot', *(f'export_{i}.robot' for i in range(1, 1001)))
+        with patch('robotframeworkinteractive.exports.os.path.exists', wraps=os.path.exists) as patched_exists, \
+                patch('os.listdir') as patched_listdir, patch('os.scandir') as patched_scandir:
+            self.assertEqual(1001, self.export_files.first_free_number())
+            patched_listdir.assert_not_called()
+            patched_scandir.assert_not_called()
+        self.assertLess(patched_exists.call_count, 25)
+
+    def test_create_counts_up(self):
+        self.assertEqual(['export.robot', 'export_1.robot', 'export_2.robot'],
+                         [self.create_name() for _ in range(3)])
+
+    def test_create_skips_numbers_taken_by_other_sessions(self):
+        other_session = ExportFiles(self.directory)
+        self.assertEqual('export.robot', self.create_name())
+        with other_session.create():
+            pass
+        self.assertEqual('export_2.robot', self.create_name())
+
+    def test_create_makes_directory(self):
+        export_files = ExportFiles(os.path.join(self.directory, 'exports'))
+        with export_files.create() as file:
+            self.assertEqual(os.path.join(self.directory, 'exports', 'export.robot'), file.name)
+
+
+if __name__ == '__main__':
+    unittest.main()
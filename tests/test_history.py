@@ -0,0 +1,33 @@
+import unittest
+
+from robotframeworkinteractive.history import CommandHistory
+
+
+class CommandHistoryTests(unittest.TestCase):
+    def test_since_export_nothing_exported(self):
+        history = CommandHistory(['a', 'b'])
+        self.assertEqual(['a', 'b'], history.since_export())
+
+    def test_since_export_after_export(self):
+        history = CommandHistory(['a', 'b'])
+        history.mark_exported()
+        history.append('c')
+        self.assertEqual(['c'], history.since_export())
+        self.assertEqual(['a', 'b', 'c'], history)
+
+    def test_since_export_nothing_new(self):
+        history = CommandHistory(['a'])
+        history.mark_exported()
+        self.assertEqual([], history.since_export())
+
+    def test_export_markers_not_stored(self):
+        history = CommandHistory()
+        history.append('a')
+        history.mark_exported()
+        history.mark_exported()
+        self.assertEqual(['a'], history)
+        self.assertEqual(1, history.export_offset)
+
+
+if __name__ == '__main__':
+    unittest.main()
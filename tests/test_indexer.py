@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from robotframeworkinteractive.indexer import KeywordIndexer, resource_imports, DONE, FAILED
+
+
+class KeywordIndexerTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.indexed = []
+        self.indexer = KeywordIndexer(self.index_function)
+
+    def tearDown(self):
+        self.indexer.shutdown()
+        shutil.rmtree(self.directory)
+
+    def index_function(self, lib_or_res):
+        if lib_or_res == 'Missing':
+            raise ImportError('No module named Missing')
+        self.indexed.append(lib_or_res)
+        return 3
+
+    def write_file(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as file:
+            file.write(content)
+        return path
+
+    def test_submit_library(self):
+        self.indexer.submit('OperatingSystem')
+        self.indexer.wait()
+        self.assertEqual(['OperatingSystem'], self.indexed)
+        status, = self.indexer.statuses()
+        self.assertEqual(DONE, status.state)
+        self.assertEqual(3, status.keyword_count)
+        self.assertEqual('OperatingSystem    done    3 keywords', str(status))
+
+    def test_submit_failure(self):
+        self.indexer.submit('Missing')
+        self.indexer.wait()
+        status, = self.indexer.statuses()
+        self.assertEqual(FAILED, status.state)
+        self.assertEqual('Missing    failed    No module named Missing', str(status))
+
+    def test_submit_returns_immediately(self):
+        release = threading.Event()
+        indexer = KeywordIndexer(lambda lib_or_res: release.wait(5))
+        indexer.submit('Slow')
+        self.assertFalse(indexer.is_idle())
+        release.set()
+        indexer.wait()
+        self.assertTrue(indexer.is_idle())
+        indexer.shutdown()
+
+    def test_submit_resource_indexes_dependencies(self):
+        self.write_file('other.resource', '*** Settings ***\nLibrary    Collections\n')
+        path = self.write_file('main.resource', '*** Settings ***\nLibrary    OperatingSystem\nLibrary    String\n'
+                                                'Resource    other.resource\n')
+        self.indexer.submit(path, is_resource=True)
+        self.indexer.wait()
+        self.assertEqual(sorted([path, os.path.join(self.directory, 'other.resource'), 'OperatingSystem', 'String',
+                                 'Collections']), sorted(self.indexed))
+
+    def test_resource_imports(self):
+        self.write_file('other.resource', '')
+        self.write_file('MyLibrary.py', '')
+        path = self.write_file('main.resource', '*** Settings ***\nLibrary    OperatingSystem\n'
+                                                'Library    MyLibrary.py\nLibrary    ${LIBRARY}\n'
+                                                'Resource    other.resource\nResource    missing.resource\n')
+        libraries, resources = resource_imports(path)
+        self.assertEqual(['OperatingSystem', os.path.join(self.directory, 'MyLibrary.py')], libraries)
+        self.assertEqual([os.path.join(self.directory, 'other.resource')], resources)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import signal
+import threading
+import time
+import traceback
+import unittest
+
+from robotframeworkinteractive.interrupts import CommandGuard, CommandAborted, interesting_frames, ROBOT_DIR
+
+
+def busy(seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        time.sleep(0.01)
+
+
+class CommandGuardTests(unittest.TestCase):
+    def test_timeout_aborts(self):
+        with self.assertRaises(CommandAborted) as context:
+            with CommandGuard(timeout=0.1):
+                busy(5)
+        self.assertEqual('timeout of 0.1s exceeded', context.exception.reason)
+        self.assertGreaterEqual(context.exception.elapsed, 0.1)
+        self.assertEqual('busy', context.exception.frames[-1].name)
+
+    def test_finishes_before_timeout(self):
+        with CommandGuard(timeout=5):
+            busy(0.01)
+
+    def test_sigint_aborts(self):
+        with self.assertRaises(CommandAborted) as context:
+            with CommandGuard():
+                os.kill(os.getpid(), signal.SIGINT)
+                busy(5)
+        self.assertEqual('interrupted by Ctrl-C', context.exception.reason)
+
+    def test_previous_handler_restored(self):
+        previous = signal.getsignal(signal.SIGINT)
+        with self.assertRaises(CommandAborted):
+            with CommandGuard(timeout=0.05):
+                busy(5)
+        self.assertIs(previous, signal.getsignal(signal.SIGINT))
+
+    def test_not_main_thread_unguarded(self):
+        errors = []
+
+        def run():
+            try:
+                with CommandGuard(timeout=0.01):
+                    busy(0.05)
+            except BaseException as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join(5)
+        self.assertEqual([], errors)
+
+    def test_report(self):
+        frames = traceback.extract_stack()[-1:]
+        aborted = CommandAborted('timeout of 1s exceeded', 1.004, frames)
+        self.assertEqual(f'Command aborted: timeout of 1s exceeded after 1.00s\nTime was spent in:\n'
+                         f'    {frames[0].filename}:{frames[0].lineno} in test_report', aborted.report())
+
+
+class InterestingFramesTests(unittest.TestCase):
+    def test_robot_frames_skipped(self):
+        stack = traceback.StackSummary.from_list([(os.path.join(ROBOT_DIR, 'run.py'), 1, 'run', ''),
+                                                  ('/libs/Library.py', 2, 'keyword', ''),
+                                                  (os.path.join(ROBOT_DIR, 'utils.py'), 3, 'helper', '')])
+        self.assertEqual(['keyword'], [frame.name for frame in interesting_frames(stack)])
+
+    def test_only_robot_frames(self):
+        stack = traceback.StackSummary.from_list([(os.path.join(ROBOT_DIR, 'run.py'), 1, 'run', ''),
+                                                  (os.path.join(ROBOT_DIR, 'BuiltIn.py'), 2, 'sleep', '')])
+        self.assertEqual(['run', 'sleep'], [frame.name for frame in interesting_frames(stack)])
+
+    def test_limit(self):
+        stack = traceback.StackSummary.from_list([('/libs/Library.py', i, f'f{i}', '') for i in range(10)])
+        self.assertEqual(['f8', 'f9'], [frame.name for frame in interesting_frames(stack, limit=2)])
+
+
+if __name__ == '__main__':
+    unittest.main()
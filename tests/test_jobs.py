@@ -0,0 +1,103 @@
+import os
+import threading
+import time
+import unittest
+
+from robot.libraries.BuiltIn import BuiltIn
+
+from robotframeworkinteractive.bootstrap import execution_context
+from robotframeworkinteractive.jobs import JobManager, DONE, FAILED, CANCELLED, RUNNING, library_call
+
+
+class JobManagerTests(unittest.TestCase):
+    def setUp(self):
+        self.jobs = JobManager()
+
+    def test_submit_done(self):
+        job = self.jobs.submit('Evaluate  1+1', lambda: 2, assign='${RESULT}')
+        job.wait(5)
+        self.assertEqual(DONE, job.state)
+        self.assertEqual(2, job.result)
+        self.assertEqual('${RESULT}', job.assign)
+
+    def test_submit_failed(self):
+        def fail():
+            raise AssertionError('Test')
+
+        job = self.jobs.submit('Fail  Test', fail)
+        job.wait(5)
+        self.assertEqual(FAILED, job.state)
+        self.assertEqual('Test', str(job.error))
+        self.assertTrue(str(job).endswith('Fail  Test    Test'))
+
+    def test_submit_returns_while_running(self):
+        release = threading.Event()
+        job = self.jobs.submit('Slow', release.wait)
+        self.assertEqual(RUNNING, job.state)
+        self.assertFalse(job.is_finished())
+        release.set()
+        job.wait(5)
+        self.assertEqual(DONE, job.state)
+
+    def test_cancel_running(self):
+        def busy():
+            while True:
+                time.sleep(0.01)
+
+        job = self.jobs.submit('Busy', busy)
+        time.sleep(0.05)
+        self.assertTrue(job.cancel())
+        self.assertTrue(job.wait(5))
+        self.assertEqual(CANCELLED, job.state)
+
+    def test_cancel_finished(self):
+        job = self.jobs.submit('Quick', lambda: None)
+        job.wait(5)
+        self.assertFalse(job.cancel())
+        self.assertEqual(DONE, job.state)
+
+    def test_ids_increment(self):
+        first = self.jobs.submit('First', lambda: None)
+        second = self.jobs.submit('Second', lambda: None)
+        self.assertEqual([1, 2], [first.id, second.id])
+        self.assertEqual([first, second], self.jobs.jobs())
+
+    def test_get_unknown(self):
+        with self.assertRaises(ValueError):
+            self.jobs.get(1)
+
+    def test_finished_unapplied(self):
+        job = self.jobs.submit('Quick', lambda: None)
+        job.wait(5)
+        self.assertEqual([job], self.jobs.finished_unapplied())
+        job.applied = True
+        self.assertEqual([], self.jobs.finished_unapplied())
+
+
+class LibraryCallTests(unittest.TestCase):
+    def test_resolves_arguments_before_the_call(self):
+        with execution_context() as context:
+            BuiltIn().import_library('OperatingSystem')
+            BuiltIn().set_local_variable('${ITEM}', 'b')
+            function = library_call(context, 'Join Path', ['a', '${ITEM}'])
+            BuiltIn().set_local_variable('${ITEM}', 'c')
+        self.assertEqual(os.path.join('a', 'b'), function())
+
+    def test_runs_without_execution_context(self):
+        with execution_context() as context:
+            BuiltIn().import_library('OperatingSystem')
+            function = library_call(context, 'Get Environment Variable', ['RFI_UNSET', 'default'])
+        job = JobManager().submit('Get Environment Variable', function)
+        job.wait(5)
+        self.assertEqual('default', job.result)
+
+    def test_refuses_builtin_and_user_keywords(self):
+        with execution_context() as context:
+            with self.assertRaises(ValueError):
+                library_call(context, 'Sleep', ['1s'])
+            with self.assertRaises(ValueError):
+                library_call(context, 'Run Keyword', ['No Operation'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from robotframeworkinteractive.journal import SessionJournal, journals, latest_journal, prune_journals, read_journal
+
+
+class SessionJournalTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'state', 'session.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        journal = SessionJournal(self.path)
+        journal.setting('Library  Collections')
+        journal.command('Log  One')
+        journal.export()
+        journal.command('Log  Two')
+        journal.close()
+        settings, history = read_journal(self.path)
+        self.assertEqual(['Library  Collections'], settings)
+        self.assertEqual(['Log  One', 'Log  Two'], history)
+        self.assertEqual(['Log  Two'], history.since_export())
+
+    def test_records_visible_before_close(self):
+        journal = SessionJournal(self.path)
+        journal.command('Log  One')
+        self.assertEqual(['Log  One'], read_journal(self.path)[1])
+        journal.close()
+
+    def test_not_created_without_records(self):
+        SessionJournal(self.path).close()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_new_session_replaces_journal(self):
+        journal = SessionJournal(self.path)
+        journal.command('Log  One')
+        journal.close()
+        journal = SessionJournal(self.path)
+        journal.command('Log  Two')
+        journal.close()
+        self.assertEqual(['Log  Two'], read_journal(self.path)[1])
+
+    def test_append_continues_journal(self):
+        journal = SessionJournal(self.path)
+        journal.command('Log  One')
+        journal.close()
+        journal = SessionJournal(self.path, append=True)
+        journal.command('Log  Two')
+        journal.close()
+        self.assertEqual(['Log  One', 'Log  Two'], read_journal(self.path)[1])
+
+    def test_cut_off_record_skipped(self):
+        journal = SessionJournal(self.path)
+        journal.command('Log  One')
+        journal.close()
+        with open(self.path, 'a', encoding='utf-8') as file:
+            file.write('{"type": "command", "val')
+        journal = SessionJournal(self.path, append=True)
+        journal.command('Log  Two')
+        journal.close()
+        self.assertEqual(['Log  One', 'Log  Two'], read_journal(self.path)[1])
+
+    def test_fsync_batched(self):
+        journal = SessionJournal(self.path, sync_every=3, sync_interval=3600)
+        with patch('robotframeworkinteractive.journal.os.fsync') as patched_fsync:
+            for i in range(7):
+                journal.command(f'Log  {i}')
+            self.assertEqual(2, patched_fsync.call_count)
+            journal.close()
+            self.assertEqual(3, patched_fsync.call_count)
+
+    def test_fsync_interval(self):
+        journal = SessionJournal(self.path, sync_every=100, sync_interval=0)
+        with patch('robotframeworkinteractive.journal.os.fsync') as patched_fsync:
+            journal.command('Log  One')
+            patched_fsync.assert_called_once()
+            journal.close()
+
+    @unittest.skipIf(os.name == 'nt', 'File modes are POSIX only')
+    def test_only_readable_by_user(self):
+        journal = SessionJournal(self.path)
+        journal.command('Log  One')
+        journal.close()
+        self.assertEqual(0o600, os.stat(self.path).st_mode & 0o777)
+
+    def test_latest_and_prune(self):
+        self.assertIsNone(latest_journal(self.directory))
+        for mtime in range(3):
+            path = os.path.join(self.directory, f'session-{mtime}.jsonl')
+            open(path, 'w').close()
+            os.utime(path, (mtime, mtime))
+        self.assertEqual(os.path.join(self.directory, 'session-2.jsonl'), latest_journal(self.directory))
+        prune_journals(self.directory, keep=2)
+        self.assertEqual(['session-1.jsonl', 'session-2.jsonl'],
+                         [os.path.basename(path) for path in journals(self.directory)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from robotframeworkinteractive import keywordcache
+from robotframeworkinteractive.keywordcache import KeywordCache, cache_key
+
+
+class KeywordCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = KeywordCache(os.path.join(self.directory, 'cache'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_resource(self, content):
+        path = os.path.join(self.directory, 'Test.resource')
+        with open(path, 'w') as file:
+            file.write(content)
+        return path
+
+    def test_keywords_builtin(self):
+        keywords = self.cache.keywords('BuiltIn')
+        self.assertIn({'name': 'Log To Console', 'args': ['message', 'stream=STDOUT', 'no_newline=False',
+                                                          'format=']},
+                      keywords)
+
+    def test_keywords_warm_skips_libdoc(self):
+        cold = self.cache.keywords('BuiltIn')
+        with patch.object(keywordcache, 'library_keywords') as patched_library_keywords:
+            warm = self.cache.keywords('BuiltIn')
+            patched_library_keywords.assert_not_called()
+        self.assertEqual(cold, warm)
+
+    def test_keywords_rebuild_ignores_entries(self):
+        self.cache.put(cache_key('BuiltIn'), [{'name': 'Stale', 'args': []}])
+        self.cache.rebuild = True
+        keywords = self.cache.keywords('BuiltIn')
+        self.assertNotIn({'name': 'Stale', 'args': []}, keywords)
+
+    def test_keywords_resource_changed(self):
+        path = self.write_resource('*** Keywords ***\nFirst\n    No Operation\n')
+        self.assertEqual(['First'], [keyword['name'] for keyword in self.cache.keywords(path)])
+        path = self.write_resource('*** Keywords ***\nFirst\n    No Operation\n\nSecond\n    No Operation\n')
+        self.assertEqual(['First', 'Second'], [keyword['name'] for keyword in self.cache.keywords(path)])
+
+    def test_get_corrupt_entry(self):
+        key = cache_key('BuiltIn')
+        os.makedirs(self.cache.directory)
+        with open(self.cache._entry_path(key), 'w') as file:
+            file.write('{not json')
+        self.assertIsNone(self.cache.get(key))
+
+    def test_clear(self):
+        self.cache.keywords('BuiltIn')
+        self.cache.clear()
+        self.assertFalse(os.path.exists(self.cache.directory))
+
+    def test_clear_keeps_other_files(self):
+        self.cache.keywords('BuiltIn')
+        os.close(tempfile.mkstemp(dir=self.cache.directory, suffix='.tmp')[0])
+        notes = os.path.join(self.cache.directory, 'notes.txt')
+        with open(notes, 'w') as file:
+            file.write('precious')
+        self.cache.clear()
+        self.assertEqual(['notes.txt'], os.listdir(self.cache.directory))
+
+    def test_cache_key_library_contains_version(self):
+        self.assertTrue(cache_key('BuiltIn').startswith('library:BuiltIn:'))
+
+
+if __name__ == '__main__':
+    unittest.main()
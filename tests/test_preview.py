@@ -0,0 +1,77 @@
+import unittest
+from collections import OrderedDict
+
+from robotframeworkinteractive.preview import can_page, describe, fits, page_count, preview, render_page
+
+
+class Large:
+    def __str__(self):
+        return 'x' * 5000
+
+
+class PreviewTests(unittest.TestCase):
+    def test_small_values_unchanged(self):
+        for value in ('text', ['a', 'b'], {'a': 1}, (1,), None, 1.5, OrderedDict(a=1), set()):
+            self.assertEqual(str(value), preview(value))
+
+    def test_fits(self):
+        self.assertTrue(fits(['a'] * 20))
+        self.assertFalse(fits(['a'] * 21))
+        self.assertFalse(fits('x' * 2001))
+        self.assertFalse(fits(['x' * 2000]))
+        self.assertFalse(fits({'key': {'nested': ['x' * 3000]}}))
+        self.assertTrue(fits('x' * 10, max_chars=20))
+
+    def test_long_text(self):
+        result = preview('x' * 5000, max_chars=100)
+        self.assertEqual('x' * 100 + '\n<str of 5000 characters, page 1 of 50, page(2) shows the next one, '
+                                      'the whole value is in ${_}>', result)
+
+    def test_long_list(self):
+        result = preview(list(range(1000)), max_items=3)
+        self.assertEqual('0\n1\n2\n<list of 1000 items, page 1 of 334, page(2) shows the next one, '
+                         'the whole value is in ${_}>', result)
+
+    def test_large_items_cut_short(self):
+        lines = preview({'key': 'v' * 100000}).splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertLess(len(lines[0]), 200)
+        self.assertTrue(lines[0].startswith("'key': 'vvv"))
+
+    def test_other_objects_cut_short(self):
+        result = preview(Large(), max_chars=10)
+        self.assertEqual('x' * 10 + '\n<Large shown as 5000 characters, only the first 10 are shown, '
+                                     'the whole value is in ${_}>', result)
+        self.assertFalse(can_page(Large()))
+
+    def test_opaque_object_cut_short_with_default_limits(self):
+        class Opaque:
+            def __str__(self):
+                return 'y' * 100000
+
+        lines = preview(Opaque()).splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertEqual('y' * 2000, lines[0])
+        self.assertTrue(lines[1].startswith('<Opaque shown as 100000 characters'))
+        self.assertEqual('small', preview(type('Small', (), {'__str__': lambda self: 'small'})()))
+
+    def test_render_page(self):
+        self.assertEqual('3\n4\n5', render_page(list(range(10)), 2, max_items=3))
+        self.assertEqual('9', render_page(list(range(10)), 4, max_items=3))
+        self.assertEqual("'c': 3", render_page({'a': 1, 'b': 2, 'c': 3}, 2, max_items=2))
+        self.assertEqual('2', render_page({1, 2, 3}, 2, max_items=1))
+        self.assertEqual("b'cd'", render_page(b'abcde', 2, max_chars=2))
+        self.assertEqual('cd', render_page('abcde', 2, max_chars=2))
+
+    def test_page_count(self):
+        self.assertEqual(1, page_count([]))
+        self.assertEqual(2, page_count(list(range(21))))
+        self.assertEqual(3, page_count('x' * 5, max_chars=2))
+
+    def test_describe_last_page(self):
+        self.assertEqual('<bytes of 5 bytes, page 3 of 3, the whole value is in ${_}>',
+                         describe(b'abcde', 3, max_chars=2))
+
+
+if __name__ == '__main__':
+    unittest.main()
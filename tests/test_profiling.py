@@ -0,0 +1,59 @@
+import cProfile
+import os
+import unittest
+
+import robot
+from robot.libraries.BuiltIn import BuiltIn
+from robot.libraries.Collections import Collections
+
+from robotframeworkinteractive import completion
+from robotframeworkinteractive.completion import CompletionIndex
+from robotframeworkinteractive.profiling import TOP, library_path, parse_profile_options, profile_report
+
+
+def busy():
+    return sum(i * i for i in range(1000))
+
+
+class ParseProfileOptionsTests(unittest.TestCase):
+    def test_defaults(self):
+        self.assertEqual((TOP, False, None), parse_profile_options(''))
+
+    def test_all_options(self):
+        self.assertEqual((5, True, 'out.pstats'), parse_profile_options('5, all, out.pstats'))
+
+
+class LibraryPathTests(unittest.TestCase):
+    def test_standard_library_is_its_module(self):
+        self.assertEqual(os.path.abspath(robot.libraries.Collections.__file__), library_path(Collections()))
+        self.assertEqual(os.path.abspath(robot.libraries.BuiltIn.__file__), library_path(BuiltIn()))
+
+    def test_library_is_its_package(self):
+        self.assertEqual(os.path.dirname(os.path.abspath(completion.__file__)), library_path(CompletionIndex()))
+
+    def test_module_library(self):
+        self.assertEqual(os.path.dirname(os.path.abspath(completion.__file__)), library_path(completion))
+
+
+class ProfileReportTests(unittest.TestCase):
+    def setUp(self):
+        self.profiler = cProfile.Profile()
+        with self.profiler:
+            busy()
+
+    def test_report_restricted_to_path(self):
+        report = profile_report(self.profiler, path=os.path.abspath(__file__))
+        self.assertIn('(busy)', report)
+        self.assertNotIn('{built-in method builtins.sum}', report)
+
+    def test_report_everything_when_path_never_ran(self):
+        report = profile_report(self.profiler, path=os.path.abspath(completion.__file__))
+        self.assertIn('{built-in method builtins.sum}', report)
+
+    def test_report_top(self):
+        report = profile_report(self.profiler, top=1)
+        self.assertIn('due to restriction <1>', report)
+
+
+if __name__ == '__main__':
+    unittest.main()
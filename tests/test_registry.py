@@ -0,0 +1,63 @@
+import unittest
+
+from robotframeworkinteractive.registry import KeywordRegistry, library_name
+
+
+def keywords(*names):
+    return [{'name': name, 'args': []} for name in names]
+
+
+class LibraryNameTests(unittest.TestCase):
+    def test_library_name(self):
+        self.assertEqual('SeleniumLibrary', library_name('SeleniumLibrary'))
+        self.assertEqual('my.package.Library', library_name('my.package.Library'))
+        self.assertEqual('MyLibrary', library_name('libraries/MyLibrary.py'))
+        self.assertEqual('common', library_name('/tests/resources/common.resource'))
+
+
+class KeywordRegistryTests(unittest.TestCase):
+    def setUp(self):
+        self.registry = KeywordRegistry()
+        self.registry.add('SeleniumLibrary', keywords('Click Element', 'Open Browser'))
+
+    def test_qualified_names(self):
+        self.assertEqual(['Click Element'], self.registry.matches('Click'))
+        self.assertEqual(['SeleniumLibrary.Click Element', 'SeleniumLibrary.Open Browser'],
+                         self.registry.matches('seleniumlibrary.'))
+
+    def test_add_again_replaces(self):
+        self.registry.add('SeleniumLibrary', keywords('Click Element', 'Close Browser'))
+        self.assertEqual(4, len(self.registry))
+        self.assertEqual([], self.registry.matches('Open'))
+        self.assertEqual(['Click Element', 'Close Browser'], self.registry.matches('C'))
+        self.assertEqual(['SeleniumLibrary'], self.registry.libraries())
+
+    def test_duplicate_keywords_stored_once(self):
+        self.registry.add('Browser', keywords('Click', 'Click'))
+        self.assertCountEqual(['Click', 'Click Element'], self.registry.matches('Click'))
+        self.assertEqual(['Click'], self.registry.keywords('Browser'))
+
+    def test_shared_keyword_names(self):
+        self.registry.add('Browser', keywords('Open Browser'))
+        self.assertEqual(['Open Browser'], self.registry.matches('Open'))
+        self.registry.remove('SeleniumLibrary')
+        self.assertEqual(['Open Browser'], self.registry.matches('Open'))
+        self.assertEqual(['Browser.Open Browser'], self.registry.matches('Browser.'))
+        self.assertEqual([], self.registry.matches('SeleniumLibrary.'))
+
+    def test_remove(self):
+        self.assertTrue(self.registry.remove('SeleniumLibrary'))
+        self.assertFalse(self.registry.remove('SeleniumLibrary'))
+        self.assertEqual(0, len(self.registry))
+        self.assertEqual([], self.registry.matches(''))
+        self.assertNotIn('SeleniumLibrary', self.registry)
+
+    def test_find(self):
+        self.registry.add('libraries/MyLibrary.py', keywords('My Keyword'))
+        self.assertEqual('libraries/MyLibrary.py', self.registry.find('MyLibrary'))
+        self.assertEqual('SeleniumLibrary', self.registry.find('SeleniumLibrary'))
+        self.assertIsNone(self.registry.find('Browser'))
+
+
+if __name__ == '__main__':
+    unittest.main()
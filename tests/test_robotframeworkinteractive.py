@@ -1,8 +1,20 @@
+import io
+import json
+import tempfile
+import threading
 import unittest
-from unittest.mock import MagicMock, mock_open, patch, PropertyMock
+from unittest.mock import MagicMock, mock_open, patch, PropertyMock, call
 
-from robotframeworkinteractive.robotframeworkinteractive import os, glob, RobotFrameworkInteractive, main, \
-    run_interactive, WELCOME_MSG
+from robotframeworkinteractive.robotframeworkinteractive import os, RobotFrameworkInteractive, main, \
+    run_interactive, WELCOME_MSG, create_keyword_cache, parse_args, run_batch, run_batch_file, BatchFailure, \
+    run_special_command, create_journal, journal_path, run_pasted, create_session_log
+from robot.libraries.BuiltIn import BuiltIn
+
+from robotframeworkinteractive.bootstrap import execution_context
+from robotframeworkinteractive.interrupts import CommandAborted
+from robotframeworkinteractive.console import ConsoleWriter
+from robotframeworkinteractive.exports import ExportFiles
+from robotframeworkinteractive.history import CommandHistory
 
 EXCEPTION = Exception('Test')
 
@@ -16,51 +28,6 @@ class RobotFrameworkInteractiveTests(unittest.TestCase):
     def setUp(cls):
         cls.rfi = RobotFrameworkInteractive()
 
-    def test_list_filter_out_values_no_values(self):
-        lst = ['a', 'b', 'c']
-        result = self.rfi.list_filter_out_values(lst, [])
-        self.assertEqual(['a', 'b', 'c'], result)
-
-    def test_list_filter_out_values_one_value(self):
-        lst = ['a', 'b', 'c']
-        result = self.rfi.list_filter_out_values(lst, ['b'])
-        self.assertEqual(['a', 'c'], result)
-
-    def test_list_filter_out_values_multiple_values(self):
-        lst = ['a', 'b', 'c']
-        result = self.rfi.list_filter_out_values(lst, ['b', 'c'])
-        self.assertEqual(['a'], result)
-
-    def test_list_filter_out_values_value_not_exists(self):
-        lst = ['a', 'b', 'c']
-        result = self.rfi.list_filter_out_values(lst, ['d'])
-        self.assertEqual(['a', 'b', 'c'], result)
-
-    def test_list_filter_out_values_empty_list(self):
-        lst = []
-        result = self.rfi.list_filter_out_values(lst, ['d'])
-        self.assertEqual([], result)
-
-    def test_list_last_index_last_value(self):
-        lst = ['a', 'b', 'c']
-        result = self.rfi.list_last_index(lst, 'c')
-        self.assertEqual(2, result)
-
-    def test_list_last_index_first_value(self):
-        lst = ['a', 'b', 'c']
-        result = self.rfi.list_last_index(lst, 'a')
-        self.assertEqual(0, result)
-
-    def test_list_last_index_no_value(self):
-        lst = ['a', 'b', 'c']
-        result = self.rfi.list_last_index(lst, 'd')
-        self.assertEqual(-1, result)
-
-    def test_list_last_index_duplicate_value(self):
-        lst = ['a', 'b', 'c', 'c', 'b', 'a']
-        result = self.rfi.list_last_index(lst, 'b')
-        self.assertEqual(4, result)
-
     def test_convert_cmds_to_test_no_settings_no_cmds(self):
         cmds = []
         result = self.rfi.convert_cmds_to_test(cmds)
@@ -101,6 +68,22 @@ Export
 \t[Documentation]  Test Case exported from Robot Framework Interactive
 \tLog To Console  Test
 \t
+""", result)
+
+    def test_convert_cmds_to_test_block(self):
+        cmds = ['FOR  ${i}  IN  a  b\n    Log To Console  ${i}\nEND']
+        result = self.rfi.convert_cmds_to_test(cmds)
+        self.assertEqual("""*** Settings ***
+
+
+
+*** Test Cases ***
+Export
+\t[Documentation]  Test Case exported from Robot Framework Interactive
+\tFOR  ${i}  IN  a  b
+\t    Log To Console  ${i}
+\tEND
+\t
 """, result)
 
     def test_convert_cmds_to_test_settings_and_commands(self):
@@ -136,60 +119,170 @@ Export
 \t
 """, result)
 
+    def export_names(self, existing):
+        with tempfile.TemporaryDirectory() as directory:
+            for name in existing:
+                open(os.path.join(directory, name), 'w').close()
+            self.rfi.export_files = ExportFiles(directory)
+            self.rfi.rfprint = MagicMock()
+            self.rfi.export()
+            return sorted(set(os.listdir(directory)) - set(existing))
+
+    def test_export_first_export(self):
+        self.assertEqual(['export.robot'], self.export_names([]))
+
+    def test_export_with_export(self):
+        self.assertEqual(['export_1.robot'], self.export_names(['export.robot']))
+
+    def test_export_with_export_and_export_1(self):
+        self.assertEqual(['export_2.robot'], self.export_names(['export.robot', 'export_1.robot']))
+
+    def test_export_with_export_1(self):
+        self.assertEqual(['export_2.robot'], self.export_names(['export_1.robot']))
+
+    def test_export_ignores_unrelated_files(self):
+        self.assertEqual(['export_1.robot'], self.export_names(['export.robot', 'export_old.robot']))
+
     @patch('builtins.open', new_callable=mock_open, read_data='1')
-    def test_export_first_export(self, m_open):
-        glob.glob = MagicMock(return_value=[])
+    def test_export_writes_test(self, m_open):
         self.rfi.rfprint = MagicMock()
-        self.rfi.export()
-        m_open.assert_called_once_with('export.robot', 'w')
+        self.rfi.export_files = ExportFiles('exports')
+        with patch('robotframeworkinteractive.exports.os.makedirs'):
+            self.rfi.export()
+        m_open.assert_called_once_with(os.path.join('exports', 'export.robot'), 'x', encoding='utf-8')
+        self.rfi.rfprint.assert_called_once_with(f'Successful commands written to {m_open.return_value.name}')
 
     @patch('builtins.open', new_callable=mock_open, read_data='1')
-    def test_export_with_export(self, m_open):
-        glob.glob = MagicMock(return_value=['export.robot'])
+    def test_export_all_commands(self, m_open):
         self.rfi.rfprint = MagicMock()
-        self.rfi.export()
-        m_open.assert_called_once_with('export_1.robot', 'w')
+        self.rfi.SUCCESS_CMD_HISTORY = CommandHistory(['Log  One', 'Log  Two'])
+        self.rfi.SUCCESS_CMD_HISTORY.mark_exported()
+        self.rfi.write_test = MagicMock()
+        self.rfi.export(allCmds=True)
+        self.assertEqual(['Log  One', 'Log  Two'], list(self.rfi.write_test.call_args.args[1]))
+        self.assertEqual(2, self.rfi.SUCCESS_CMD_HISTORY.export_offset)
 
     @patch('builtins.open', new_callable=mock_open, read_data='1')
-    def test_export_with_export_and_export_1(self, m_open):
-        glob.glob = MagicMock(return_value=['export.robot', 'export_1.robot'])
+    def test_export_latest_commands(self, m_open):
         self.rfi.rfprint = MagicMock()
-        self.rfi.export()
-        m_open.assert_called_once_with('export_2.robot', 'w')
+        self.rfi.SUCCESS_CMD_HISTORY = CommandHistory(['Log  One'])
+        self.rfi.SUCCESS_CMD_HISTORY.mark_exported()
+        self.rfi.SUCCESS_CMD_HISTORY.append('Log  Two')
+        self.rfi.write_test = MagicMock()
+        self.rfi.export(allCmds=False)
+        self.rfi.write_test.assert_called_once_with(m_open.return_value, ['Log  Two'])
+        self.assertEqual(['Log  One', 'Log  Two'], self.rfi.SUCCESS_CMD_HISTORY)
+        self.assertEqual(2, self.rfi.SUCCESS_CMD_HISTORY.export_offset)
 
     @patch('builtins.open', new_callable=mock_open, read_data='1')
-    def test_export_with_export_1(self, m_open):
-        glob.glob = MagicMock(return_value=['export_1.robot'])
+    def test_export_nothing_new(self, m_open):
         self.rfi.rfprint = MagicMock()
+        self.rfi.SUCCESS_CMD_HISTORY = CommandHistory(['Log  One'])
+        self.rfi.export()
+        self.rfi.write_test = MagicMock()
         self.rfi.export()
-        m_open.assert_called_once_with('export_2.robot', 'w')
+        self.rfi.write_test.assert_called_once_with(m_open.return_value, [])
+
+    def test_record_journals_commands_and_settings(self):
+        self.rfi.SUCCESS_CMD_HISTORY = CommandHistory()
+        self.rfi.SUCCESS_SETTINGS = []
+        self.rfi.journal = MagicMock()
+        self.rfi.record('Library  Collections', is_setting=True)
+        self.rfi.record('Log  One')
+        self.assertEqual(['Library  Collections'], self.rfi.SUCCESS_SETTINGS)
+        self.assertEqual(['Log  One'], self.rfi.SUCCESS_CMD_HISTORY)
+        self.rfi.journal.setting.assert_called_once_with('Library  Collections')
+        self.rfi.journal.command.assert_called_once_with('Log  One')
 
     @patch('builtins.open', new_callable=mock_open, read_data='1')
-    def test_export_all_commands(self, m_open):
-        glob.glob = MagicMock(return_value=[])
+    def test_export_journals_checkpoint(self, m_open):
         self.rfi.rfprint = MagicMock()
-        self.rfi.list_filter_out_values = MagicMock(return_value=[])
-        self.rfi.list_last_index = MagicMock(return_value=-1)
-        self.rfi.export(allCmds=True)
-        self.rfi.list_filter_out_values.assert_called_once_with(self.rfi.SUCCESS_CMD_HISTORY, ['export()', 'exportall()'])
-        self.rfi.list_last_index.assert_not_called()
+        self.rfi.journal = MagicMock()
+        self.rfi.SUCCESS_CMD_HISTORY = CommandHistory(['Log  One'])
+        self.rfi.export()
+        self.rfi.journal.export.assert_called_once_with()
 
-    @patch('builtins.open', new_callable=mock_open, read_data='1')
-    def test_export_latest_commands(self, m_open):
-        glob.glob = MagicMock(return_value=[])
+    def test_resume(self):
+        self.rfi.SUCCESS_CMD_HISTORY = CommandHistory()
+        self.rfi.SUCCESS_SETTINGS = []
+        self.rfi.run_rf = MagicMock()
         self.rfi.rfprint = MagicMock()
-        self.rfi.list_filter_out_values = MagicMock(return_value=[])
-        self.rfi.list_last_index = MagicMock(return_value=-1)
-        self.rfi.export(allCmds=False)
-        self.rfi.list_filter_out_values.assert_not_called()
-        self.assertEqual(2, self.rfi.list_last_index.call_count)
-        self.assertEqual('export()', self.rfi.list_last_index.call_args_list[0].args[1])
-        self.assertEqual('exportall()', self.rfi.list_last_index.call_args_list[1].args[1])
+        history = CommandHistory(['Log  One'])
+        history.mark_exported()
+        history.append('Log  Two')
+        with patch('robotframeworkinteractive.robotframeworkinteractive.read_journal',
+                   return_value=(['Library  Collections'], history)):
+            self.rfi.resume('session.jsonl')
+        self.rfi.run_rf.assert_called_once_with('Library  Collections', log=False)
+        self.assertEqual(['Library  Collections'], self.rfi.SUCCESS_SETTINGS)
+        self.assertEqual(['Log  One', 'Log  Two'], self.rfi.SUCCESS_CMD_HISTORY)
+        self.assertEqual(['Log  Two'], self.rfi.SUCCESS_CMD_HISTORY.since_export())
+
+    def test_resume_missing_journal(self):
+        self.rfi.rfprint = MagicMock()
+        with patch('robotframeworkinteractive.robotframeworkinteractive.read_journal', side_effect=FileNotFoundError):
+            self.rfi.resume('session.jsonl')
+        self.assertTrue(self.rfi.rfprint.call_args.args[0].startswith('Could not resume the session'))
+
+    def test_snapshot_and_restore(self):
+        self.rfi.rfprint = MagicMock()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'test.snapshot')
+            with execution_context():
+                self.rfi.run_rf('Library  Collections')
+                self.rfi.run_rf('@{ITEMS}=  Create List  a  b')
+                self.rfi.run_rf('${LOCK}=  Evaluate  threading.Lock()  modules=threading')
+                run_special_command(self.rfi, f'snapshot({path})')
+            self.assertEqual(call('Not saved ${LOCK}: TypeError: cannot pickle \'_thread.lock\' object'),
+                             self.rfi.rfprint.call_args)
+
+            restored = RobotFrameworkInteractive()
+            restored.rfprint = MagicMock()
+            with execution_context():
+                run_special_command(restored, f'restore({path})')
+                self.assertEqual(['a', 'b', 'c'], BuiltIn().run_keyword('Combine Lists', '${ITEMS}', ['c']))
+                self.assertIsNone(BuiltIn().get_variable_value('${LOCK}'))
+            self.assertEqual(['Library  Collections'], restored.SUCCESS_SETTINGS)
+            restored.rfprint.assert_called_with(f'Restored 1 settings and 1 variables from {path}')
+
+    def test_restore_missing_snapshot(self):
+        self.rfi.rfprint = MagicMock()
+        with execution_context():
+            self.rfi.restore(os.path.join('missing', 'test.snapshot'))
+        self.assertTrue(self.rfi.rfprint.call_args.args[0].startswith('Could not restore the snapshot'))
 
     def test_add_commands(self):
-        self.rfi.COMMANDS = []
+        self.assertGreater(self.rfi.add_commands('BuiltIn'), 100)
+        self.assertEqual(['Log To Console'], self.rfi.completion_options('Log To Cons'))
+        self.assertEqual(['BuiltIn.Log To Console'], self.rfi.completion_options('BuiltIn.Log To Cons'))
+
+    def test_add_commands_twice(self):
         self.rfi.add_commands('BuiltIn')
-        self.assertTrue('Log To Console' in self.rfi.COMMANDS)
+        size = len(self.rfi.registry)
+        self.rfi.add_commands('BuiltIn')
+        self.assertEqual(size, len(self.rfi.registry))
+        self.assertEqual(['Log To Console'], self.rfi.completion_options('Log To Cons'))
+
+    def test_add_commands_keyword_cache(self):
+        self.rfi.keyword_cache = MagicMock()
+        self.rfi.keyword_cache.keywords = MagicMock(return_value=[{'name': 'Click Element', 'args': ['locator']}])
+        self.rfi.add_commands('SeleniumLibrary')
+        self.rfi.keyword_cache.keywords.assert_called_once_with('SeleniumLibrary')
+        self.assertEqual(['Click Element'], self.rfi.completion_options('Click'))
+        self.assertEqual(['SeleniumLibrary.Click Element'], self.rfi.completion_options('Selenium'))
+
+    def test_run_rf_reload_library_reindexes(self):
+        self.rfi.rfprint = MagicMock()
+        self.rfi.keyword_cache = MagicMock()
+        self.rfi.registry.add('OperatingSystem', [{'name': 'Removed Keyword', 'args': []}])
+        with execution_context():
+            BuiltIn().import_library('OperatingSystem')
+            self.rfi.run_rf('Reload Library  OperatingSystem')
+        # The keyword cache is keyed on the library's version and source, which don't change on a reload
+        self.rfi.keyword_cache.keywords.assert_not_called()
+        keywords = self.rfi.registry.keywords('OperatingSystem')
+        self.assertIn('Create File', keywords)
+        self.assertNotIn('Removed Keyword', keywords)
 
     def test_alter_commands_open_browser(self):
         result = self.rfi.alter_commands('Open Browser  https://www.google.com  chrome')
@@ -200,6 +293,68 @@ Export
         result = self.rfi.alter_commands('Log To Console  Test')
         self.assertEqual('Log To Console  Test', result)
 
+    def test_run_rf_block_recorded_once(self):
+        self.rfi.SUCCESS_CMD_HISTORY = CommandHistory()
+        block = 'FOR  ${i}  IN RANGE  3\n    ${total}=  Evaluate  ${total} + ${i}\nEND'
+        with execution_context():
+            BuiltIn().set_local_variable('${total}', 0)
+            self.rfi.run_rf(block)
+            self.assertEqual(3, BuiltIn().get_variable_value('${total}'))
+        self.assertEqual([block], self.rfi.SUCCESS_CMD_HISTORY)
+
+    def test_run_rf_block_failure_not_recorded(self):
+        self.rfi.SUCCESS_CMD_HISTORY = CommandHistory()
+        with execution_context():
+            with self.assertRaisesRegex(Exception, 'boom'):
+                self.rfi.run_rf('IF  True\n    Fail  boom\nEND', throw=True)
+        self.assertEqual([], self.rfi.SUCCESS_CMD_HISTORY)
+
+    def test_run_rf_result_kept_in_last_result(self):
+        self.rfi.rfprint = MagicMock()
+        with execution_context():
+            self.rfi.run_rf('Evaluate  list(range(1000))')
+            self.rfi.run_rf('Log To Console  ${EMPTY}')
+            self.assertEqual(1000, BuiltIn().run_keyword('Get Length', '${_}'))
+        preview = self.rfi.rfprint.call_args_list[0].args[0]
+        self.assertTrue(preview.startswith('0\n1\n'))
+        self.assertTrue(preview.endswith('<list of 1000 items, page 1 of 50, page(2) shows the next one, '
+                                         'the whole value is in ${_}>'))
+
+    def test_page(self):
+        self.rfi.rfprint = MagicMock()
+        self.rfi.show_result(list(range(50)))
+        run_special_command(self.rfi, 'page()')
+        self.assertTrue(self.rfi.rfprint.call_args.args[0].startswith('20\n21\n'))
+        run_special_command(self.rfi, 'page()')
+        self.assertTrue(self.rfi.rfprint.call_args.args[0].endswith('page 3 of 3, the whole value is in ${_}>'))
+        run_special_command(self.rfi, 'page(1)')
+        self.assertTrue(self.rfi.rfprint.call_args.args[0].startswith('0\n1\n'))
+        run_special_command(self.rfi, 'page(4)')
+        self.rfi.rfprint.assert_called_with('The last result has 3 pages')
+
+    def test_page_without_result(self):
+        self.rfi.rfprint = MagicMock()
+        run_special_command(self.rfi, 'page()')
+        self.rfi.rfprint.assert_called_once_with('There is no result to page through')
+        self.rfi.show_result(object())
+        run_special_command(self.rfi, 'page()')
+        self.rfi.rfprint.assert_called_with('Only text, lists and dictionaries can be paged, the last result is object')
+
+    def test_run_rf_session_log(self):
+        self.rfi.rfprint = MagicMock()
+        self.rfi.session_log = MagicMock()
+        with execution_context():
+            self.rfi.run_rf('${x}=  Evaluate  1 + 1')
+            self.rfi.run_rf('Fail  boom')
+            self.rfi.run_rf(self.rfi.alter_commands('Open Browser  about:blank'))
+        (assign, _), (failure, _), (browser, _) = self.rfi.session_log.command.call_args_list
+        self.assertEqual(('${x}=  Evaluate  1 + 1', '${x}=  Evaluate  1 + 1', 'PASS'), assign[:3])
+        self.assertEqual((None, 2, None), assign[4:])
+        self.assertEqual(('Fail  boom', 'FAIL'), (failure[0], failure[2]))
+        self.assertEqual('boom', str(failure[4]))
+        self.assertEqual('Open Browser  about:blank', browser[0])
+        self.assertTrue(browser[1].startswith('Open Browser  about:blank  options='))
+
     def test_run_rf_library(self):
         self.rfi.add_commands = MagicMock()
         with patch('robotframeworkinteractive.robotframeworkinteractive.BuiltIn') as patched_builtin:
@@ -216,6 +371,28 @@ Export
             type(patched_builtin.return_value).run_keyword.assert_not_called()
             self.assertEqual('good', result)
 
+    def test_run_rf_library_indexes_in_background(self):
+        self.rfi.indexer = MagicMock()
+        with patch('robotframeworkinteractive.robotframeworkinteractive.BuiltIn') as patched_builtin:
+            type(patched_builtin.return_value).import_library = MagicMock(return_value='good')
+            self.rfi.run_rf('Library  SeleniumLibrary')
+            self.rfi.indexer.submit.assert_called_once_with('SeleniumLibrary')
+
+    def test_run_rf_resource_indexes_in_background(self):
+        self.rfi.indexer = MagicMock()
+        with patch('robotframeworkinteractive.robotframeworkinteractive.BuiltIn') as patched_builtin:
+            type(patched_builtin.return_value).import_resource = MagicMock(return_value='good')
+            self.rfi.run_rf('Resource  Test.robot')
+            self.rfi.indexer.submit.assert_called_once_with('Test.robot', is_resource=True)
+
+    def test_run_rf_library_import_failure_not_indexed(self):
+        self.rfi.indexer = MagicMock()
+        self.rfi.rfprint = MagicMock()
+        with patch('robotframeworkinteractive.robotframeworkinteractive.BuiltIn') as patched_builtin:
+            type(patched_builtin.return_value).import_library = MagicMock(side_effect=raise_exception)
+            self.rfi.run_rf('Library  Missing')
+            self.rfi.indexer.submit.assert_not_called()
+
     def test_run_rf_resource(self):
         self.rfi.add_commands = MagicMock()
         with patch('robotframeworkinteractive.robotframeworkinteractive.BuiltIn') as patched_builtin:
@@ -270,13 +447,15 @@ Export
             type(patched_builtin.return_value).import_variables = MagicMock(return_value='bad')
             type(patched_builtin.return_value).set_local_variable = MagicMock(return_value='good')
             type(patched_builtin.return_value).run_keyword = MagicMock(return_value='bad')
+            self.rfi.rfprint = MagicMock()
             result = self.rfi.run_rf('${TEST}=  Get On Session  beeceptor  /ready')
             type(patched_builtin.return_value).import_library.assert_not_called()
             type(patched_builtin.return_value).import_resource.assert_not_called()
             type(patched_builtin.return_value).import_variables.assert_not_called()
             type(patched_builtin.return_value).set_local_variable.assert_called_once_with('${TEST}', 'bad')
-            type(patched_builtin.return_value).run_keyword.assert_any_call('Get On Session', 'beeceptor', '/ready')
-            type(patched_builtin.return_value).run_keyword.assert_called_with('Log To Console', 'bad')
+            type(patched_builtin.return_value).run_keyword.assert_called_once_with('Get On Session', 'beeceptor',
+                                                                                     '/ready')
+            self.rfi.rfprint.assert_called_once_with('bad')
             self.assertEqual('good', result)
 
     def test_run_rf_comment(self):
@@ -365,17 +544,256 @@ Export
                 self.rfi.run_rf('Log To Console  Test', throw=True)
             self.rfi.rfprint.assert_not_called()
 
-    def test_completer_variables_one_match(self):
+    def test_run_rf_aborted(self):
+        self.rfi.rfprint = MagicMock()
+        self.rfi.SUCCESS_CMD_HISTORY = []
+        aborted = CommandAborted('interrupted by Ctrl-C', 1.0, [])
         with patch('robotframeworkinteractive.robotframeworkinteractive.BuiltIn') as patched_builtin:
-            type(patched_builtin.return_value).get_variables = MagicMock(return_value=['${TEST_NAME}'])
-            result = self.rfi.completer('Log To Console  ${TEST_', 0)
+            type(patched_builtin.return_value).run_keyword = MagicMock(side_effect=aborted)
+            result = self.rfi.run_rf('Sleep  1 minute')
+            self.assertEqual(None, result)
+            self.rfi.rfprint.assert_called_once_with(aborted.report())
+            self.assertEqual([], self.rfi.SUCCESS_CMD_HISTORY)
+
+    def test_run_rf_aborted_throw(self):
+        self.rfi.rfprint = MagicMock()
+        with patch('robotframeworkinteractive.robotframeworkinteractive.BuiltIn') as patched_builtin:
+            type(patched_builtin.return_value).run_keyword = MagicMock(
+                side_effect=CommandAborted('interrupted by Ctrl-C', 1.0, []))
+            with self.assertRaises(RuntimeError):
+                self.rfi.run_rf('Sleep  1 minute', throw=True)
+
+    def test_run_rf_timeout(self):
+        self.rfi.rfprint = MagicMock()
+        self.rfi.timeout = 5
+        with patch('robotframeworkinteractive.robotframeworkinteractive.CommandGuard') as patched_guard, \
+                patch('robotframeworkinteractive.robotframeworkinteractive.BuiltIn'):
+            self.rfi.run_rf('${TEST}=  Get On Session  beeceptor  /ready')
+            patched_guard.assert_called_once_with(5)
+            patched_guard.reset_mock()
+            self.rfi.run_rf('Log To Console  Test', timeout=1)
+            patched_guard.assert_called_once_with(1)
+
+    def test_run_rf_timed(self):
+        with patch('robotframeworkinteractive.robotframeworkinteractive.BuiltIn'):
+            self.rfi.run_rf('Library  Collections')
+            self.rfi.run_rf('${TEST}=  Get On Session  beeceptor  /ready')
+            self.rfi.run_rf('# Comment')
+        self.assertEqual([('Library', 'Collections', 'PASS'), ('Get On Session', None, 'PASS')],
+                         [(timing.keyword, timing.library, timing.status) for timing in self.rfi.timings])
+
+    def test_run_rf_timed_failure(self):
+        self.rfi.rfprint = MagicMock()
+        with patch('robotframeworkinteractive.robotframeworkinteractive.BuiltIn') as patched_builtin:
+            type(patched_builtin.return_value).run_keyword = MagicMock(side_effect=raise_exception)
+            self.rfi.run_rf('Fail  Test')
+        self.assertEqual(['FAIL'], [timing.status for timing in self.rfi.timings])
+
+    def test_command_keyword_resolves_library(self):
+        with execution_context():
+            BuiltIn().import_library('Collections')
+            self.assertEqual(('Collections.Append To List', 'Collections'),
+                             self.rfi.command_keyword('Append To List  ${list}  a'))
+            self.assertEqual(('BuiltIn.Get Length', 'BuiltIn'), self.rfi.command_keyword('${length}=  Get Length  a'))
+
+    def test_show_timings_json(self):
+        self.rfi.rfprint = MagicMock()
+        self.rfi.timings.record('Log  One', 'BuiltIn.Log', 'BuiltIn', 0.5, 'PASS')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'timings.json')
+            self.rfi.show_timings(path)
+            with open(path, encoding='utf-8') as file:
+                data = json.load(file)
+        self.assertEqual('Log  One', data['commands'][0]['command'])
+        self.assertEqual('BuiltIn', data['libraries'][0]['library'])
+
+    def test_profile(self):
+        self.rfi.rfprint = MagicMock()
+        with execution_context(), tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'out.pstats')
+            self.rfi.profile('Catenate  a  b', 5, path=path)
+            self.assertTrue(os.path.exists(path))
+        report = self.rfi.rfprint.call_args_list[1].args[0]
+        self.assertIn('BuiltIn.py', report)
+        self.assertIn('(catenate)', report)
+        self.rfi.rfprint.assert_called_with(f'Profile written to {path}')
+
+    def test_profile_failure_still_reported(self):
+        self.rfi.rfprint = MagicMock()
+        with execution_context(), self.assertRaises(Exception):
+            self.rfi.profile('Fail  Test', 5, throw=True)
+        self.assertIn('function calls', self.rfi.rfprint.call_args.args[0])
+
+    def test_run_special_command_profile(self):
+        rfi = MagicMock()
+        rfi.alter_commands = MagicMock(side_effect=lambda cmd: cmd)
+        self.assertTrue(run_special_command(rfi, 'profile(5, all)    Sleep    1s'))
+        rfi.profile.assert_called_once_with('Sleep    1s', 5, True, None, throw=False)
+        self.assertTrue(run_special_command(rfi, 'profile()'))
+        rfi.rfprint.assert_called_once()
+
+    def test_bench(self):
+        self.rfi.rfprint = MagicMock()
+        with patch('robotframeworkinteractive.robotframeworkinteractive.BuiltIn') as patched_builtin:
+            result = self.rfi.bench('Get Length  abc', 10, 2)
+            self.assertEqual(12, patched_builtin.return_value.run_keyword.call_count)
+            patched_builtin.return_value.run_keyword.assert_called_with('Get Length', 'abc')
+        self.assertEqual(10, len(result.elapsed))
+        self.rfi.rfprint.assert_called_once_with(f'Get Length  abc\n{result}')
+
+    def test_bench_not_keyword(self):
+        self.rfi.rfprint = MagicMock()
+        with patch('robotframeworkinteractive.robotframeworkinteractive.BuiltIn') as patched_builtin:
+            self.assertIsNone(self.rfi.bench('${x}=  Get Length  abc', 10, 2))
+            patched_builtin.return_value.run_keyword.assert_not_called()
+        self.rfi.rfprint.assert_called_once_with('Only keywords can be benchmarked')
+
+    def test_bench_failure(self):
+        self.rfi.rfprint = MagicMock()
+        with patch('robotframeworkinteractive.robotframeworkinteractive.BuiltIn') as patched_builtin:
+            patched_builtin.return_value.run_keyword = MagicMock(side_effect=raise_exception)
+            self.assertIsNone(self.rfi.bench('Fail  Test', 10, 2))
+            self.rfi.rfprint.assert_called_once_with(EXCEPTION)
+            with self.assertRaises(Exception):
+                self.rfi.bench('Fail  Test', 10, 2, throw=True)
+
+    def test_run_special_command_bench(self):
+        rfi = MagicMock()
+        rfi.alter_commands = MagicMock(side_effect=lambda cmd: cmd)
+        self.assertTrue(run_special_command(rfi, 'bench(50, 1)    Get Length    abc'))
+        rfi.bench.assert_called_once_with('Get Length    abc', 50, 1, throw=False)
+        self.assertTrue(run_special_command(rfi, 'bench(x)    Get Length    abc'))
+        rfi.bench.assert_called_once()
+        with self.assertRaises(ValueError):
+            run_special_command(rfi, 'bench(x)    Get Length    abc', throw=True)
+
+    def test_run_special_command_timings(self):
+        rfi = MagicMock()
+        self.assertTrue(run_special_command(rfi, 'timings()'))
+        self.assertTrue(run_special_command(rfi, 'timings(timings.json)'))
+        self.assertEqual([call(''), call('timings.json')], rfi.show_timings.call_args_list)
+
+    def test_run_special_command_timeout_command(self):
+        rfi = MagicMock()
+        rfi.alter_commands = MagicMock(side_effect=lambda cmd: cmd)
+        self.assertTrue(run_special_command(rfi, 'timeout(10s)  Sleep  1 minute'))
+        rfi.run_rf.assert_called_once_with('Sleep  1 minute', throw=False, timeout=10)
+
+    def test_run_special_command_timeout_default(self):
+        rfi = MagicMock()
+        rfi.timeout = None
+        self.assertTrue(run_special_command(rfi, 'timeout(1 minute)'))
+        self.assertEqual(60, rfi.timeout)
+        self.assertTrue(run_special_command(rfi, 'timeout()'))
+        rfi.rfprint.assert_called_once_with('Timeout: 60s')
+        self.assertTrue(run_special_command(rfi, 'timeout(NONE)'))
+        self.assertEqual(None, rfi.timeout)
+
+    def test_run_special_command_timeout_invalid(self):
+        rfi = MagicMock()
+        self.assertTrue(run_special_command(rfi, 'timeout(soon)  Sleep  1s'))
+        rfi.run_rf.assert_not_called()
+        rfi.rfprint.assert_called_once()
+
+    def test_submit_job_assignment(self):
+        self.rfi.rfprint = MagicMock()
+        self.rfi.jobs = MagicMock()
+        with execution_context():
+            BuiltIn().import_library('OperatingSystem')
+            BuiltIn().set_local_variable('${ITEM}', 'b')
+            self.rfi.submit_job('${TEST}=  Join Path  a  ${ITEM}')
+        command, function, assign = self.rfi.jobs.submit.call_args.args
+        self.assertEqual('${TEST}=  Join Path  a  ${ITEM}', command)
+        self.assertEqual('${TEST}', assign)
+        self.assertEqual(os.path.join('a', 'b'), function())
+
+    def test_submit_job_refuses_builtin(self):
+        self.rfi.rfprint = MagicMock()
+        self.rfi.jobs = MagicMock()
+        with execution_context():
+            self.assertIsNone(self.rfi.submit_job('Sleep  10s'))
+            self.assertIsNone(self.rfi.submit_job('Unknown Keyword'))
+        self.rfi.jobs.submit.assert_not_called()
+        self.assertEqual(2, self.rfi.rfprint.call_count)
+
+    def test_submit_job_import(self):
+        self.rfi.rfprint = MagicMock()
+        self.rfi.jobs = MagicMock()
+        self.assertIsNone(self.rfi.submit_job('Library  SeleniumLibrary'))
+        self.rfi.jobs.submit.assert_not_called()
+
+    def test_apply_finished_jobs(self):
+        self.rfi.rfprint = MagicMock()
+        self.rfi.SUCCESS_CMD_HISTORY = []
+        job = self.rfi.jobs.submit('${TEST}=  Evaluate  1+1', lambda: 2, '${TEST}')
+        job.wait(5)
+        with patch('robotframeworkinteractive.robotframeworkinteractive.BuiltIn') as patched_builtin:
+            self.rfi.apply_finished_jobs()
+            self.rfi.apply_finished_jobs()
+            patched_builtin.return_value.set_local_variable.assert_called_once_with('${TEST}', 2)
+        self.assertEqual(['${TEST}=  Evaluate  1+1'], self.rfi.SUCCESS_CMD_HISTORY)
+        self.rfi.rfprint.assert_called_once_with(job)
+
+    def test_apply_finished_jobs_failed_not_in_history(self):
+        self.rfi.rfprint = MagicMock()
+        self.rfi.SUCCESS_CMD_HISTORY = []
+        job = self.rfi.jobs.submit('Fail  Test', raise_exception)
+        job.wait(5)
+        self.rfi.apply_finished_jobs()
+        self.assertEqual([], self.rfi.SUCCESS_CMD_HISTORY)
+
+    def test_wait_job_aborted_keeps_session(self):
+        self.rfi.rfprint = MagicMock()
+        self.rfi.timeout = 0.1
+        release = threading.Event()
+        job = self.rfi.jobs.submit('Slow', release.wait)
+        self.rfi.wait_job(job.id)
+        self.assertIn('Command aborted: timeout of 0.1s exceeded', self.rfi.rfprint.call_args.args[0])
+        self.assertFalse(job.is_finished())
+        release.set()
+        self.rfi.timeout = None
+        self.rfi.wait_job(job.id)
+        self.rfi.rfprint.assert_called_with(job)
+        with execution_context():
+            self.assertEqual(2, self.rfi.run_rf('Evaluate  1+1', log=False))
+
+    def test_job_result_unknown(self):
+        self.rfi.rfprint = MagicMock()
+        self.rfi.job_result(5)
+        self.assertEqual('No job with id 5', str(self.rfi.rfprint.call_args.args[0]))
+
+    def test_run_special_command_background_job(self):
+        rfi = MagicMock()
+        rfi.alter_commands = MagicMock(side_effect=lambda cmd: cmd)
+        self.assertTrue(run_special_command(rfi, 'Sleep  10s  &'))
+        rfi.submit_job.assert_called_once_with('Sleep  10s')
+
+    def test_run_special_command_job_control(self):
+        rfi = MagicMock()
+        self.assertTrue(run_special_command(rfi, 'jobs()'))
+        self.assertTrue(run_special_command(rfi, 'wait()'))
+        self.assertTrue(run_special_command(rfi, 'wait(2)'))
+        self.assertTrue(run_special_command(rfi, 'result(3)'))
+        self.assertTrue(run_special_command(rfi, 'cancel(4)'))
+        rfi.list_jobs.assert_called_once_with()
+        self.assertEqual([call(None), call(2)], rfi.wait_job.call_args_list)
+        rfi.job_result.assert_called_once_with(3)
+        rfi.cancel_job.assert_called_once_with(4)
+
+    def test_run_special_command_not_special(self):
+        rfi = MagicMock()
+        self.assertFalse(run_special_command(rfi, 'Log To Console  A & B'))
+
+    def test_completer_variables_one_match(self):
+        with execution_context():
+            result = self.rfi.completer('Log To Console  ${TEST_N', 0)
             self.assertEqual('Log To Console    ${TEST_NAME}', result)
 
     def test_completer_variables_many_matches(self):
-        with patch('robotframeworkinteractive.robotframeworkinteractive.BuiltIn') as patched_builtin:
-            type(patched_builtin.return_value).get_variables = MagicMock(return_value=['${TEST_NAME}', '${TEST_VALUE}'])
-            result1 = self.rfi.completer('Log To Console  ${TEST_', 0)
-            result2 = self.rfi.completer('Log To Console  ${TEST_', 1)
+        with execution_context():
+            BuiltIn().set_local_variable('${TEST_VALUE}', 1)
+            result1 = self.rfi.completer('Log To Console  ${TEST_N', 0)
+            result2 = self.rfi.completer('Log To Console  ${TEST_', 2)
             self.assertEqual('Log To Console    ${TEST_NAME}', result1)
             self.assertEqual('Log To Console    ${TEST_VALUE}', result2)
 
@@ -385,54 +803,104 @@ Export
             result = self.rfi.completer('Log To Console  ${COW', 0)
             self.assertEqual(None, result)
 
+    def test_completer_variables_decorated(self):
+        with execution_context():
+            self.assertEqual(['@{TEST_TAGS}'], self.rfi.completion_options('Log  @{TEST'))
+            self.assertEqual(['&{OPTIONS}'], self.rfi.completion_options('Log  &{OPT'))
+
+    def test_completer_variables_follow_run_rf(self):
+        with execution_context():
+            self.assertEqual([], self.rfi.completion_options('Log  ${fruit'))
+            self.rfi.run_rf('${fruit}=  Set Variable  apple', log=False)
+            self.assertEqual(['${fruit}'], self.rfi.completion_options('Log  ${fruit'))
+            self.rfi.run_rf('@{fruit}=  Create List  apple', log=False)
+            self.assertEqual(['@{fruit}'], self.rfi.completion_options('Log  @{fruit'))
+
+    def test_completer_variables_set_by_keywords(self):
+        with execution_context():
+            self.rfi.completion_options('Log  ${')
+            BuiltIn().set_global_variable('${GLOBAL_FRUIT}', 'apple')
+            self.assertEqual(['${GLOBAL_FRUIT}'], self.rfi.completion_options('Log  ${global_f'))
+
+    def test_completer_variables_no_values_copied(self):
+        with execution_context(), \
+                patch('robotframeworkinteractive.robotframeworkinteractive.BuiltIn.get_variables') as patched_get:
+            self.rfi.completer('Log To Console  ${TEST_', 0)
+            self.rfi.completer('Log To Console  ${TEST_', 1)
+            patched_get.assert_not_called()
+
     def test_completer_commands_one_match(self):
-        self.rfi.COMMANDS = ['Log To Console', 'Log']
+        self.rfi.registry.add('MyLibrary', [{'name': 'Log To Console', 'args': []}, {'name': 'Log', 'args': []}])
         result = self.rfi.completer('Log To C', 0)
         self.assertEqual('Log To Console', result)
 
     def test_completer_commands_many_matches(self):
-        self.rfi.COMMANDS = ['Log To Console', 'Log']
-        result1 = self.rfi.completer('L', 0)
-        result2 = self.rfi.completer('L', 1)
+        self.rfi.registry.add('MyLibrary', [{'name': 'Log To Console', 'args': []}, {'name': 'Log', 'args': []}])
+        result1 = self.rfi.completer('Lo', 0)
+        result2 = self.rfi.completer('Lo', 1)
         self.assertEqual('Log To Console', result1)
         self.assertEqual('Log', result2)
 
     def test_completer_commands_no_match(self):
-        self.rfi.COMMANDS = ['Log To Console', 'Log']
-        result = self.rfi.completer('C', 0)
+        self.rfi.registry.add('MyLibrary', [{'name': 'Log To Console', 'args': []}, {'name': 'Log', 'args': []}])
+        result = self.rfi.completer('Cow', 0)
         self.assertEqual(None, result)
 
+    def test_completer_commands_case_insensitive(self):
+        self.rfi.registry.add('MyLibrary', [{'name': 'Log To Console', 'args': []}, {'name': 'Log', 'args': []}])
+        result = self.rfi.completer('log to c', 0)
+        self.assertEqual('Log To Console', result)
+
+    def test_completer_commands_added_after_first_completion(self):
+        self.rfi.registry.add('MyLibrary', [{'name': 'Log', 'args': []}])
+        self.rfi.completer('L', 0)
+        self.rfi.registry.add('OtherLibrary', [{'name': 'Log To Console', 'args': []}])
+        result = self.rfi.completer('Log T', 0)
+        self.assertEqual('Log To Console', result)
+
+    def test_completer_options_reused_across_states(self):
+        self.rfi.completion_options = MagicMock(return_value=['Log To Console', 'Log'])
+        self.rfi.completer('L', 0)
+        self.rfi.completer('L', 1)
+        self.rfi.completer('L', 2)
+        self.rfi.completion_options.assert_called_once_with('L')
+
     def test_completer_command_after_variable(self):
-        self.rfi.COMMANDS = ['Set Variable']
+        self.rfi.registry.add('MyLibrary', [{'name': 'Set Variable', 'args': []}])
         result = self.rfi.completer('${TEST}=  Set V', 0)
         self.assertEqual('${TEST}=    Set Variable', result)
 
     def test_completer_no_command_after_command_after_variable(self):
-        with patch('robotframeworkinteractive.robotframeworkinteractive.BuiltIn') as patched_builtin:
-            type(patched_builtin.return_value).get_variables = MagicMock(return_value=['${TEST_NAME}'])
-            self.rfi.COMMANDS = ['Set Variable']
-            result = self.rfi.completer('${TEST}=  Set Variable  ', 0)
+        with execution_context():
+            self.rfi.registry.add('MyLibrary', [{'name': 'Set Variable', 'args': []}])
+            result = self.rfi.completer('${TEST}=  Set Variable  ${TEST_N', 0)
             self.assertEqual('${TEST}=    Set Variable    ${TEST_NAME}', result)
 
     def test_rfprint_empty(self):
+        self.rfi.console = ConsoleWriter(io.StringIO())
         self.rfi.run_rf = MagicMock()
         self.rfi.rfprint('')
         self.rfi.run_rf.assert_not_called()
+        self.assertEqual('', self.rfi.console.stream.getvalue())
 
     def test_rfprint_single_line_space(self):
+        self.rfi.console = ConsoleWriter(io.StringIO())
         self.rfi.run_rf = MagicMock()
         self.rfi.rfprint('This is a test')
-        self.rfi.run_rf.assert_called_once_with('Log To Console    This${SPACE}is${SPACE}a${SPACE}test', log=False)
+        self.rfi.run_rf.assert_not_called()
+        self.assertEqual('This is a test\n', self.rfi.console.stream.getvalue())
 
-    def test_rfprint_multi_line_escapes(self):
+    def test_rfprint_multi_line_special_characters(self):
+        self.rfi.console = ConsoleWriter(io.StringIO())
         self.rfi.run_rf = MagicMock()
         self.rfi.rfprint('${STRING}\n@{LIST}\n&{DICT}\n%{ENV}\n[]')
-        self.assertEqual(5, self.rfi.run_rf.call_count)
-        self.assertEqual('Log To Console    \\${STRING}', self.rfi.run_rf.call_args_list[0].args[0])
-        self.assertEqual('Log To Console    \\@{LIST}', self.rfi.run_rf.call_args_list[1].args[0])
-        self.assertEqual('Log To Console    \\&{DICT}', self.rfi.run_rf.call_args_list[2].args[0])
-        self.assertEqual('Log To Console    \\%{ENV}', self.rfi.run_rf.call_args_list[3].args[0])
-        self.assertEqual('Log To Console    \\[\\]', self.rfi.run_rf.call_args_list[4].args[0])
+        self.rfi.run_rf.assert_not_called()
+        self.assertEqual('${STRING}\n@{LIST}\n&{DICT}\n%{ENV}\n[]\n', self.rfi.console.stream.getvalue())
+
+    def test_rfprint_object(self):
+        self.rfi.console = ConsoleWriter(io.StringIO())
+        self.rfi.rfprint(['a', 'b'])
+        self.assertEqual("['a', 'b']\n", self.rfi.console.stream.getvalue())
 
 
 class RunInteractiveTests(unittest.TestCase):
@@ -458,6 +926,37 @@ class RunInteractiveTests(unittest.TestCase):
                 self.assertEqual(2, patched_get_input.call_count)
                 type(patched_rfi.return_value).run_rf.assert_called_once_with('Log To Console  Test')
 
+    def test_run_interactive_block(self):
+        inputs = iter(['FOR  ${i}  IN  a', 'exit()', '', 'END', 'exit()'])
+        with patch('robotframeworkinteractive.robotframeworkinteractive.get_input') as patched_get_input:
+            patched_get_input.side_effect = lambda *args: next(inputs)
+            with patch('robotframeworkinteractive.robotframeworkinteractive.RobotFrameworkInteractive') as patched_rfi:
+                patched_rfi.return_value.alter_commands = MagicMock(side_effect=lambda cmd: cmd)
+                run_interactive()
+                patched_rfi.return_value.run_rf.assert_called_once_with('FOR  ${i}  IN  a\n    exit()\nEND')
+                self.assertEqual([None, '... ', '... ', '... ', None],
+                                 [args[1] for args, _ in patched_get_input.call_args_list])
+
+    def test_run_interactive_batch(self):
+        inputs = iter(['batch()', 'Log  One', 'Log  Two\nLog  Three', 'end()', 'exit()'])
+        with patch('robotframeworkinteractive.robotframeworkinteractive.get_input') as patched_get_input:
+            patched_get_input.side_effect = lambda *args: next(inputs)
+            with patch('robotframeworkinteractive.robotframeworkinteractive.RobotFrameworkInteractive') as patched_rfi:
+                patched_rfi.return_value.alter_commands = MagicMock(side_effect=lambda cmd: cmd)
+                run_interactive()
+                self.assertEqual([call('Log  One', throw=True), call('Log  Two', throw=True),
+                                  call('Log  Three', throw=True)], patched_rfi.return_value.run_rf.call_args_list)
+
+    def test_run_interactive_paste(self):
+        inputs = iter(['Log  One\nLog  Two', 'exit()'])
+        with patch('robotframeworkinteractive.robotframeworkinteractive.get_input') as patched_get_input:
+            patched_get_input.side_effect = lambda *args: next(inputs)
+            with patch('robotframeworkinteractive.robotframeworkinteractive.RobotFrameworkInteractive') as patched_rfi:
+                patched_rfi.return_value.alter_commands = MagicMock(side_effect=lambda cmd: cmd)
+                run_interactive()
+                self.assertEqual([call('Log  One', throw=True), call('Log  Two', throw=True)],
+                                 patched_rfi.return_value.run_rf.call_args_list)
+
     def test_run_interactive_export_exit(self):
         def internal_get_input(*args, **kwargs):
             inputs = ['export()', 'exit()']
@@ -473,7 +972,7 @@ class RunInteractiveTests(unittest.TestCase):
                 run_interactive()
                 self.assertEqual(2, patched_get_input.call_count)
                 type(patched_rfi.return_value).export.assert_called_once()
-                self.assertEqual(['export()'], type(patched_rfi.return_value).SUCCESS_CMD_HISTORY)
+                self.assertEqual([], type(patched_rfi.return_value).SUCCESS_CMD_HISTORY)
 
     def test_run_interactive_exportall_exit(self):
         def internal_get_input(*args, **kwargs):
@@ -490,7 +989,35 @@ class RunInteractiveTests(unittest.TestCase):
                 run_interactive()
                 self.assertEqual(2, patched_get_input.call_count)
                 type(patched_rfi.return_value).export.assert_called_once_with(allCmds=True)
-                self.assertEqual(['exportall()'], type(patched_rfi.return_value).SUCCESS_CMD_HISTORY)
+                self.assertEqual([], type(patched_rfi.return_value).SUCCESS_CMD_HISTORY)
+
+    def test_run_interactive_indexing_exit(self):
+        def internal_get_input(*args, **kwargs):
+            inputs = ['indexing()', 'exit()']
+            result = inputs[self.counter]
+            self.counter += 1
+            return result
+
+        with patch('robotframeworkinteractive.robotframeworkinteractive.get_input') as patched_get_input:
+            patched_get_input.side_effect = internal_get_input
+            with patch('robotframeworkinteractive.robotframeworkinteractive.RobotFrameworkInteractive') as patched_rfi:
+                run_interactive()
+                patched_rfi.return_value.indexing_status.assert_called_once()
+                patched_rfi.return_value.run_rf.assert_not_called()
+                patched_rfi.return_value.indexer.shutdown.assert_called_once()
+
+    def test_run_interactive_serve(self):
+        with patch('robotframeworkinteractive.robotframeworkinteractive.OPTIONS', parse_args(['--serve', 'rfi.sock'])), \
+                patch('robotframeworkinteractive.robotframeworkinteractive.get_input') as patched_get_input, \
+                patch('robotframeworkinteractive.robotframeworkinteractive.ReplServer') as patched_server, \
+                patch('robotframeworkinteractive.robotframeworkinteractive.RobotFrameworkInteractive') as patched_rfi:
+            run_interactive()
+            sessions, path = patched_server.call_args.args[:2]
+            self.assertEqual('rfi.sock', path)
+            self.assertIs(patched_rfi.return_value, sessions.current)
+            patched_server.return_value.serve_forever.assert_called_once()
+            patched_rfi.return_value.indexer.shutdown.assert_called_once()
+            patched_get_input.assert_not_called()
 
     def test_run_interactive_exception_exit(self):
         def internal_get_input(*args, **kwargs):
@@ -511,12 +1038,182 @@ class RunInteractiveTests(unittest.TestCase):
                 self.assertEqual([], type(patched_rfi.return_value).SUCCESS_CMD_HISTORY)
 
 
+class RunBatchTests(unittest.TestCase):
+    def setUp(self):
+        self.rfi = MagicMock()
+        self.rfi.sessions = None
+        self.rfi.alter_commands = MagicMock(side_effect=lambda cmd: cmd)
+
+    def test_run_batch_all_pass(self):
+        results = run_batch(self.rfi, ['Log To Console  One\n', '\n', 'Log To Console  Two\n'])
+        self.assertEqual([call('Log To Console  One', throw=True), call('Log To Console  Two', throw=True)],
+                         self.rfi.run_rf.call_args_list)
+        self.assertEqual([1, 3], [result['line'] for result in results])
+        self.assertEqual(['PASS', 'PASS'], [result['status'] for result in results])
+
+    def test_run_batch_failure_continues(self):
+        self.rfi.run_rf = MagicMock(side_effect=[EXCEPTION, None])
+        results = run_batch(self.rfi, ['Fail  Test', 'Log To Console  Two'])
+        self.assertEqual(2, self.rfi.run_rf.call_count)
+        self.assertEqual({'line': 1, 'command': 'Fail  Test', 'status': 'FAIL', 'message': 'Test'},
+                         {key: results[0][key] for key in ('line', 'command', 'status', 'message')})
+        self.assertEqual('PASS', results[1]['status'])
+
+    def test_run_batch_stop_on_failure(self):
+        self.rfi.run_rf = MagicMock(side_effect=[EXCEPTION, None])
+        results = run_batch(self.rfi, ['Fail  Test', 'Log To Console  Two'], stop_on_failure=True)
+        self.assertEqual(1, self.rfi.run_rf.call_count)
+        self.assertEqual(1, len(results))
+
+    def test_run_batch_exit(self):
+        results = run_batch(self.rfi, ['Log To Console  One', 'exit()', 'Log To Console  Two'])
+        self.rfi.run_rf.assert_called_once_with('Log To Console  One', throw=True)
+        self.assertEqual(1, len(results))
+
+    def test_run_batch_special_command(self):
+        self.rfi.SUCCESS_CMD_HISTORY = []
+        run_batch(self.rfi, ['export()'])
+        self.rfi.export.assert_called_once_with()
+        self.rfi.run_rf.assert_not_called()
+        self.assertEqual([], self.rfi.SUCCESS_CMD_HISTORY)
+
+    def test_run_batch_results_file(self):
+        results_file = io.StringIO()
+        run_batch(self.rfi, ['Log To Console  One'], results_file=results_file)
+        record = json.loads(results_file.getvalue())
+        self.assertEqual('Log To Console  One', record['command'])
+        self.assertEqual('PASS', record['status'])
+
+    def test_run_batch_block(self):
+        results = run_batch(self.rfi, ['Log  One', 'FOR  ${i}  IN  a  b', '', '  Log  ${i}', 'END', 'Log  Two'])
+        self.assertEqual([call('Log  One', throw=True), call('FOR  ${i}  IN  a  b\n    Log  ${i}\nEND', throw=True),
+                          call('Log  Two', throw=True)], self.rfi.run_rf.call_args_list)
+        self.assertEqual([1, 2, 6], [result['line'] for result in results])
+
+    def test_run_batch_unclosed_block(self):
+        run_batch(self.rfi, ['FOR  ${i}  IN  a  b', 'exit()'])
+        self.rfi.run_rf.assert_called_once_with('FOR  ${i}  IN  a  b\n    exit()', throw=True)
+
+    def test_run_pasted_output_written_once(self):
+        class Output(io.StringIO):
+            writes = 0
+
+            def write(self, text):
+                Output.writes += 1
+                return super().write(text)
+
+        rfi = RobotFrameworkInteractive(console=ConsoleWriter(Output()))
+        with execution_context():
+            results = run_pasted(rfi, ['Log To Console  One', 'Fail  boom', '${x}=  Set Variable  1'])
+        self.assertEqual(['PASS', 'FAIL', 'PASS'], [result['status'] for result in results])
+        self.assertEqual(['Log To Console  One', '${x}=  Set Variable  1'], rfi.SUCCESS_CMD_HISTORY)
+        output = rfi.console.stream.getvalue()
+        self.assertTrue(output.startswith('One\nLine 2: boom\n3 commands, 2 passed, 1 failed in '))
+        self.assertEqual(1, Output.writes)
+
+    def test_run_batch_summary(self):
+        self.rfi.run_rf = MagicMock(side_effect=[EXCEPTION, None])
+        run_batch(self.rfi, ['Fail  Test', 'Log To Console  Two'])
+        self.assertTrue(self.rfi.rfprint.call_args.args[0].startswith('2 commands, 1 passed, 1 failed in '))
+
+    def test_run_batch_file_failure(self):
+        self.rfi.run_rf = MagicMock(side_effect=raise_exception)
+        with patch('builtins.open', new_callable=mock_open, read_data='Fail  Test\n'):
+            with self.assertRaises(BatchFailure):
+                run_batch_file(self.rfi, parse_args(['--batch', 'cmds.txt']))
+        self.rfi.indexer.shutdown.assert_called_once()
+
+
+class KeywordCacheOptionTests(unittest.TestCase):
+    def test_create_keyword_cache_disabled(self):
+        self.assertIsNone(create_keyword_cache(parse_args(['--no-cache'])))
+
+    def test_create_keyword_cache_rebuild(self):
+        keyword_cache = create_keyword_cache(parse_args(['--rebuild-cache', '--cache-dir', 'cache']))
+        self.assertEqual('cache', keyword_cache.directory)
+        self.assertTrue(keyword_cache.rebuild)
+
+    def test_create_keyword_cache_clear(self):
+        with patch('robotframeworkinteractive.robotframeworkinteractive.KeywordCache') as patched_keyword_cache:
+            create_keyword_cache(parse_args(['--clear-cache']))
+            patched_keyword_cache.return_value.clear.assert_called_once()
+
+
+class JournalOptionTests(unittest.TestCase):
+    def test_create_journal_disabled(self):
+        self.assertIsNone(create_journal(parse_args(['--no-journal'])))
+
+    def test_create_journal_path(self):
+        journal = create_journal(parse_args(['--journal', 'session.jsonl']))
+        self.assertEqual('session.jsonl', journal.path)
+        self.assertFalse(journal.append)
+
+    def test_create_journal_resume_appends(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                patch('robotframeworkinteractive.journal.state_directory', return_value=directory):
+            self.assertTrue(create_journal(parse_args(['--resume'])).append)
+
+    def test_journal_path_per_process(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                patch('robotframeworkinteractive.journal.state_directory', return_value=directory):
+            path = journal_path(parse_args([]))
+        self.assertEqual(directory, os.path.dirname(path))
+        self.assertTrue(path.endswith(f'-{os.getpid()}.jsonl'))
+
+    def test_journal_path_resume_latest(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                patch('robotframeworkinteractive.journal.state_directory', return_value=directory):
+            older, newer = os.path.join(directory, 'session-1.jsonl'), os.path.join(directory, 'session-2.jsonl')
+            for mtime, path in enumerate((newer, older)):
+                open(path, 'w').close()
+                os.utime(path, (mtime, mtime))
+            self.assertEqual(older, journal_path(parse_args(['--resume'])))
+            self.assertNotIn(journal_path(parse_args([])), (older, newer))
+        self.assertEqual('session.jsonl', journal_path(parse_args(['--resume', '--journal', 'session.jsonl'])))
+
+    def test_create_session_log(self):
+        self.assertIsNone(create_session_log(parse_args(['--no-session-log'])))
+        log = create_session_log(parse_args(['--session-log', 'commands.jsonl', '--session-log-size', '0.5',
+                                             '--session-log-backups', '2']))
+        self.assertEqual(('commands.jsonl', 512 * 1024, 2), (log.path, log.max_bytes, log.backups))
+
+    def test_run_interactive_resume(self):
+        with patch('robotframeworkinteractive.robotframeworkinteractive.OPTIONS',
+                   parse_args(['--resume', '--journal', 'session.jsonl'])), \
+                patch('robotframeworkinteractive.robotframeworkinteractive.get_input', return_value='exit()'), \
+                patch('robotframeworkinteractive.robotframeworkinteractive.RobotFrameworkInteractive') as patched_rfi:
+            run_interactive()
+            patched_rfi.return_value.resume.assert_called_once_with('session.jsonl')
+            patched_rfi.return_value.journal.close.assert_called_once()
+
+
+class ParseArgsTests(unittest.TestCase):
+    def test_timeout(self):
+        self.assertEqual(90, parse_args(['--timeout', '1 minute 30 seconds']).timeout)
+        self.assertIsNone(parse_args(['--timeout', 'NONE']).timeout)
+        self.assertIsNone(parse_args([]).timeout)
+
+    @patch('sys.stderr', new_callable=io.StringIO)
+    def test_timeout_invalid(self, m_stderr):
+        with self.assertRaises(SystemExit):
+            parse_args(['--timeout', 'banana'])
+        self.assertIn("argument --timeout: Invalid time string 'banana'.", m_stderr.getvalue())
+
+    @patch('sys.stderr', new_callable=io.StringIO)
+    def test_export_name_invalid(self, m_stderr):
+        self.assertEqual('login_{number}.robot', parse_args(['--export-name', 'login_{number}.robot']).export_name)
+        with self.assertRaises(SystemExit):
+            parse_args(['--export-name', 'login.robot'])
+        self.assertIn('argument --export-name: Export file name template login.robot does not contain {number}',
+                      m_stderr.getvalue())
+
+
 class MainTests(unittest.TestCase):
     @patch('builtins.print', new_callable=MagicMock)
     @patch('builtins.open', new_callable=mock_open, read_data='1')
     def test_main_success(self, m_open, m_print):
         with patch('robotframeworkinteractive.robotframeworkinteractive.robot.run') as patched_robot_run:
-            main()
+            main([])
             m_open.assert_called_once_with(os.devnull, 'w')
             m_print.assert_called_once_with(WELCOME_MSG)
             dir_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
@@ -529,10 +1226,47 @@ class MainTests(unittest.TestCase):
     def test_main_exception(self, m_open, m_print):
         with patch('robotframeworkinteractive.robotframeworkinteractive.robot.run') as patched_robot_run:
             patched_robot_run.side_effect = raise_exception
-            main()
+            main([])
             m_open.assert_called_once_with(os.devnull, 'w')
             m_print.assert_called_with(EXCEPTION)
 
+    @patch('builtins.print', new_callable=MagicMock)
+    def test_main_fast(self, m_print):
+        with patch('robotframeworkinteractive.robotframeworkinteractive.robot.run') as patched_robot_run, \
+                patch('robotframeworkinteractive.robotframeworkinteractive.execution_context') as patched_context, \
+                patch('robotframeworkinteractive.robotframeworkinteractive.run_interactive') as patched_run_interactive:
+            main(['--fast'])
+            m_print.assert_called_once_with(WELCOME_MSG)
+            patched_context.assert_called_once_with()
+            patched_run_interactive.assert_called_once_with()
+            patched_robot_run.assert_not_called()
+
+    @patch('builtins.print', new_callable=MagicMock)
+    def test_main_trace(self, m_print):
+        with patch('robotframeworkinteractive.robotframeworkinteractive.robot.run') as patched_robot_run, \
+                patch('robotframeworkinteractive.robotframeworkinteractive.TraceListener') as patched_listener:
+            main(['--trace', 'trace.json'])
+            patched_listener.assert_called_once_with('trace.json')
+            self.assertEqual([patched_listener.return_value], patched_robot_run.call_args.kwargs['listener'])
+            patched_listener.return_value.close.assert_called_once()
+
+    @patch('builtins.print', new_callable=MagicMock)
+    def test_main_trace_fast(self, m_print):
+        with patch('robotframeworkinteractive.robotframeworkinteractive.execution_context') as patched_context, \
+                patch('robotframeworkinteractive.robotframeworkinteractive.run_interactive'), \
+                patch('robotframeworkinteractive.robotframeworkinteractive.TraceListener') as patched_listener:
+            main(['--fast', '--trace', 'trace.jsonl'])
+            patched_context.assert_called_once_with(listener=[patched_listener.return_value])
+            patched_listener.return_value.close.assert_called_once()
+
+    @patch('builtins.print', new_callable=MagicMock)
+    def test_main_batch_no_welcome(self, m_print):
+        with patch('robotframeworkinteractive.robotframeworkinteractive.robot.run') as patched_robot_run:
+            patched_robot_run.return_value = 1
+            result = main(['--batch', 'cmds.txt'])
+            m_print.assert_not_called()
+            self.assertEqual(1, result)
+
 
 if __name__ == '__main__':
     unittest.main()
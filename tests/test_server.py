@@ -0,0 +1,96 @@
+import io
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import unittest
+
+from robotframeworkinteractive.client import ReplClient
+from robotframeworkinteractive.console import ConsoleWriter
+from robotframeworkinteractive.server import ReplServer, remove_stale_socket
+
+
+class FakeRobotFrameworkInteractive:
+    def __init__(self):
+        self.console = ConsoleWriter(io.StringIO())
+        self.commands = []
+
+    def rfprint(self, obj):
+        self.console.write(obj)
+
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), 'Unix domain sockets are not supported')
+class ReplServerTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'rfi.sock')
+        self.rfi = FakeRobotFrameworkInteractive()
+        self.server = ReplServer(self.rfi, self.path, self.run_command)
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        while not self.server.running:
+            time.sleep(0.01)
+
+    def tearDown(self):
+        if self.thread.is_alive():
+            with ReplClient(self.path) as client:
+                client.send('shutdown()')
+        self.thread.join(5)
+        shutil.rmtree(self.directory)
+
+    def run_command(self, cmd):
+        self.rfi.commands.append(cmd)
+        if cmd.startswith('Fail'):
+            raise AssertionError('Failed')
+        self.rfi.rfprint(f'ran {cmd}')
+
+    def test_send_streams_output(self):
+        out = io.StringIO()
+        with ReplClient(self.path) as client:
+            result = client.send('Log To Console  Test', out)
+        self.assertEqual({'status': 'PASS', 'message': ''}, result)
+        self.assertEqual('ran Log To Console  Test\n', out.getvalue())
+
+    def test_send_failure(self):
+        out = io.StringIO()
+        with ReplClient(self.path) as client:
+            result = client.send('Fail  Test', out)
+        self.assertEqual({'status': 'FAIL', 'message': 'Failed'}, result)
+        self.assertEqual('Failed\n', out.getvalue())
+
+    def test_sequential_clients_share_session(self):
+        with ReplClient(self.path) as client:
+            client.send('First', io.StringIO())
+            client.send('exit()', io.StringIO())
+        with ReplClient(self.path) as client:
+            client.send('Second', io.StringIO())
+        self.assertEqual(['First', 'Second'], self.rfi.commands)
+
+    def test_console_restored_after_client(self):
+        console = self.rfi.console
+        with ReplClient(self.path) as client:
+            client.send('First', io.StringIO())
+        with ReplClient(self.path) as client:
+            client.send('shutdown()', io.StringIO())
+        self.thread.join(5)
+        self.assertIs(console, self.rfi.console)
+
+    def test_shutdown_removes_socket(self):
+        with ReplClient(self.path) as client:
+            client.send('shutdown()')
+        self.thread.join(5)
+        self.assertFalse(self.thread.is_alive())
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_socket_only_accessible_to_user(self):
+        self.assertEqual(0, os.stat(self.path).st_mode & 0o077)
+
+    def test_remove_stale_socket_running_server(self):
+        with self.assertRaises(RuntimeError):
+            remove_stale_socket(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import errno
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from robotframeworkinteractive.sessionlog import SessionLog, default_log_path, prune_logs, short_repr
+
+
+def read_records(path):
+    with open(path, encoding='utf-8') as file:
+        return [json.loads(line) for line in file]
+
+
+class SessionLogTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'logs', 'commands.jsonl')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_records_buffered_until_flush(self):
+        log = SessionLog(self.path, flush_interval=60)
+        log.command('Log  One', 'Log  One', 'PASS', 0.5)
+        self.assertFalse(os.path.exists(self.path))
+        log.flush()
+        record, = read_records(self.path)
+        self.assertEqual({'command': 'Log  One', 'altered': 'Log  One', 'status': 'PASS', 'error': None,
+                          'elapsed': 0.5, 'result': None}, {key: record[key] for key in record if key != 'time'})
+        log.close()
+
+    def test_failure_and_result(self):
+        log = SessionLog(self.path, flush_interval=60)
+        log.command('Fail  boom', 'Fail  boom', 'FAIL', 0.1, error=AssertionError('boom'), session='other')
+        log.command('Evaluate  1', 'Evaluate  1', 'PASS', 0.1, result=['x' * 1000])
+        log.close()
+        failed, passed = read_records(self.path)
+        self.assertEqual('boom', failed['error'])
+        self.assertEqual('other', failed['session'])
+        self.assertLessEqual(len(passed['result']), 200)
+        self.assertTrue(passed['result'].startswith("['xxx"))
+
+    def test_flushed_in_background(self):
+        log = SessionLog(self.path, flush_interval=0.05)
+        log.command('Log  One', 'Log  One', 'PASS', 0.1)
+        deadline = time.monotonic() + 5
+        records = []
+        while not records and time.monotonic() < deadline:
+            time.sleep(0.01)
+            # The file is created before the first chunk is written to it
+            records = read_records(self.path) if os.path.exists(self.path) else []
+        self.assertEqual(1, len(records))
+        log.close()
+
+    def test_close(self):
+        log = SessionLog(self.path, flush_interval=60)
+        log.command('Log  One', 'Log  One', 'PASS', 0.1)
+        log.close()
+        log.close()
+        log.command('Log  Two', 'Log  Two', 'PASS', 0.1)
+        log.flush()
+        self.assertEqual(['Log  One'], [record['command'] for record in read_records(self.path)])
+
+    def test_close_survives_full_disk(self):
+        log = SessionLog(self.path, flush_interval=60)
+        log.command('Log  One', 'Log  One', 'PASS', 0.1)
+        log.flush()
+        log._file.close()
+        log._file = MagicMock()
+        log._file.write.side_effect = OSError(errno.ENOSPC, 'No space left on device')
+        log.command('Log  Two', 'Log  Two', 'PASS', 0.1)
+        log.close()
+        self.assertIsNone(log._file)
+
+    def test_default_log_path_per_process(self):
+        self.assertTrue(default_log_path().endswith(f'-{os.getpid()}.jsonl'))
+
+    def test_prune_logs(self):
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory)
+        for mtime in range(3):
+            path = os.path.join(directory, f'commands-{mtime}.jsonl')
+            for name in (path, path + '.1'):
+                open(name, 'w').close()
+            os.utime(path, (mtime, mtime))
+        prune_logs(directory, keep=2)
+        self.assertEqual(['commands-1.jsonl', 'commands-1.jsonl.1', 'commands-2.jsonl', 'commands-2.jsonl.1'],
+                         sorted(os.listdir(directory)))
+
+    def test_nothing_logged_no_file(self):
+        SessionLog(self.path).close()
+        self.assertFalse(os.path.exists(os.path.dirname(self.path)))
+
+    def test_rotation(self):
+        log = SessionLog(self.path, max_bytes=1000, backups=2, flush_interval=60)
+        for number in range(40):
+            log.command(f'Log  {number}', f'Log  {number}', 'PASS', 0.1)
+        log.close()
+        self.assertEqual(['commands.jsonl', 'commands.jsonl.1', 'commands.jsonl.2'],
+                         sorted(os.listdir(os.path.dirname(self.path))))
+        for path in (self.path, self.path + '.1', self.path + '.2'):
+            self.assertLessEqual(os.path.getsize(path), 1000)
+        newest = read_records(self.path)
+        self.assertEqual('Log  39', newest[-1]['command'])
+        self.assertEqual(int(newest[0]['command'].split()[-1]) - 1,
+                         int(read_records(self.path + '.1')[-1]['command'].split()[-1]))
+
+    def test_rotation_without_backups(self):
+        log = SessionLog(self.path, max_bytes=1000, backups=0, flush_interval=60)
+        for number in range(40):
+            log.command(f'Log  {number}', f'Log  {number}', 'PASS', 0.1)
+        log.close()
+        self.assertEqual(['commands.jsonl'], os.listdir(os.path.dirname(self.path)))
+
+    def test_appends_to_existing_log(self):
+        for command in ('Log  One', 'Log  Two'):
+            log = SessionLog(self.path)
+            log.command(command, command, 'PASS', 0.1)
+            log.close()
+        self.assertEqual(['Log  One', 'Log  Two'], [record['command'] for record in read_records(self.path)])
+
+    def test_short_repr(self):
+        self.assertEqual("'abc'", short_repr('abc'))
+        self.assertEqual(20, len(short_repr(list(range(1000)), length=20)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+import io
+import unittest
+from unittest.mock import MagicMock
+
+from robot.libraries.BuiltIn import BuiltIn
+from robot.running.context import EXECUTION_CONTEXTS
+
+from robotframeworkinteractive.bootstrap import execution_context
+from robotframeworkinteractive.console import ConsoleWriter
+from robotframeworkinteractive.robotframeworkinteractive import RobotFrameworkInteractive, run_batch, \
+    run_special_command
+from robotframeworkinteractive.sessions import SessionManager, deep_size, format_size
+
+
+class DeepSizeTests(unittest.TestCase):
+    def test_deep_size_follows_containers(self):
+        self.assertGreater(deep_size(['x' * 1000]), deep_size(['x']) + 900)
+        self.assertGreater(deep_size({'key': 'x' * 1000}), 1000)
+
+    def test_deep_size_counts_shared_objects_once(self):
+        value = 'x' * 1000
+        self.assertLess(deep_size([value, value]), 2 * len(value))
+
+    def test_deep_size_follows_attributes(self):
+        holder = type('Holder', (), {})()
+        holder.value = 'x' * 1000
+        self.assertGreater(deep_size(holder), 1000)
+
+    def test_format_size(self):
+        self.assertEqual('512 B', format_size(512))
+        self.assertEqual('1.5 KB', format_size(1536))
+        self.assertEqual('2.0 MB', format_size(2 * 1024 ** 2))
+
+
+class SessionManagerTests(unittest.TestCase):
+    def setUp(self):
+        self.output = io.StringIO()
+        self.rfi = self.new_session()
+
+    def new_session(self):
+        return RobotFrameworkInteractive(console=ConsoleWriter(self.output))
+
+    def test_instances_do_not_share_history(self):
+        other = self.new_session()
+        self.rfi.record('Log  One')
+        self.rfi.record('Library  Collections', is_setting=True)
+        self.assertEqual([], other.SUCCESS_CMD_HISTORY)
+        self.assertEqual([], other.SUCCESS_SETTINGS)
+        self.assertIsNot(self.rfi.COMMANDS, other.COMMANDS)
+
+    def test_create_and_switch(self):
+        sessions = SessionManager(self.rfi, self.new_session)
+        other = sessions.create('other')
+        self.assertIs(other, sessions.current)
+        self.assertEqual('RF [other]> ', other.prompt)
+        self.assertEqual('RF> ', self.rfi.prompt)
+        self.assertIs(self.rfi, sessions.switch('main'))
+        self.assertIs(self.rfi, sessions.current)
+        self.assertEqual(2, len(sessions))
+
+    def test_errors(self):
+        sessions = SessionManager(self.rfi, self.new_session)
+        sessions.create('other')
+        with self.assertRaisesRegex(ValueError, 'Session other already exists'):
+            sessions.create('other')
+        with self.assertRaisesRegex(ValueError, 'needs a name'):
+            sessions.create('')
+        with self.assertRaisesRegex(ValueError, 'No session named missing'):
+            sessions.switch('missing')
+        with self.assertRaisesRegex(ValueError, 'Switch to another session before closing other'):
+            sessions.close('other')
+
+    def test_close(self):
+        sessions = SessionManager(self.rfi, self.new_session)
+        other = sessions.create('other')
+        other.indexer = MagicMock()
+        sessions.switch('main')
+        sessions.close('other')
+        other.indexer.shutdown.assert_called_once()
+        self.assertNotIn('other', sessions)
+
+    def test_close_all(self):
+        sessions = SessionManager(self.rfi, self.new_session)
+        self.rfi.indexer = MagicMock()
+        other = sessions.create('other')
+        other.indexer = MagicMock()
+        sessions.close_all()
+        self.rfi.indexer.shutdown.assert_called_once()
+        other.indexer.shutdown.assert_not_called()
+        self.assertIs(self.rfi, sessions.current)
+        self.assertEqual(1, len(sessions))
+
+    def test_console_set_for_every_session(self):
+        sessions = SessionManager(self.rfi, self.new_session)
+        other = sessions.create('other')
+        console = ConsoleWriter(io.StringIO())
+        sessions.console = console
+        self.assertIs(console, self.rfi.console)
+        self.assertIs(console, other.console)
+
+    def test_variables_and_imports_are_isolated(self):
+        with execution_context():
+            sessions = SessionManager(self.rfi, self.new_session)
+            self.rfi.run_rf('${VALUE}=  Set Variable  main')
+            self.rfi.run_rf('Library  Collections')
+            main_namespace = EXECUTION_CONTEXTS.current.namespace
+
+            sessions.create('other')
+            self.assertIsNone(BuiltIn().get_variable_value('${VALUE}'))
+            self.assertEqual('Robot Framework Interactive', BuiltIn().get_variable_value('${TEST_NAME}'))
+            with self.assertRaisesRegex(Exception, "No keyword with name 'Append To List' found"):
+                BuiltIn().run_keyword('Append To List', [], 1)
+            BuiltIn().set_local_variable('${VALUE}', 'other')
+
+            sessions.switch('main')
+            self.assertIs(main_namespace, EXECUTION_CONTEXTS.current.namespace)
+            self.assertEqual('main', BuiltIn().get_variable_value('${VALUE}'))
+            sessions.switch('other')
+            self.assertEqual('other', BuiltIn().get_variable_value('${VALUE}'))
+            sessions.close_all()
+            self.assertIs(main_namespace, EXECUTION_CONTEXTS.current.namespace)
+
+    def test_report(self):
+        sessions = SessionManager(self.rfi, self.new_session)
+        self.rfi.record('Log  One')
+        sessions.create('other')
+        lines = sessions.report().splitlines()
+        self.assertRegex(lines[0], r'^  main    1 commands    0 settings    0 variables    [\d.]+ [KM]?B$')
+        self.assertTrue(lines[1].startswith('* other    0 commands'))
+
+
+class SessionCommandTests(unittest.TestCase):
+    def setUp(self):
+        self.output = io.StringIO()
+        self.rfi = RobotFrameworkInteractive(console=ConsoleWriter(self.output))
+
+    def test_session_commands(self):
+        sessions = SessionManager(self.rfi, lambda: RobotFrameworkInteractive())
+        self.assertTrue(run_special_command(self.rfi, 'newsession(other)'))
+        self.assertEqual('other', sessions.name)
+        self.assertTrue(run_special_command(self.rfi, 'session( main )'))
+        self.assertEqual('main', sessions.name)
+        self.assertTrue(run_special_command(self.rfi, 'closesession(other)'))
+        self.assertEqual(1, len(sessions))
+        self.assertTrue(run_special_command(self.rfi, 'sessions()'))
+        self.assertIn('* main', self.output.getvalue())
+
+    def test_batch_runs_in_current_session(self):
+        sessions = SessionManager(self.rfi, lambda: RobotFrameworkInteractive(console=ConsoleWriter(self.output)))
+        run_batch(self.rfi, ['# first', 'newsession(other)', '# second'])
+        self.assertEqual(['# first'], self.rfi.SUCCESS_CMD_HISTORY)
+        self.assertEqual(['# second'], sessions.current.SUCCESS_CMD_HISTORY)
+
+    def test_session_command_errors(self):
+        SessionManager(self.rfi, lambda: RobotFrameworkInteractive())
+        run_special_command(self.rfi, 'session(missing)')
+        self.assertEqual('No session named missing\n', self.output.getvalue())
+        with self.assertRaisesRegex(ValueError, 'No session named missing'):
+            run_special_command(self.rfi, 'closesession(missing)', throw=True)
+
+    def test_session_commands_without_sessions(self):
+        run_special_command(self.rfi, 'newsession(other)')
+        run_special_command(self.rfi, 'sessions()')
+        self.assertEqual('Sessions are only available in a running prompt\n' * 2, self.output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
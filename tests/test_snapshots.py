@@ -0,0 +1,82 @@
+import os
+import pickle
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from robotframeworkinteractive.snapshots import read_snapshot, snapshot_path, write_snapshot
+
+
+class SnapshotTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'nested', 'test.snapshot')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        store = {'TOKEN': 'abc', 'ITEMS': [1, 2], 'CONFIG': {'a': 1}}
+        self.assertEqual((3, {}), write_snapshot(self.path, ['Library  Collections'], store))
+        settings, variables, skipped = read_snapshot(self.path)
+        self.assertEqual(['Library  Collections'], settings)
+        self.assertEqual(store, variables)
+        self.assertEqual({}, skipped)
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+    @unittest.skipIf(os.name == 'nt', 'File modes are POSIX only')
+    def test_only_readable_by_user(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path + '.tmp', 'w'):
+            os.chmod(self.path + '.tmp', 0o644)
+        write_snapshot(self.path, [], {'TOKEN': 'secret'})
+        self.assertEqual(0o600, os.stat(self.path).st_mode & 0o777)
+
+    def test_built_in_variables_not_saved(self):
+        store = {'TEST_NAME': 'Test', 'TEST NAME': 'Test', 'OUTPUT_DIR': '/tmp', 'True': True, 'TEST_USER': 'demo'}
+        write_snapshot(self.path, [], store)
+        self.assertEqual({'TEST_USER': 'demo'}, read_snapshot(self.path)[1])
+
+    def test_non_serializable_values_reported(self):
+        saved, skipped = write_snapshot(self.path, [], {'LOCK': threading.Lock(), 'VALUE': 1})
+        self.assertEqual(1, saved)
+        self.assertEqual(['LOCK'], list(skipped))
+        self.assertIn('TypeError', skipped['LOCK'])
+        self.assertEqual({'VALUE': 1}, read_snapshot(self.path)[1])
+
+    def test_unreadable_values_reported(self):
+        write_snapshot(self.path, [], {'VALUE': 1, 'OTHER': 2})
+        real_loads = pickle.loads
+
+        def loads(data):
+            value = real_loads(data)
+            if value == 2:
+                raise AttributeError("Can't get attribute 'Missing'")
+            return value
+
+        with patch('robotframeworkinteractive.snapshots.pickle.loads', loads):
+            _, variables, skipped = read_snapshot(self.path)
+        self.assertEqual({'VALUE': 1}, variables)
+        self.assertEqual({'OTHER': "AttributeError: Can't get attribute 'Missing'"}, skipped)
+
+    def test_not_a_snapshot(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'wb') as file:
+            file.write(b'not a snapshot')
+        with self.assertRaisesRegex(ValueError, 'is not a snapshot'):
+            read_snapshot(self.path)
+        with open(self.path, 'wb') as file:
+            pickle.dump(['other', 'data'], file)
+        with self.assertRaisesRegex(ValueError, 'is not a snapshot'):
+            read_snapshot(self.path)
+
+    def test_snapshot_path(self):
+        with patch('robotframeworkinteractive.snapshots.state_directory', return_value='/state/rfi'):
+            self.assertEqual(os.path.join('/state/rfi', 'snapshots', 'login.snapshot'), snapshot_path('login'))
+        self.assertEqual('snapshots/login', snapshot_path('snapshots/login'))
+        self.assertEqual('login.snapshot', snapshot_path('login.snapshot'))
+
+
+if __name__ == '__main__':
+    unittest.main()
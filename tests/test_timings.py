@@ -0,0 +1,65 @@
+import json
+import unittest
+
+from robotframeworkinteractive.timings import CommandTimings, percentile
+
+
+class PercentileTests(unittest.TestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(50, percentile(values, 50))
+        self.assertEqual(95, percentile(values, 95))
+        self.assertEqual(100, percentile(values, 100))
+
+    def test_percentile_single_value(self):
+        self.assertEqual(3, percentile([3], 50))
+
+
+class CommandTimingsTests(unittest.TestCase):
+    def setUp(self):
+        self.timings = CommandTimings()
+        self.timings.record('Library  Collections', 'Library', 'Collections', 0.3, 'PASS')
+        for elapsed in (0.1, 0.2, 0.9):
+            self.timings.record('Log  One', 'BuiltIn.Log', 'BuiltIn', elapsed, 'PASS')
+        self.timings.record('Append To List  ${l}  a', 'Collections.Append To List', 'Collections', 0.05, 'FAIL')
+
+    def test_bounded(self):
+        timings = CommandTimings(capacity=3)
+        for i in range(5):
+            timings.record(f'Log  {i}', 'BuiltIn.Log', 'BuiltIn', i, 'PASS')
+        self.assertEqual(['Log  2', 'Log  3', 'Log  4'], [timing.command for timing in timings])
+
+    def test_slowest(self):
+        self.assertEqual([0.9, 0.3], [timing.elapsed for timing in self.timings.slowest(2)])
+
+    def test_keyword_stats(self):
+        stats = self.timings.keyword_stats()
+        self.assertEqual(['BuiltIn.Log', 'Library', 'Collections.Append To List'], [stat['keyword'] for stat in stats])
+        self.assertEqual({'keyword': 'BuiltIn.Log', 'count': 3, 'p50': 0.2, 'p95': 0.9, 'max': 0.9},
+                         {key: value for key, value in stats[0].items() if key != 'total'})
+
+    def test_library_totals(self):
+        totals = {total['library']: (total['count'], round(total['total'], 6))
+                  for total in self.timings.library_totals()}
+        self.assertEqual({'BuiltIn': (3, 1.2), 'Collections': (2, 0.35)}, totals)
+
+    def test_report(self):
+        report = self.timings.report(count=1)
+        self.assertIn('Slowest of the last 5 commands:\n    0.900s    PASS    Log  One\n', report)
+        self.assertIn('    BuiltIn.Log    3    0.200s    0.900s    0.900s', report)
+        self.assertIn('    Collections    2    0.350s', report)
+
+    def test_report_empty(self):
+        self.assertEqual('No commands have been timed yet', CommandTimings().report())
+
+    def test_to_json(self):
+        data = json.loads(self.timings.to_json())
+        self.assertEqual(5, len(data['commands']))
+        self.assertEqual({'command': 'Log  One', 'keyword': 'BuiltIn.Log', 'library': 'BuiltIn', 'elapsed': 0.1,
+                          'status': 'PASS'}, data['commands'][1])
+        self.assertEqual('BuiltIn.Log', data['keywords'][0]['keyword'])
+        self.assertEqual('BuiltIn', data['libraries'][0]['library'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from robot.libraries.BuiltIn import BuiltIn
+
+from robotframeworkinteractive.bootstrap import execution_context
+from robotframeworkinteractive.tracing import TraceListener
+
+
+def attrs(args=(), libname='BuiltIn', status='PASS'):
+    return {'libname': libname, 'type': 'KEYWORD', 'args': list(args), 'status': status}
+
+
+class TraceListenerTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def trace(self, name, **kwargs):
+        return TraceListener(os.path.join(self.directory, name), **kwargs)
+
+    def run_nested(self, listener):
+        listener.start_keyword('Resource.Outer', attrs(libname='Resource'))
+        listener.start_keyword('BuiltIn.Log', attrs(['a']))
+        listener.end_keyword('BuiltIn.Log', attrs(['a']))
+        listener.end_keyword('Resource.Outer', attrs(libname='Resource', status='FAIL'))
+
+    def read_lines(self, listener):
+        with open(listener.path, encoding='utf-8') as file:
+            return [json.loads(line) for line in file]
+
+    def test_jsonl(self):
+        listener = self.trace('trace.jsonl')
+        self.run_nested(listener)
+        listener.close()
+        events = self.read_lines(listener)
+        self.assertEqual([('BuiltIn.Log', 1, ['a'], 'PASS'), ('Resource.Outer', 0, [], 'FAIL')],
+                         [(event['name'], event['depth'], event['args'], event['status']) for event in events])
+        self.assertLessEqual(events[1]['start'], events[0]['start'])
+        self.assertGreaterEqual(events[1]['elapsed'], events[0]['elapsed'])
+
+    def test_chrome_trace(self):
+        listener = self.trace('trace.json', buffer_size=1)
+        self.run_nested(listener)
+        listener.close()
+        with open(listener.path, encoding='utf-8') as file:
+            events = json.load(file)
+        self.assertEqual(['BuiltIn.Log', 'Resource.Outer'], [event['name'] for event in events])
+        self.assertEqual({'X'}, {event['ph'] for event in events})
+        self.assertEqual('Resource', events[1]['cat'])
+        self.assertEqual({'args': ['a'], 'depth': 1, 'status': 'PASS'}, events[0]['args'])
+
+    def test_chrome_trace_empty(self):
+        listener = self.trace('trace.json')
+        listener.close()
+        with open(listener.path, encoding='utf-8') as file:
+            self.assertEqual([], json.load(file))
+
+    def test_buffered(self):
+        listener = self.trace('trace.jsonl', buffer_size=3)
+        self.run_nested(listener)
+        self.assertEqual([], self.read_lines(listener))
+        self.run_nested(listener)
+        self.assertEqual(3, len(self.read_lines(listener)))
+        listener.close()
+        listener.close()
+        self.assertEqual(4, len(self.read_lines(listener)))
+
+    def test_threads_nest_separately(self):
+        listener = self.trace('trace.jsonl')
+        listener.start_keyword('BuiltIn.Sleep', attrs())
+        thread = threading.Thread(target=self.run_nested, args=(listener,))
+        thread.start()
+        thread.join()
+        listener.end_keyword('BuiltIn.Sleep', attrs())
+        listener.close()
+        events = self.read_lines(listener)
+        self.assertEqual([1, 0, 0], [event['depth'] for event in events])
+        self.assertEqual(2, len({event['thread'] for event in events}))
+
+    def test_end_without_start_ignored(self):
+        listener = self.trace('trace.jsonl')
+        listener.end_keyword('BuiltIn.Log', attrs())
+        listener.close()
+        self.assertEqual([], self.read_lines(listener))
+
+    def test_registered_in_execution_context(self):
+        listener = self.trace('trace.jsonl')
+        with execution_context(listener=[listener]):
+            BuiltIn().run_keyword('Run Keyword', 'Catenate', 'a', 'b')
+        listener.close()
+        self.assertEqual([('BuiltIn.Catenate', 1), ('BuiltIn.Run Keyword', 0)],
+                         [(event['name'], event['depth']) for event in self.read_lines(listener)])
+
+
+if __name__ == '__main__':
+    unittest.main()